@@ -1,5 +1,6 @@
 from functools import wraps
 from typing import Dict
+import numpy
 import pandas
 
 def obs_to_pandas(method):
@@ -14,4 +15,96 @@ def obs_to_pandas(method):
 
         return method(self, curr_idx, obs_dict)
 
-    return _impl
\ No newline at end of file
+    return _impl
+
+
+class SignalView:
+    """
+    Read-only named view over one row of signals, a lightweight replacement for the
+    `pandas.Series` built by `obs_to_pandas`.
+
+    Fields are looked up by column name or position in a mapping shared by every view
+    of the same columns, and values stay in the observation's array without a copy.
+    """
+    __slots__ = ('values', '_fields')
+
+    def __init__(self, values: numpy.ndarray, fields: Dict):
+        """
+        Args:
+            values (numpy.ndarray): Signal values of the row.
+            fields (Dict): Column position by column name, see `SignalView.fields`.
+        """
+        self.values = values
+        self._fields = fields
+
+    @staticmethod
+    def fields(cols) -> Dict:
+        """
+        Build the column position mapping of a set of signal columns.
+
+        Args:
+            cols: Signal column names, e.g. `AgentBase.cols`.
+
+        Returns:
+            Dict: Column position by column name.
+        """
+        return {col: i for i, col in enumerate(cols)}
+
+    @property
+    def index(self) -> list:
+        return list(self._fields)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, numpy.integer)):
+            return self.values[key]
+        return self.values[self._fields[key]]
+
+    def __getattr__(self, name):
+        # Private and special names are never signals, and `_fields` is unset while copy or pickle rebuild a view
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self.values[self._fields[name]]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def get(self, key, default=None):
+        position = self._fields.get(key)
+        return default if position is None else self.values[position]
+
+    def __contains__(self, key) -> bool:
+        return key in self._fields
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def to_series(self) -> pandas.Series:
+        return pandas.Series(data=self.values, index=self.index)
+
+    def __repr__(self):
+        return f"SignalView({dict(zip(self._fields, self.values))})"
+
+
+def obs_to_view(method):
+    """
+    Like `obs_to_pandas`, but passes the signals as a `SignalView` built in constant time.
+    """
+    @wraps(method)
+    def _impl(self, curr_idx, obs: Dict):
+        obs_dict = {
+            'position': obs['position']
+        }
+
+        if 'signals' in obs:
+            # The column mapping is built once and rebuilt only when the agent's columns change
+            cached = self.__dict__.get('_signal_fields')
+            if cached is None or cached[0] is not self.cols:
+                cached = self.__dict__['_signal_fields'] = (self.cols, SignalView.fields(self.cols))
+            obs_dict['signals'] = SignalView(obs['signals'], cached[1])
+
+        return method(self, curr_idx, obs_dict)
+
+    return _impl
@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
+import numpy
 import pandas
-from typing import List
+from typing import List, Optional
 from mindthespread.env import BaseEnv
 from mindthespread.entities.agent import AgentResponse
-from mindthespread.ta import TA, apply_indicators
+from mindthespread.ta import TA, IndicatorCache, apply_indicators
+from mindthespread.ta_stream import SignalStream
 
 class AgentBase(ABC):
     def __init__(self, indicators: List[TA], min_records_needed=500):
@@ -20,13 +22,97 @@ class AgentBase(ABC):
         self.env = env
         self.env.calc_signals = self.calc_signals
 
-    def calc_signals(self, feed: pandas.DataFrame) -> pandas.DataFrame:
-        signals = apply_indicators(feed, self.indicators)
+    def calc_signals(self, feed: pandas.DataFrame, cache: IndicatorCache = None) -> pandas.DataFrame:
+        signals = apply_indicators(feed, self.indicators, cache=cache)
         assert signals is not None, "No Signals returned"
         self.cols = signals.columns
         self.dtype = signals.dtypes
         return signals
 
+    def signal_stream(self) -> Optional[SignalStream]:
+        """
+        Build the incremental state of the agent's signals, kept per symbol by live runners.
+
+        Returns:
+            SignalStream: A stream of the agent's indicators, or None when they cannot be
+            updated incrementally.
+        """
+        return SignalStream.of(self.indicators)
+
+    def update_signals(self, window: pandas.DataFrame, n_new: int, stream: SignalStream = None) -> pandas.DataFrame:
+        """
+        Calculate the signals of the latest records of a rolling feed window, used by live runners.
+
+        With a `stream`, only the new records are fed to it, and the whole window on its first
+        update, so the cost per record does not depend on the window size. Otherwise the signals
+        are calculated over the window and its last `n_new` rows are kept. Every window is new,
+        so these values are not cached, which would only hash the window and fill the cache.
+
+        Args:
+            window (pandas.DataFrame): Rolling window of the latest feed records, at least
+                `min_records_needed` long once warmed up.
+            n_new (int): Number of records appended to the window since the last update.
+            stream (SignalStream): Optional state of the signals, from `signal_stream`.
+
+        Returns:
+            pandas.DataFrame: Signals of the last `n_new` records of the window.
+        """
+        if stream is None:
+            return self.calc_signals(window, cache=None).iloc[-n_new:]
+
+        signals = stream.update(window if stream.count == 0 else window.iloc[-n_new:]).iloc[-n_new:]
+        self.cols = signals.columns
+        self.dtype = signals.dtypes
+        return signals
+
+    def cache_key_state(self) -> dict:
+        """
+        State affecting the agent's decisions that is not held in its public attributes, e.g. a
+        model file. It is part of the key of cached backtests and checkpoints, so a change of
+        this state invalidates them.
+
+        Returns:
+            dict: JSON-serializable state, empty by default.
+        """
+        return {}
+
     @abstractmethod
     def act(self, curr_idx, obs) -> AgentResponse:
+        raise NotImplementedError
+
+    def act_batch(self, indices, obs_matrix: dict) -> List[AgentResponse]:
+        """
+        Decide for many observations at once, e.g. one per symbol of a basket or per sub-env of a
+        vectorized env.
+
+        The default implementation calls `act` row by row, so every agent supports it; agents
+        whose decision is a function of the signals can override it with array operations.
+
+        Args:
+            indices: Current feed index of each row, or a single index shared by all rows.
+            obs_matrix (dict): Batched observation, with a 'position' array and a 2-D 'signals' matrix,
+                one row per decision.
+
+        Returns:
+            List[AgentResponse]: One response per row.
+        """
+        positions, signals = obs_matrix['position'], obs_matrix['signals']
+        if numpy.ndim(indices) == 0:
+            indices = [indices] * len(signals)
+        return [self.act(curr_idx, {'position': position, 'signals': row})
+                for curr_idx, position, row in zip(indices, positions, signals)]
+
+    def act_vectorized(self, signals: numpy.ndarray) -> numpy.ndarray:
+        """
+        Optional whole-array decision function, for agents whose decision depends only on the
+        signal row and on whether the target position is already held.
+
+        Used by `vectorized_backtest`; orders use the agent's `qty` and `stop_loss` attributes.
+
+        Args:
+            signals (numpy.ndarray): 2-D signal matrix, one row per feed record.
+
+        Returns:
+            numpy.ndarray: Target Direction value per row, or -1 to keep the current position.
+        """
         raise NotImplementedError
\ No newline at end of file
@@ -1,3 +1,6 @@
+from typing import List
+
+import numpy as np
 import pandas as pd
 from mindthespread.agents.base import AgentBase, AgentResponse
 from mindthespread.entities.market import Action, Direction
@@ -72,3 +75,46 @@ class AgentCrossover(AgentBase):
 
         # Default to holding position
         return AgentResponse(action=Action.HOLD)
+
+    def act_batch(self, indices, obs_matrix: dict) -> List[AgentResponse]:
+        """
+        Make the crossover decision for a batch of observations with array operations.
+
+        Args:
+            indices: Current feed index of each row, unused by the crossover.
+            obs_matrix (dict): Batched observation with a 'position' array and a 2-D 'signals' matrix
+                of [long_sma, short_sma] rows.
+
+        Returns:
+            List[AgentResponse]: One response per row, as `act` would return it.
+        """
+        signals = np.asarray(obs_matrix['signals'])
+        if signals.ndim != 2 or signals.shape[1] < 2:
+            raise ValueError("Expected at least two signals (long_sma, short_sma) per row.")
+
+        positions = np.asarray(obs_matrix['position'])
+        targets = self.act_vectorized(signals)
+        buy = (targets == Direction.Long.value) & (positions != Direction.Long.value)
+        sell = (targets == Direction.Short.value) & (positions != Direction.Short.value)
+
+        hold = AgentResponse(action=Action.HOLD)
+        return [AgentResponse(action=Action.BUY, qty=self.qty, stop_loss=self.stop_loss) if b else
+                AgentResponse(action=Action.SELL, qty=self.qty, stop_loss=self.stop_loss) if s else hold
+                for b, s in zip(buy.tolist(), sell.tolist())]
+
+    def act_vectorized(self, signals: np.ndarray) -> np.ndarray:
+        """
+        Target positions of the SMA crossover for a whole signal matrix.
+
+        Args:
+            signals (np.ndarray): Matrix with the long and short SMA columns.
+
+        Returns:
+            np.ndarray: Direction.Long where the short SMA is below the long SMA, Direction.Short where
+            it is above, and -1 (hold) where they are equal or missing.
+        """
+        long_sma, short_sma = signals[:, 0], signals[:, 1]
+        targets = np.full(len(signals), -1, dtype=np.int8)
+        targets[short_sma < long_sma] = Direction.Long.value
+        targets[short_sma > long_sma] = Direction.Short.value
+        return targets
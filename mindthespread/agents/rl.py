@@ -1,10 +1,17 @@
+import os
+import threading
+from collections import OrderedDict
+
 import joblib
 from typing import List
+import numpy
 import pandas
+from gymnasium.vector import VectorEnv
 
 from mindthespread.ta import TABase
 from mindthespread.agents.base import AgentBase
 from mindthespread.entities.agent import AgentResponse
+from mindthespread.env.sb3_env import SB3VecEnv
 
 
 class DummyStableBaseline3Model:
@@ -22,8 +29,56 @@ class DummyStableBaseline3Model:
         return joblib.load(path)
 
     def predict(self, obs):
+        if numpy.ndim(obs['signals']) == 2:
+            return numpy.array([self.env.action_space.sample() for _ in range(len(obs['signals']))]), None
         return self.env.action_space.sample(), None
 
+
+# Process-wide cache of loaded models, least recently used first
+MODEL_CACHE_SIZE = 8
+_model_cache = OrderedDict()
+_model_cache_lock = threading.Lock()
+
+
+def load_cached_model(rl_algo, path: str):
+    """
+    Load a model through the process-wide LRU cache.
+
+    Models are keyed by algorithm, path and modification time, so a model file saved
+    again is reloaded while repeated backtests of the same model share one instance.
+
+    Args:
+        rl_algo: Model class, with a `load(path)` static method.
+        path (str): Path of the model file.
+
+    Returns:
+        The loaded model.
+    """
+    key = (f'{rl_algo.__module__}.{rl_algo.__qualname__}', os.path.abspath(path), os.stat(path).st_mtime_ns)
+    with _model_cache_lock:
+        model = _model_cache.get(key)
+        if model is not None:
+            _model_cache.move_to_end(key)
+            return model
+
+    # Load outside of the lock, a concurrent load of the same model is only wasted work
+    model = rl_algo.load(path)
+    with _model_cache_lock:
+        _model_cache[key] = model
+        _model_cache.move_to_end(key)
+        while len(_model_cache) > MODEL_CACHE_SIZE:
+            _model_cache.popitem(last=False)
+    return model
+
+
+def clear_model_cache() -> None:
+    """
+    Drop every cached model.
+    """
+    with _model_cache_lock:
+        _model_cache.clear()
+
+
 class RLAgent(AgentBase):
     def __init__(self, rl_model_path: str, rl_algo=DummyStableBaseline3Model, total_timesteps: int = None, policy: str = "MultiInputPolicy",
                  min_records_needed=1000, indicators: List[TABase] = None): # agent params
@@ -36,14 +91,66 @@ class RLAgent(AgentBase):
         self.rl_model = None
 
     def load_rl_model(self) -> None:
-        self.rl_model = self.rl_algo.load(self.rl_model_path)
+        self.rl_model = load_cached_model(self.rl_algo, self.rl_model_path)
+
+    def cache_key_state(self) -> dict:
+        """
+        Returns:
+            dict: Modification time and size of the model file, None when it does not exist yet,
+            so that a retrained model does not hit results of the previous one.
+        """
+        try:
+            stat = os.stat(self.rl_model_path)
+        except FileNotFoundError:
+            return {'rl_model': None}
+        return {'rl_model': {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}}
+
+    def rl_train(self, feed: pandas.DataFrame, vec_env=None):
+        """
+        Train the model on the feed and save it to `rl_model_path`.
 
-    def rl_train(self, feed: pandas.DataFrame):
-        self.env.set_ohlc_feed(feed)
-        rl_agent = self.rl_algo(env=self.env, policy=self.policy, verbose=2)
+        Args:
+            feed (pandas.DataFrame): Feed to train on.
+            vec_env: Optional vectorized env collecting experience instead of the agent's env,
+                e.g. a `SubprocVectorTradingEnv` stepping its episodes on several cores. Its signals
+                are calculated by this agent. Vectorized envs are given to the algorithm as an
+                `SB3VecEnv`, so that it steps every sub-environment rather than one batched env.
+        """
+        env = self.env
+        if vec_env is not None:
+            env = vec_env
+            env.calc_signals = self.calc_signals
+        env.set_ohlc_feed(feed)
+        if isinstance(env, VectorEnv):
+            env = SB3VecEnv(env)
+        rl_agent = self.rl_algo(env=env, policy=self.policy, verbose=2)
         rl_agent.learn(total_timesteps=self.total_timesteps)
         rl_agent.save(self.rl_model_path)
 
     def act(self, curr_idx, obs) -> AgentResponse:
         action, _states = self.rl_model.predict(obs)
         return AgentResponse(action=action)
+
+    def predict_batch(self, obs_matrix: dict, chunk_size: int = 4096) -> numpy.ndarray:
+        """
+        Predict the actions of many observations with one model call per chunk.
+
+        Args:
+            obs_matrix (dict): Batched observation, with a 'position' array and a 2-D 'signals' matrix,
+                e.g. the observation of a vectorized env or positions along a precomputed signal matrix.
+            chunk_size (int): Maximum number of rows per model call.
+
+        Returns:
+            numpy.ndarray: One action value per row.
+        """
+        positions = numpy.asarray(obs_matrix['position'])
+        signals = numpy.asarray(obs_matrix['signals'])
+        actions = numpy.empty(len(signals), dtype=numpy.int64)
+        for start in range(0, len(signals), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            chunk_actions, _states = self.rl_model.predict({'position': positions[chunk], 'signals': signals[chunk]})
+            actions[chunk] = numpy.asarray(chunk_actions).reshape(-1)
+        return actions
+
+    def act_batch(self, indices, obs_matrix: dict) -> List[AgentResponse]:
+        return [AgentResponse(action=action) for action in self.predict_batch(obs_matrix).tolist()]
@@ -0,0 +1,159 @@
+"""
+Vectorized performance analytics over the result buffers of a run.
+
+Every function takes NumPy arrays and reduces along `axis`, so the same call
+evaluates one run or a 2-D batch of runs (e.g. one row per sweep job).
+"""
+import numpy as np
+
+
+def sharpe_ratio(log_returns: np.ndarray, periods_per_year: int = 252, axis: int = -1):
+    """
+    Annualized Sharpe ratio of per-step log returns, with a zero risk-free rate.
+
+    Args:
+        log_returns (np.ndarray): Log returns, one per step.
+        periods_per_year (int): Number of steps per year, e.g. 252 for daily or 252 * 24 for hourly bars.
+        axis (int): Axis along which the steps are laid out.
+
+    Returns:
+        float | np.ndarray: Sharpe ratio, 0 where returns have no variance.
+    """
+    log_returns = np.asarray(log_returns, dtype=np.float64)
+    mean = log_returns.mean(axis=axis)
+    std = log_returns.std(axis=axis, ddof=1) if log_returns.shape[axis] > 1 else np.zeros_like(mean)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(std > 0, mean / std * np.sqrt(periods_per_year), 0.0)[()]
+
+
+def sortino_ratio(log_returns: np.ndarray, periods_per_year: int = 252, axis: int = -1):
+    """
+    Annualized Sortino ratio of per-step log returns, penalizing downside deviation only.
+
+    Args:
+        log_returns (np.ndarray): Log returns, one per step.
+        periods_per_year (int): Number of steps per year.
+        axis (int): Axis along which the steps are laid out.
+
+    Returns:
+        float | np.ndarray: Sortino ratio, 0 where there is no downside.
+    """
+    log_returns = np.asarray(log_returns, dtype=np.float64)
+    mean = log_returns.mean(axis=axis)
+    downside = np.sqrt(np.mean(np.minimum(log_returns, 0) ** 2, axis=axis))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(downside > 0, mean / downside * np.sqrt(periods_per_year), 0.0)[()]
+
+
+def equity_curve(log_returns: np.ndarray, axis: int = -1) -> np.ndarray:
+    """
+    Compounded equity of a unit investment.
+
+    Args:
+        log_returns (np.ndarray): Log returns, one per step.
+        axis (int): Axis along which the steps are laid out.
+
+    Returns:
+        np.ndarray: Equity after each step.
+    """
+    return np.exp(np.cumsum(np.asarray(log_returns, dtype=np.float64), axis=axis))
+
+
+def max_drawdown(log_returns: np.ndarray, axis: int = -1):
+    """
+    Largest peak to trough loss of the equity curve, as a fraction of the peak.
+
+    Args:
+        log_returns (np.ndarray): Log returns, one per step.
+        axis (int): Axis along which the steps are laid out.
+
+    Returns:
+        float | np.ndarray: Maximum drawdown, between 0 and 1.
+    """
+    equity = equity_curve(log_returns, axis=axis)
+    # The initial equity of 1 is a peak too
+    peaks = np.maximum(np.maximum.accumulate(equity, axis=axis), 1.0)
+    return np.max(1.0 - equity / peaks, axis=axis, initial=0.0)[()]
+
+
+def exposure(positions: np.ndarray, axis: int = -1):
+    """
+    Fraction of the steps spent in the market.
+
+    Args:
+        positions (np.ndarray): Signed position quantity after each step.
+        axis (int): Axis along which the steps are laid out.
+
+    Returns:
+        float | np.ndarray: Exposure, between 0 and 1.
+    """
+    return np.mean(np.asarray(positions) != 0, axis=axis)[()]
+
+
+def turnover(positions: np.ndarray, axis: int = -1):
+    """
+    Average traded quantity per step, a reversal counting twice its quantity.
+
+    Args:
+        positions (np.ndarray): Signed position quantity after each step, starting out of the market.
+        axis (int): Axis along which the steps are laid out.
+
+    Returns:
+        float | np.ndarray: Turnover per step.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    traded = np.abs(np.diff(positions, axis=axis, prepend=0.0))
+    return np.mean(traded, axis=axis)[()]
+
+
+def trade_stats(trades: np.ndarray) -> dict:
+    """
+    Statistics of the closed trades of a `TradeLedger`.
+
+    Args:
+        trades (np.ndarray): Structured array of trades, as returned by `TradeLedger.values`.
+
+    Returns:
+        dict: Number of trades, win rate, average PnL, profit factor, average holding period in steps
+        and number of stop-losses.
+    """
+    if not len(trades):
+        return {'trades': 0, 'win_rate': 0, 'avg_pnl': 0.0, 'profit_factor': 0.0, 'avg_holding': 0.0, 'stops': 0}
+
+    pnl = trades['pnl']
+    gains = pnl[pnl > 0].sum()
+    losses = -pnl[pnl < 0].sum()
+    return {
+        'trades': len(trades),
+        'win_rate': round(float((pnl > 0).mean()), 2),
+        'avg_pnl': float(pnl.mean()),
+        'profit_factor': float(gains / losses) if losses > 0 else float('inf') if gains > 0 else 0.0,
+        'avg_holding': float((trades['exit'] - trades['entry']).mean()),
+        'stops': int(trades['stop'].sum()),
+    }
+
+
+def performance(log_returns: np.ndarray, positions: np.ndarray, trades: np.ndarray = None,
+                periods_per_year: int = 252) -> dict:
+    """
+    Compute every analytic of a single run.
+
+    Args:
+        log_returns (np.ndarray): Log returns, one per step.
+        positions (np.ndarray): Signed position quantity after each step.
+        trades (np.ndarray): Optional structured array of closed trades.
+        periods_per_year (int): Number of steps per year.
+
+    Returns:
+        dict: Sharpe, Sortino, max drawdown, exposure and turnover, plus the trade statistics when given.
+    """
+    metrics = {
+        'sharpe': float(sharpe_ratio(log_returns, periods_per_year)),
+        'sortino': float(sortino_ratio(log_returns, periods_per_year)),
+        'max_drawdown': float(max_drawdown(log_returns)),
+        'exposure': float(exposure(positions)),
+        'turnover': float(turnover(positions)),
+    }
+    if trades is not None:
+        metrics.update(trade_stats(trades))
+    return metrics
@@ -0,0 +1,139 @@
+import numpy as np
+
+
+class StepBuffer:
+    """
+    Preallocated buffer of per-step values keyed by their position in the feed.
+
+    In the default mode the buffer is sized to the episode and grows only if that
+    estimate was too small. In ring mode it keeps the most recent `capacity` entries,
+    which bounds memory for open-ended live runs.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float64, ring: bool = False):
+        """
+        Initialize the buffer.
+
+        Args:
+            capacity (int): Number of entries to preallocate.
+            dtype: NumPy dtype of the stored values, may be a structured dtype.
+            ring (bool): Overwrite the oldest entries instead of growing once full.
+        """
+        assert capacity > 0, "capacity must be positive"
+        self.dtype = np.dtype(dtype)
+        self.ring = ring
+        self.count = 0
+        self._positions = np.empty(capacity, dtype=np.int64)
+        self._values = np.empty(capacity, dtype=self.dtype)
+
+    @property
+    def capacity(self) -> int:
+        return len(self._values)
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity) if self.ring else self.count
+
+    def reset(self, capacity: int = None) -> None:
+        """
+        Clear the buffer, reallocating it only when a different capacity is requested.
+
+        Args:
+            capacity (int): Optional new capacity.
+        """
+        if capacity is not None and capacity != self.capacity:
+            assert capacity > 0, "capacity must be positive"
+            self._positions = np.empty(capacity, dtype=np.int64)
+            self._values = np.empty(capacity, dtype=self.dtype)
+        self.count = 0
+
+    def append(self, position: int, value) -> None:
+        """
+        Append a value recorded at the given feed position.
+
+        Args:
+            position (int): Position of the record in the feed.
+            value: Value to store, a tuple for structured dtypes.
+        """
+        slot = self.count
+        if slot >= self.capacity:
+            if self.ring:
+                slot %= self.capacity
+            else:
+                self._grow()
+        self._positions[slot] = position
+        self._values[slot] = value
+        self.count += 1
+
+    def set_last(self, value) -> None:
+        """
+        Overwrite the most recently appended value.
+
+        Args:
+            value: Value to store.
+        """
+        assert self.count > 0, "buffer is empty"
+        self._values[(self.count - 1) % self.capacity] = value
+
+    def truncate(self, count: int) -> None:
+        """
+        Drop every entry appended after the buffer held `count` entries.
+
+        Args:
+            count (int): Number of appended entries to keep.
+        """
+        assert 0 <= count <= self.count, "cannot truncate beyond the current length"
+        self.count = count
+
+    def positions(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: Feed positions of the stored entries, oldest first.
+        """
+        return self._ordered(self._positions)
+
+    def values(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: Stored values, oldest first.
+        """
+        return self._ordered(self._values)
+
+    def get_state(self) -> dict:
+        """
+        Capture the stored entries, without the unused part of the preallocated arrays.
+
+        Returns:
+            dict: The picklable state, restored by `set_state`.
+        """
+        return {'positions': self.positions(), 'values': self.values(), 'count': self.count,
+                'capacity': self.capacity}
+
+    def set_state(self, state: dict) -> None:
+        """
+        Restore a state captured by `get_state`, reallocating the buffer at the captured capacity.
+
+        Args:
+            state (dict): The state to restore.
+        """
+        self.reset(state['capacity'])
+        self.count = state['count']
+        stored = len(state['values'])
+        if self.ring and self.count > self.capacity:
+            # Entries are oldest first, the oldest one is at the slot of the next append
+            head = self.count % self.capacity
+            self._positions[:] = np.roll(state['positions'], head)
+            self._values[:] = np.roll(state['values'], head)
+        else:
+            self._positions[:stored] = state['positions']
+            self._values[:stored] = state['values']
+
+    def _ordered(self, data: np.ndarray) -> np.ndarray:
+        if self.ring and self.count > self.capacity:
+            head = self.count % self.capacity
+            return np.concatenate([data[head:], data[:head]])
+        return data[:self.count].copy()
+
+    def _grow(self) -> None:
+        capacity = self.capacity * 2
+        self._positions = np.resize(self._positions, capacity)
+        self._values = np.resize(self._values, capacity)
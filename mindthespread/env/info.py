@@ -0,0 +1,105 @@
+from collections.abc import Mapping
+from numbers import Number
+from typing import Callable, List
+
+import numpy as np
+
+INFO_NONE = 'none'
+INFO_SUMMARY = 'summary'
+INFO_FULL = 'full'
+INFO_LEVELS = (INFO_NONE, INFO_SUMMARY, INFO_FULL)
+
+RENDER_ALL = 'all'
+RENDER_OFF = 'off'
+RENDER_EVERY = 'every'
+RENDER_TRADES = 'trades'
+RENDER_SUMMARY = 'summary'
+RENDER_POLICIES = (RENDER_ALL, RENDER_OFF, RENDER_EVERY, RENDER_TRADES, RENDER_SUMMARY)
+
+
+class LazyInfo(Mapping):
+    """
+    Read-only info mapping that is built only when one of its keys is accessed.
+
+    The arguments needed to build the info are captured when the step happens, so
+    the formatting cost (string conversion, rounding, win rate) is paid only by
+    callers that actually read the info.
+    """
+
+    __slots__ = ('_build', '_args', '_data')
+
+    def __init__(self, build: Callable[..., dict], *args):
+        """
+        Args:
+            build (Callable): Function returning the info dictionary.
+            *args: Arguments passed to `build` on first access.
+        """
+        self._build = build
+        self._args = args
+        self._data = None
+
+    def _materialize(self) -> dict:
+        if self._data is None:
+            self._data = self._build(*self._args)
+            self._args = None
+        return self._data
+
+    def __getitem__(self, key):
+        return self._materialize()[key]
+
+    def __iter__(self):
+        return iter(self._materialize())
+
+    def __len__(self):
+        return len(self._materialize())
+
+    def __bool__(self):
+        # Builders always return keys, so an info not built yet is known to be non-empty
+        return self._data is None or bool(self._data)
+
+    def __repr__(self):
+        return repr(self._materialize())
+
+
+def merge_infos(env_infos: List[Mapping]) -> dict:
+    """
+    Merge the infos of the sub-environments of a vectorized env, as gymnasium vector envs do.
+
+    Every key maps to an array with one value per sub-environment, paired with a `_key` mask
+    of the sub-environments holding it. Unlike gymnasium's `_add_info`, the array type is chosen
+    from every value, so a key that is None in some sub-environments, e.g. 'qty' out of the market,
+    or an int in some and a float in others, e.g. 'win_rate', is not truncated or rejected.
+
+    Args:
+        env_infos (List[Mapping]): Info of each sub-environment, lazy ones being built here.
+
+    Returns:
+        dict: The vectorized infos.
+    """
+    env_infos = [info if info else {} for info in env_infos]
+    keys = dict.fromkeys(key for info in env_infos for key in info)
+    infos = {}
+    for key in keys:
+        mask = np.array([key in info for info in env_infos])
+        values = [info.get(key) for info in env_infos]
+        if all(isinstance(value, (Number, np.number, np.bool_)) for value, held in zip(values, mask) if held):
+            infos[key] = np.array([value if held else 0 for value, held in zip(values, mask)])
+        else:
+            infos[key] = np.empty(len(values), dtype=object)
+            infos[key][:] = values
+        infos[f'_{key}'] = mask
+    return infos
+
+
+def merge_lazily(env_infos: List[Mapping]) -> Mapping:
+    """
+    Merge the infos of the sub-environments only when the result is read, see `merge_infos`.
+
+    Args:
+        env_infos (List[Mapping]): Info of each sub-environment.
+
+    Returns:
+        Mapping: A lazy info, or an empty dict when no sub-environment has info.
+    """
+    # Testing lazy infos for emptiness does not build them
+    return LazyInfo(merge_infos, env_infos) if any(env_infos) else {}
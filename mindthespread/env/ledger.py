@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from mindthespread.env.buffers import StepBuffer
+
+TRADE_DTYPE = np.dtype([
+    ('entry', np.int64),
+    ('exit', np.int64),
+    ('direction', np.int8),
+    ('qty', np.float64),
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('pnl', np.float64),
+    ('stop', np.bool_),
+])
+
+
+class TradeLedger(StepBuffer):
+    """
+    Columnar record of closed trades, one structured row per round trip.
+
+    Rows are keyed by the feed position of their exit. Entry and exit are feed
+    positions too, so holding periods and per-trade analytics are plain array
+    arithmetic; `to_frame` maps them back to timestamps.
+    """
+
+    def __init__(self, capacity: int, ring: bool = False):
+        """
+        Initialize the ledger.
+
+        Args:
+            capacity (int): Number of trades to preallocate.
+            ring (bool): Keep only the latest `capacity` trades.
+        """
+        super().__init__(capacity, dtype=TRADE_DTYPE, ring=ring)
+
+    def record(self, entry: int, exit: int, direction: int, qty: float, entry_price: float, exit_price: float,
+               pnl: float, stop: bool) -> None:
+        """
+        Record a closed trade.
+
+        Args:
+            entry (int): Feed position of the entry.
+            exit (int): Feed position of the exit.
+            direction (int): Direction value of the position.
+            qty (float): Quantity traded.
+            entry_price (float): Entry price.
+            exit_price (float): Exit price.
+            pnl (float): Reward of the trade, in pips times quantity.
+            stop (bool): Whether the trade was closed by its stop-loss.
+        """
+        self.append(exit, (entry, exit, direction, qty, entry_price, exit_price, pnl, stop))
+
+    def to_frame(self, index: pd.Index) -> pd.DataFrame:
+        """
+        Convert the ledger to a DataFrame, with entry and exit timestamps.
+
+        Args:
+            index (pd.Index): Index of the feed the positions refer to.
+
+        Returns:
+            pd.DataFrame: One row per closed trade, oldest first.
+        """
+        trades = pd.DataFrame(self.values())
+        trades['entry'] = index[trades['entry'].to_numpy()]
+        trades['exit'] = index[trades['exit'].to_numpy()]
+        return trades
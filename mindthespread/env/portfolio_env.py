@@ -0,0 +1,371 @@
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from gymnasium import spaces
+
+from mindthespread.entities.agent import AgentResponse
+from mindthespread.entities.market import Action, Direction
+from mindthespread.env import BaseEnv
+from mindthespread.env.buffers import StepBuffer
+from mindthespread.env.sampler import EpisodeSampler
+
+
+class PortfolioTradingEnv(BaseEnv):
+    """
+    Trading environment over a basket of symbols sharing one time index.
+
+    Feeds are aligned on their common timestamps and every symbol keeps its own
+    position, PnL and stop-loss state in arrays, so a single step evaluates the
+    whole basket. Per symbol, rewards and stop-losses follow `TradingEnv`.
+    """
+
+    def __init__(self, episode_window: int = None, bid_col: str = 'bidclose', ask_col: str = 'askclose',
+                 pip: Union[float, Sequence[float]] = 0.0001, qty: float = 1, stop_loss: float = None,
+                 sampler: EpisodeSampler = None):
+        """
+        Initialize the Portfolio Trading Environment.
+
+        Args:
+            episode_window (int): Maximum number of steps per episode.
+            bid_col (str): Column name for bid prices in the data feeds.
+            ask_col (str): Column name for ask prices in the data feeds.
+            pip (float | Sequence[float]): Pip size, shared or one per symbol.
+            qty (float): Quantity traded when an action is given as a plain integer.
+            stop_loss (float): Stop-loss used when an action is given as a plain integer.
+            sampler (EpisodeSampler): Chooses episode starts when `episode_window` is set.
+        """
+        self.episode_window = episode_window
+        self.bid_col = bid_col
+        self.ask_col = ask_col
+        self.pip = pip
+        self.qty = qty
+        self.stop_loss = stop_loss
+        self.sampler = sampler or EpisodeSampler()
+
+        # Market data, set by set_ohlc_feed
+        self.symbols = None
+        self.index = None
+        self.signals = None
+        self._bid = None
+        self._ask = None
+        self._pip = None
+        self._signal_values = None
+        self._cursor = None
+        self._start = None
+        self._rows = 0
+        self.curr_idx = None
+
+        # Per-symbol state
+        self.direction = None
+        self.position_qty = None
+        self.entry_price = None
+        self.position_stop_loss = None
+        self.last_price = None
+        self.transaction_reward = None
+        self.step_reward = None
+        self.total_reward = None
+        self.closed_transactions = None
+        self.wins = None
+        self.step_count = 0
+        self.obs = {}
+        self.info = {}
+
+        self.action_space = None
+        self.observation_space = None
+
+        self.log_returns = None
+        self.positions = None
+        self.transactions = None
+
+    def set_ohlc_feed(self, feed_data: Union[List[pd.DataFrame], Dict[str, pd.DataFrame]]) -> None:
+        """
+        Set the market data feeds of the basket, aligned on their shared time index.
+
+        Args:
+            feed_data (List[pd.DataFrame] | Dict[str, pd.DataFrame]): Feeds keyed by symbol, or a list
+                such as the one returned by `Feed.concatenate_feeds`, where symbols are taken from the
+                feed's 'symbol' column when present.
+        """
+        if not isinstance(feed_data, dict):
+            feed_data = {self._feed_symbol(feed, i): feed for i, feed in enumerate(feed_data)}
+        assert len(feed_data) > 0, "At least one feed is required"
+
+        # Generate signals per symbol and align everything on the common index
+        feeds, signals = {}, {}
+        for symbol, feed in feed_data.items():
+            assert feed is not None and not feed.empty, f"Feed data for {symbol} must not be empty"
+            signals[symbol] = self.calc_signals(feed)
+            feeds[symbol] = feed
+
+        index = None
+        for symbol_signals in signals.values():
+            index = symbol_signals.index if index is None else index.intersection(symbol_signals.index)
+        assert len(index) > 0, "Feeds share no common index"
+
+        self.symbols = list(feeds.keys())
+        self.index = index
+        self.signals = {symbol: signals[symbol].loc[index] for symbol in self.symbols}
+        self._bid = np.column_stack([feeds[s].loc[index, self.bid_col].to_numpy(dtype=np.float64)
+                                     for s in self.symbols])
+        self._ask = np.column_stack([feeds[s].loc[index, self.ask_col].to_numpy(dtype=np.float64)
+                                     for s in self.symbols])
+        self._signal_values = np.ascontiguousarray(np.stack([self.signals[s].to_numpy(dtype=np.float64)
+                                                             for s in self.symbols], axis=1))
+        self._pip = np.broadcast_to(np.asarray(self.pip, dtype=np.float64), (len(self.symbols),)).copy()
+
+        n_symbols = len(self.symbols)
+        self.action_space = spaces.MultiDiscrete([len(Action)] * n_symbols)
+        self.set_obs_space()
+        if self.episode_window is not None:
+            self.sampler.fit(np.isnan(self._signal_values), self.episode_window)
+        self._reset_state(0)
+
+    @staticmethod
+    def _feed_symbol(feed: pd.DataFrame, i: int) -> str:
+        if 'symbol' in feed.columns and len(feed):
+            return str(feed['symbol'].iloc[0])
+        return str(i)
+
+    def calc_signals(self, feed_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Abstract method to calculate trading signals from the feed data of one symbol.
+
+        Should be overridden by subclasses or user-defined implementations.
+        """
+        raise NotImplementedError("Method calc_signals not implemented")
+
+    def set_obs_space(self):
+        """
+        Set the observation space: one position and one row of signals per symbol.
+        """
+        low = np.nanmin(self._signal_values, axis=0)
+        high = np.nanmax(self._signal_values, axis=0)
+        self.observation_space = spaces.Dict({
+            "position": spaces.MultiDiscrete([len(Direction)] * len(self.symbols)),
+            "signals": spaces.Box(low=low, high=high, dtype=np.float64)
+        })
+
+    def _reset_state(self, start_idx: int):
+        n_symbols = len(self.symbols)
+        self._cursor = self._start = start_idx
+        self._rows = 0
+        self.curr_idx = self.index[start_idx]
+        self.step_count = 0
+
+        self.direction = np.full(n_symbols, Direction.Out.value, dtype=np.int8)
+        self.position_qty = np.zeros(n_symbols, dtype=np.float64)
+        self.entry_price = np.full(n_symbols, np.nan, dtype=np.float64)
+        self.position_stop_loss = np.full(n_symbols, np.nan, dtype=np.float64)
+        self.last_price = np.full(n_symbols, np.nan, dtype=np.float64)
+        self.transaction_reward = np.zeros(n_symbols, dtype=np.float64)
+        self.step_reward = np.zeros(n_symbols, dtype=np.float64)
+        self.total_reward = np.zeros(n_symbols, dtype=np.float64)
+        self.closed_transactions = np.zeros(n_symbols, dtype=np.int64)
+        self.wins = np.zeros(n_symbols, dtype=np.int64)
+
+        steps = len(self.index) - start_idx
+        if self.episode_window is not None:
+            steps = min(steps, self.episode_window)
+        self.log_returns = np.zeros((steps, n_symbols), dtype=np.float64)
+        self.positions = np.zeros((steps, n_symbols), dtype=np.float64)
+        self.transactions = StepBuffer(2 * steps, dtype=[('symbol', np.int32), ('amount', np.float64),
+                                                         ('price', np.float64)])
+        self.calc_obs()
+
+    def reset(self, *, seed: int | None = None, options: dict | None = None):
+        """
+        Reset the environment to the initial state for a new episode.
+
+        Args:
+            seed (int): Optional random seed for reproducibility.
+            options (dict): Additional options for resetting.
+
+        Returns:
+            Tuple: (obs, info)
+        """
+        super().reset(seed=seed)
+        if seed is not None:
+            self.sampler.reset()
+
+        if self.index is None:
+            return self.obs, self.info
+
+        start_idx = 0
+        if self.episode_window is not None:
+            start_idx = self.sampler.next_start(self.np_random)
+        self._reset_state(start_idx)
+        self.info = {}
+        return self.obs, self.info
+
+    def _parse_actions(self, actions):
+        n_symbols = len(self.symbols)
+        if len(actions) and isinstance(actions[0], AgentResponse):
+            action = np.array([resp.action.value for resp in actions], dtype=np.int8)
+            qty = np.array([resp.qty for resp in actions], dtype=np.float64)
+            stop_loss = np.array([np.nan if resp.stop_loss is None else resp.stop_loss for resp in actions],
+                                 dtype=np.float64)
+        else:
+            action = np.asarray(actions, dtype=np.int8)
+            qty = np.full(n_symbols, self.qty, dtype=np.float64)
+            stop_loss = np.full(n_symbols, np.nan if self.stop_loss is None else self.stop_loss, dtype=np.float64)
+        assert len(action) == n_symbols, "One action per symbol is required"
+        return action, np.abs(qty), stop_loss
+
+    def step(self, actions: Union[np.ndarray, Sequence[Union[int, AgentResponse]]]):
+        """
+        Execute a step for every symbol of the basket.
+
+        Args:
+            actions (np.ndarray | Sequence[int | AgentResponse]): One action or agent response per symbol.
+
+        Returns:
+            Tuple: (obs, reward, done, truncated, info), the reward being the sum over symbols.
+        """
+        action, qty, stop_loss = self._parse_actions(actions)
+        t = self._cursor
+        bid = self._bid[t]
+        ask = self._ask[t]
+        step = self._rows
+
+        # Mark open positions to market
+        long = self.direction == Direction.Long.value
+        short = self.direction == Direction.Short.value
+        mul = self.position_qty / self._pip
+        has_last = ~np.isnan(self.last_price)
+
+        self.step_reward[:] = 0
+        self.log_returns[step] = 0
+        self.transaction_reward[long] = ((bid - self.entry_price) * mul)[long]
+        self.transaction_reward[short] = ((self.entry_price - ask) * mul)[short]
+
+        long_step = long & has_last
+        short_step = short & has_last
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.step_reward[long_step] = ((bid - self.last_price) * mul)[long_step]
+            self.step_reward[short_step] = ((self.last_price - ask) * mul)[short_step]
+            self.log_returns[step, long_step] = np.log(bid / self.last_price)[long_step]
+            self.log_returns[step, short_step] = np.log(self.last_price / ask)[short_step]
+        self.last_price[long] = bid[long]
+        self.last_price[short] = ask[short]
+
+        # Stop-losses turn the action into a close
+        is_open = long | short
+        stop = is_open & (np.nan_to_num(self.position_stop_loss) != 0) & \
+            (self.transaction_reward < -self.position_stop_loss / self._pip)
+        action = np.where(stop, Action.CLOSE.value, action)
+
+        # Close positions on close or contradictory actions
+        close = is_open & ((action == Action.CLOSE.value) |
+                           ((action == Action.BUY.value) & short) |
+                           ((action == Action.SELL.value) & long))
+        if close.any():
+            closed_reward = self.transaction_reward[close]
+            self.closed_transactions[close] += 1
+            self.total_reward[close] += closed_reward
+            self.wins[close] += closed_reward > 0
+            self._record_fills(close, np.where(long, -self.position_qty, self.position_qty),
+                               np.where(long, bid, ask))
+            self.direction[close] = Direction.Out.value
+            self.transaction_reward[close] = 0
+
+        # Enter new positions
+        enter_long = (action == Action.BUY.value) & (self.direction != Direction.Long.value)
+        enter_short = (action == Action.SELL.value) & (self.direction != Direction.Short.value)
+        enter = enter_long | enter_short
+        if enter.any():
+            self.direction[enter_long] = Direction.Long.value
+            self.direction[enter_short] = Direction.Short.value
+            self.entry_price[enter_long] = ask[enter_long]
+            self.entry_price[enter_short] = bid[enter_short]
+            self.position_qty[enter] = qty[enter]
+            self.position_stop_loss[enter] = stop_loss[enter]
+            self._record_fills(enter, np.where(enter_long, qty, -qty), self.entry_price)
+
+        self.positions[step] = np.where(self.direction == Direction.Long.value, self.position_qty,
+                                        np.where(self.direction == Direction.Short.value, -self.position_qty, 0))
+
+        self._rows += 1
+        done = self.is_done()
+        self.info = {
+            'idx': self.curr_idx,
+            'stop': stop,
+            'step_reward': self.step_reward.copy(),
+        }
+
+        if not done:
+            self._cursor += 1
+            self.curr_idx = self.index[self._cursor]
+            self.step_count += 1
+
+        self.calc_obs()
+        return self.obs, float(self.step_reward.sum()), done, done, self.info
+
+    def _record_fills(self, mask: np.ndarray, amount: np.ndarray, price: np.ndarray):
+        for i in np.flatnonzero(mask):
+            self.transactions.append(self._cursor, (i, amount[i], price[i]))
+
+    def is_done(self):
+        """
+        Check if the episode is complete.
+
+        Returns:
+            bool: True if the episode is done, False otherwise.
+        """
+        return self._cursor == len(self.index) - 1 or \
+            (self.episode_window is not None and self.step_count >= self.episode_window - 1)
+
+    def calc_obs(self):
+        """
+        Calculate the current observation: the position and signal row of every symbol.
+        """
+        self.obs['position'] = self.direction.copy()
+        self.obs['signals'] = self._signal_values[self._cursor]
+
+    def summary(self) -> dict:
+        """
+        Summarize the episode so far over the whole basket.
+
+        Returns:
+            dict: Total reward, win rate and number of closed transactions.
+        """
+        closed = int(self.closed_transactions.sum())
+        return {
+            'total_reward': round(float((self.total_reward + self.transaction_reward).sum()), 2),
+            'win_rate': 0 if not closed else round(int(self.wins.sum()) / closed, 2),
+            'closed_trans': closed,
+        }
+
+    def symbol_summary(self) -> pd.DataFrame:
+        """
+        Summarize the episode so far per symbol.
+
+        Returns:
+            pd.DataFrame: Total reward, win rate and number of closed transactions, indexed by symbol.
+        """
+        rewards = self.total_reward + self.transaction_reward
+        records = [{
+            'total_reward': round(float(rewards[i]), 2),
+            'win_rate': 0 if not closed else round(int(self.wins[i]) / int(closed), 2),
+            'closed_trans': int(closed),
+        } for i, closed in enumerate(self.closed_transactions)]
+        return pd.DataFrame.from_records(records, index=pd.Index(self.symbols, name='symbol'))
+
+    def get_results(self):
+        """
+        Retrieve the results from the environment, including log returns, positions, and transactions.
+
+        Returns:
+            Tuple: (log_returns, positions, transactions), log returns and positions having one column per symbol.
+        """
+        index = self.index[self._start:self._start + self._rows]
+        log_returns = pd.DataFrame(self.log_returns[:self._rows], index=index, columns=self.symbols)
+        positions = pd.DataFrame(self.positions[:self._rows], index=index, columns=self.symbols)
+
+        fills = self.transactions.values()
+        transactions = pd.DataFrame({
+            'symbol': np.asarray(self.symbols, dtype=object)[fills['symbol']],
+            'amount': fills['amount'],
+            'price': fills['price'],
+        }, index=self.index[self.transactions.positions()])
+        return log_returns, positions, transactions
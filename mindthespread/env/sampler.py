@@ -0,0 +1,131 @@
+from collections import deque
+
+import numpy as np
+
+SAMPLE_UNIFORM = 'uniform'
+SAMPLE_STRATIFIED = 'stratified'
+SAMPLE_SEQUENTIAL = 'sequential'
+SAMPLE_CURRICULUM = 'curriculum'
+SAMPLE_MODES = (SAMPLE_UNIFORM, SAMPLE_STRATIFIED, SAMPLE_SEQUENTIAL, SAMPLE_CURRICULUM)
+
+
+class EpisodeSampler:
+    """
+    Chooses the start offsets of episodes within a feed.
+
+    Valid starts are precomputed once per feed: an episode may only start once every
+    signal has had a value, so the NaN warm-up rows of the indicators are never stepped
+    through. Later missing values, e.g. of a supertrend or parabolic SAR that are only
+    defined on one side of the price, are part of the signals and do not exclude a start. Starts are drawn in batches of `batch_size` from the environment's
+    seeded NumPy generator, which makes parallel training runs reproducible.
+    """
+
+    def __init__(self, mode: str = SAMPLE_UNIFORM, batch_size: int = 1, curriculum_start: float = 0.1,
+                 curriculum_episodes: int = 1000):
+        """
+        Initialize the sampler.
+
+        Args:
+            mode (str): 'uniform' draws starts at random, 'stratified' draws one start per equal slice
+                of the feed for every batch, 'sequential' walks through the feed in non-overlapping
+                episodes and 'curriculum' draws from the earliest part of the feed, widening to all of it.
+            batch_size (int): Number of starts drawn at once.
+            curriculum_start (float): Fraction of the valid starts used by the first curriculum episodes.
+            curriculum_episodes (int): Number of episodes after which the curriculum covers the whole feed.
+        """
+        assert mode in SAMPLE_MODES, f"mode must be one of {SAMPLE_MODES}"
+        assert batch_size > 0, "batch_size must be positive"
+        assert 0 < curriculum_start <= 1, "curriculum_start must be in (0, 1]"
+        self.mode = mode
+        self.batch_size = batch_size
+        self.curriculum_start = curriculum_start
+        self.curriculum_episodes = curriculum_episodes
+
+        self.starts = None
+        self.episode_window = None
+        self.episodes = 0
+        self._queue = deque()
+        self._next_sequential = 0
+
+    def fit(self, missing: np.ndarray, episode_window: int) -> None:
+        """
+        Precompute the valid start offsets of a feed.
+
+        Args:
+            missing (np.ndarray): Boolean array of the missing signals, with one row per feed row.
+            episode_window (int): Number of steps per episode.
+
+        Raises:
+            ValueError: If no episode fits in the feed after the warm-up rows.
+        """
+        missing = np.asarray(missing, dtype=bool).reshape(len(missing), -1)
+        n_rows = len(missing)
+        assert 0 < episode_window <= n_rows, "episode_window must fit in the feed"
+
+        # The warm-up lasts until every signal has had a value, the NaNs found later are kept
+        has_value = ~missing
+        first_values = np.where(has_value.any(axis=0), has_value.argmax(axis=0), n_rows)
+        warm_up = int(first_values.max(initial=0))
+        if warm_up + episode_window > n_rows:
+            raise ValueError(f"No episode of {episode_window} steps after the {warm_up} warm-up rows "
+                             f"of a feed of {n_rows} rows")
+        self.starts = np.arange(warm_up, n_rows - episode_window + 1)
+
+        self.episode_window = episode_window
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Drop the starts drawn so far, e.g. after the generator was reseeded.
+        """
+        self.episodes = 0
+        self._queue.clear()
+        self._next_sequential = 0
+
+    def next_start(self, rng: np.random.Generator) -> int:
+        """
+        Get the start offset of the next episode, drawing a new batch when needed.
+
+        Args:
+            rng (np.random.Generator): Generator used to draw the starts.
+
+        Returns:
+            int: Start offset in the feed.
+        """
+        if not self._queue:
+            self._queue.extend(self.sample(rng, self.batch_size).tolist())
+        self.episodes += 1
+        return self._queue.popleft()
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """
+        Draw a batch of start offsets.
+
+        Args:
+            rng (np.random.Generator): Generator used to draw the starts.
+            n (int): Number of starts.
+
+        Returns:
+            np.ndarray: Start offsets in the feed.
+        """
+        assert self.starts is not None, "fit must be called before sampling"
+        n_starts = len(self.starts)
+
+        if self.mode == SAMPLE_STRATIFIED:
+            bounds = np.ceil(np.linspace(0, n_starts, n + 1)).astype(np.int64)
+            low = np.minimum(bounds[:-1], n_starts - 1)
+            positions = rng.integers(low, np.maximum(bounds[1:], low + 1))
+            return self.starts[positions]
+
+        if self.mode == SAMPLE_SEQUENTIAL:
+            stride = self.starts[::self.episode_window]
+            positions = (self._next_sequential + np.arange(n)) % len(stride)
+            self._next_sequential = (positions[-1] + 1) % len(stride)
+            return stride[positions]
+
+        if self.mode == SAMPLE_CURRICULUM:
+            progress = min(1.0, self.episodes / max(1, self.curriculum_episodes))
+            fraction = self.curriculum_start + (1 - self.curriculum_start) * progress
+            return self.starts[rng.integers(0, max(1, int(n_starts * fraction)), n)]
+
+        return self.starts[rng.integers(0, n_starts, n)]
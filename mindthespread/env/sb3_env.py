@@ -0,0 +1,117 @@
+from typing import Any, List, Optional, Sequence, Union
+
+import numpy as np
+from gymnasium.vector import VectorEnv
+
+try:
+    from stable_baselines3.common.vec_env import VecEnv
+except ImportError:  # stable-baselines3 is optional, the adapter then only follows its interface
+    VecEnv = object
+
+
+def _split_infos(infos: dict, num_envs: int) -> List[dict]:
+    """
+    Split the gymnasium vector infos, a dict of per-env arrays with `_key` masks, into one dict per env.
+    """
+    split = [{} for _ in range(num_envs)]
+    for key, values in infos.items():
+        if key.startswith('_'):
+            continue
+        mask = infos.get(f'_{key}')
+        for i in range(num_envs):
+            if mask is None or mask[i]:
+                split[i][key] = values[i]
+    return split
+
+
+class SB3VecEnv(VecEnv):
+    """
+    Stable-Baselines3 `VecEnv` view of a gymnasium vectorized trading env.
+
+    SB3 algorithms wrap any gymnasium env they are given as a single environment, so a
+    `VectorTradingEnv` or `SubprocVectorTradingEnv` passed as is would be seen as one env with
+    batched spaces. This adapter exposes the sub-environments' own spaces and follows the SB3
+    vectorized API: `reset` returns the observations only, `step_wait` returns
+    (observations, rewards, dones, infos) with one info dict per env, and the last observation
+    of a finished episode is in its info under 'terminal_observation'.
+    """
+
+    def __init__(self, vec_env: VectorEnv):
+        """
+        Args:
+            vec_env (VectorEnv): The vectorized env, with its feed already set.
+        """
+        assert vec_env.single_observation_space is not None, "set_ohlc_feed must be called before wrapping"
+        self.vec_env = vec_env
+        # The attributes set by the SB3 base class, which calls back into the envs to find them
+        self.num_envs = vec_env.num_envs
+        self.observation_space = vec_env.single_observation_space
+        self.action_space = vec_env.single_action_space
+        self.reset_infos: List[dict] = [{} for _ in range(self.num_envs)]
+        self._seeds: List[Optional[int]] = [None] * self.num_envs
+        self._options: List[dict] = [{} for _ in range(self.num_envs)]
+        self.render_mode = None
+        self.metadata = {'render_modes': []}
+
+    def seed(self, seed: Optional[int] = None) -> Sequence[Optional[int]]:
+        if seed is None:
+            seed = np.random.randint(0, 2 ** 32 - 1)
+        self._seeds = [seed + i for i in range(self.num_envs)]
+        return self._seeds
+
+    def set_options(self, options: Union[List[dict], dict] = None) -> None:
+        self._options = options if isinstance(options, list) else [options or {}] * self.num_envs
+
+    def reset(self) -> dict:
+        seeds = None if all(seed is None for seed in self._seeds) else self._seeds
+        obs, infos = self.vec_env.reset(seed=seeds, options=self._options[0] or None)
+        self.reset_infos = _split_infos(infos, self.num_envs)
+        self._seeds = [None] * self.num_envs
+        return obs
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self.vec_env.step_async(np.asarray(actions).reshape(self.num_envs))
+
+    def step_wait(self):
+        """
+        Returns:
+            Tuple: (observations, rewards, dones, infos)
+        """
+        obs, rewards, terminated, truncated, infos = self.vec_env.step_wait()
+        dones = terminated | truncated
+        env_infos = _split_infos(infos, self.num_envs)
+        for i in np.flatnonzero(dones):
+            info = env_infos[i]
+            final_info = dict(info.pop('final_info', None) or {})
+            final_info['terminal_observation'] = info.pop('final_observation')
+            final_info['TimeLimit.truncated'] = bool(truncated[i] and not terminated[i])
+            env_infos[i] = final_info
+        return obs, rewards, dones, env_infos
+
+    def close(self) -> None:
+        self.vec_env.close()
+
+    def _targets(self, indices) -> list:
+        envs = getattr(self.vec_env, 'envs', None)
+        if indices is None:
+            indices = range(self.num_envs)
+        elif isinstance(indices, int):
+            indices = [indices]
+        # Sub-environments hosted by worker processes are not reachable, the vectorized env stands for them
+        return [self.vec_env if envs is None else envs[i] for i in indices]
+
+    def get_attr(self, attr_name: str, indices=None) -> List[Any]:
+        return [getattr(env, attr_name) for env in self._targets(indices)]
+
+    def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+        for env in self._targets(indices):
+            setattr(env, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> List[Any]:
+        return [getattr(env, method_name)(*method_args, **method_kwargs) for env in self._targets(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        return [False] * len(self._targets(indices))
+
+    def get_images(self) -> Sequence[Optional[np.ndarray]]:
+        return [None] * self.num_envs
@@ -0,0 +1,321 @@
+import copy
+import multiprocessing as mp
+import os
+import traceback
+from multiprocessing import shared_memory
+from typing import List, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from gymnasium import spaces
+from gymnasium.vector import VectorEnv
+
+from mindthespread.entities.agent import AgentResponse
+from mindthespread.entities.market import Action
+from mindthespread.env.info import INFO_NONE, merge_lazily
+from mindthespread.env.trading_env import TradingEnv
+
+
+def _attach_array(name: str, shape: tuple, dtype) -> tuple:
+    """
+    Attach to a shared memory block created by the parent process and view it as an array.
+
+    Returns:
+        Tuple: (shared memory, array view)
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _worker(remote, parent_remote, blocks: dict, index: pd.Index, observation_space: spaces.Dict,
+            env_kwargs: dict, num_envs: int):
+    """
+    Host `num_envs` environments stepping over market data attached from shared memory.
+
+    Commands are received as (command, payload) tuples and answered with ('ok', result)
+    or ('error', traceback) so the parent can surface worker failures.
+    """
+    parent_remote.close()
+    shms, arrays = [], {}
+    for key, (name, shape, dtype) in blocks.items():
+        shm, arrays[key] = _attach_array(name, shape, dtype)
+        shms.append(shm)
+
+    sampler = env_kwargs.pop('sampler', None)
+    envs = [TradingEnv(sampler=copy.deepcopy(sampler), **env_kwargs) for _ in range(num_envs)]
+    for env in envs:
+        env.bind_market_data(index, arrays['bid'], arrays['ask'], arrays['signals'], observation_space)
+
+    n_signals = arrays['signals'].shape[1]
+    positions = np.zeros(num_envs, dtype=np.int64)
+    signals = np.zeros((num_envs, n_signals), dtype=arrays['signals'].dtype)
+    rewards = np.zeros(num_envs, dtype=np.float64)
+    dones = np.zeros(num_envs, dtype=bool)
+
+    def write_obs(i: int, obs: dict) -> None:
+        positions[i] = obs['position']
+        signals[i] = obs['signals']
+
+    try:
+        while True:
+            command, payload = remote.recv()
+            try:
+                if command == 'reset':
+                    seeds, options = payload
+                    infos = []
+                    for i, (env, seed) in enumerate(zip(envs, seeds)):
+                        obs, info = env.reset(seed=seed, options=options)
+                        write_obs(i, obs)
+                        infos.append(dict(info))
+                    remote.send(('ok', (positions, signals, infos)))
+                elif command == 'step':
+                    actions, qtys, stop_losses = payload
+                    actions = actions.tolist()
+                    if qtys is not None:
+                        # Orders are rebuilt from their arrays, a NaN stop-loss standing for none
+                        actions = [AgentResponse(action, qty=qty, stop_loss=None if np.isnan(stop_loss) else stop_loss)
+                                   for action, qty, stop_loss in zip(actions, qtys.tolist(), stop_losses.tolist())]
+                    infos = []
+                    for i, (env, action) in enumerate(zip(envs, actions)):
+                        obs, rewards[i], done, _, info = env.step(action)
+                        dones[i] = done
+                        info = dict(info)
+                        if done:
+                            final_obs = {'position': obs['position'], 'signals': np.array(obs['signals'])}
+                            final_info = info
+                            obs, info = env.reset()
+                            info = dict(info, final_observation=final_obs, final_info=final_info)
+                        write_obs(i, obs)
+                        infos.append(info)
+                    remote.send(('ok', (positions, signals, rewards, dones, infos)))
+                elif command == 'close':
+                    remote.send(('ok', None))
+                    break
+                else:
+                    raise ValueError(f"Unknown command {command}")
+            except Exception:
+                remote.send(('error', traceback.format_exc()))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        # Views must be released before the shared memory can be closed
+        envs = arrays = None
+        for shm in shms:
+            shm.close()
+        remote.close()
+
+
+class SubprocVectorTradingEnv(VectorEnv):
+    """
+    Vectorized trading environment stepping its episodes in worker processes.
+
+    Signals are calculated once in the parent process and the bid/ask prices and signal
+    matrix are copied to shared memory, which every worker attaches to instead of receiving
+    pickled DataFrames. Each worker hosts a slice of the `num_envs` fast mode `TradingEnv`
+    instances and exchanges actions and observations with the parent in one message per
+    step, so collection throughput scales with the number of workers.
+    """
+
+    def __init__(self, num_envs: int, num_workers: int = None, episode_window: int = None,
+                 start_method: str = None, **env_kwargs):
+        """
+        Initialize the vectorized environment. Workers are started by `set_ohlc_feed`.
+
+        Args:
+            num_envs (int): Number of parallel episodes.
+            num_workers (int): Number of worker processes, defaults to the number of CPUs
+                and is capped at `num_envs`.
+            episode_window (int): Maximum number of steps per episode.
+            start_method (str): multiprocessing start method, e.g. 'spawn'. Defaults to the platform's.
+            **env_kwargs: Additional arguments passed to each `TradingEnv`. A `sampler` is copied so
+                that every sub-environment draws its own episode starts. `info_level` defaults to 'none'
+                since infos are sent back to the parent on every step.
+        """
+        assert num_envs > 0, "num_envs must be positive"
+        num_workers = min(num_workers or os.cpu_count() or 1, num_envs)
+        env_kwargs['fast_mode'] = True
+        env_kwargs.setdefault('info_level', INFO_NONE)
+        self.num_envs = num_envs
+        self.num_workers = num_workers
+        self.episode_window = episode_window
+        self.env_kwargs = dict(env_kwargs, episode_window=episode_window)
+        self.ctx = mp.get_context(start_method)
+
+        # Contiguous slice of the sub-environments hosted by each worker
+        bounds = np.linspace(0, num_envs, num_workers + 1).round().astype(int)
+        self._slices = [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+        # Spaces are known only once the feed (and therefore the signals) is set
+        self.observation_space = self.action_space = None
+        self.single_observation_space = None
+        self.single_action_space = spaces.Discrete(len(Action))
+        self.closed = False
+
+        self.processes = []
+        self.remotes = []
+        self._shms = []
+        self._observations = None
+        self._rewards = np.zeros(num_envs, dtype=np.float64)
+        self._dones = np.zeros(num_envs, dtype=bool)
+        self._actions = None
+
+    def set_ohlc_feed(self, feed_data: pd.DataFrame) -> None:
+        """
+        Set the market data feed shared by all sub-environments and start the workers.
+
+        Args:
+            feed_data (pd.DataFrame): DataFrame containing the feed with bid/ask prices.
+        """
+        self._shutdown()
+
+        head_kwargs = {key: value for key, value in self.env_kwargs.items() if key != 'sampler'}
+        head = TradingEnv(**head_kwargs)
+        head.calc_signals = self.calc_signals
+        head.set_ohlc_feed(feed_data)
+
+        blocks = {key: self._share(values) for key, values in
+                  (('bid', head._bid), ('ask', head._ask), ('signals', head._signal_values))}
+
+        for env_slice in self._slices:
+            remote, worker_remote = self.ctx.Pipe()
+            process = self.ctx.Process(target=_worker, daemon=True,
+                                       args=(worker_remote, remote, blocks, head._index, head.observation_space,
+                                             dict(self.env_kwargs), env_slice.stop - env_slice.start))
+            process.start()
+            worker_remote.close()
+            self.processes.append(process)
+            self.remotes.append(remote)
+
+        super().__init__(self.num_envs, head.observation_space, head.action_space)
+
+        n_signals = head.observation_space['signals'].shape[0]
+        self._observations = {
+            'position': np.zeros(self.num_envs, dtype=np.int64),
+            'signals': np.zeros((self.num_envs, n_signals), dtype=head.observation_space['signals'].dtype),
+        }
+
+    def _share(self, values: np.ndarray) -> tuple:
+        """
+        Copy an array to a new shared memory block owned by this environment.
+
+        Returns:
+            Tuple: (name, shape, dtype) needed by the workers to attach to the block.
+        """
+        shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        self._shms.append(shm)
+        np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+        return shm.name, values.shape, values.dtype
+
+    def calc_signals(self, feed_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calculate trading signals from the feed data.
+
+        Should be overridden, usually by `AgentBase.set_env`. Called in the parent process only.
+        """
+        raise NotImplementedError("Method calc_signals not implemented")
+
+    def _receive(self) -> List:
+        # Drain every worker before raising, so the pipes stay in sync with the commands
+        replies = [remote.recv() for remote in self.remotes]
+        errors = [result for status, result in replies if status == 'error']
+        if errors:
+            raise RuntimeError(f"Worker failed:\n{errors[0]}")
+        return [result for _, result in replies]
+
+    def reset_async(self, seed: Union[int, Sequence[int]] = None, options: dict = None):
+        assert self._observations is not None, "set_ohlc_feed must be called before reset"
+        if seed is None or isinstance(seed, int):
+            seed = [None if seed is None else seed + i for i in range(self.num_envs)]
+        assert len(seed) == self.num_envs, "One seed per sub-environment is required"
+
+        for remote, env_slice in zip(self.remotes, self._slices):
+            remote.send(('reset', (list(seed[env_slice]), options)))
+
+    def reset_wait(self, seed: Union[int, Sequence[int]] = None, options: dict = None):
+        """
+        Wait for all sub-environments to be reset.
+
+        Args:
+            seed (int | Sequence[int]): Optional seed, or one seed per sub-environment.
+            options (dict): Additional options for resetting.
+
+        Returns:
+            Tuple: (observations, infos)
+        """
+        env_infos = []
+        for env_slice, (positions, signals, worker_infos) in zip(self._slices, self._receive()):
+            self._observations['position'][env_slice] = positions
+            self._observations['signals'][env_slice] = signals
+            env_infos.extend(worker_infos)
+
+        self._dones[:] = False
+        return self._copy_obs(), merge_lazily(env_infos)
+
+    def step_async(self, actions: Union[np.ndarray, Sequence[Union[int, AgentResponse]]]):
+        """
+        Send the actions to the workers, as arrays of action values and, when any action is an
+        `AgentResponse`, of the quantities and stop-losses of the orders.
+
+        Args:
+            actions: One action value or `AgentResponse` per sub-environment.
+        """
+        assert len(actions) == self.num_envs, "One action per sub-environment is required"
+        qtys = stop_losses = None
+        if not isinstance(actions, np.ndarray):
+            if any(isinstance(action, AgentResponse) for action in actions):
+                responses = [action if isinstance(action, AgentResponse) else AgentResponse(int(action))
+                             for action in actions]
+                qtys = np.array([response.qty for response in responses], dtype=np.float64)
+                stop_losses = np.array([np.nan if response.stop_loss is None else response.stop_loss
+                                        for response in responses], dtype=np.float64)
+                actions = [response.action.value for response in responses]
+            actions = np.array([int(action) for action in actions], dtype=np.int64)
+
+        for remote, env_slice in zip(self.remotes, self._slices):
+            remote.send(('step', (actions[env_slice],
+                                  None if qtys is None else qtys[env_slice],
+                                  None if stop_losses is None else stop_losses[env_slice])))
+
+    def step_wait(self):
+        """
+        Wait for every sub-environment to step, the ones that are done being reset by their worker.
+
+        Returns:
+            Tuple: (observations, rewards, terminations, truncations, infos)
+        """
+        env_infos = []
+        for env_slice, (positions, signals, rewards, dones, worker_infos) in zip(self._slices, self._receive()):
+            self._observations['position'][env_slice] = positions
+            self._observations['signals'][env_slice] = signals
+            self._rewards[env_slice] = rewards
+            self._dones[env_slice] = dones
+            env_infos.extend(worker_infos)
+
+        return (self._copy_obs(), self._rewards.copy(), self._dones.copy(), self._dones.copy(),
+                merge_lazily(env_infos))
+
+    def _copy_obs(self) -> dict:
+        return {key: value.copy() for key, value in self._observations.items()}
+
+    def _shutdown(self) -> None:
+        """
+        Stop the workers and release the shared memory blocks.
+        """
+        for remote in self.remotes:
+            try:
+                remote.send(('close', None))
+                remote.recv()
+            except (BrokenPipeError, EOFError):
+                pass
+            remote.close()
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+        self.processes, self.remotes, self._shms = [], [], []
+
+    def close_extras(self, **kwargs):
+        self._shutdown()
@@ -1,15 +1,48 @@
-from typing import Union
+import copy
+from typing import Any, NamedTuple, Union
 
 import pandas as pd
-import random
 import logging
 import numpy as np
 from gymnasium import spaces
+from mindthespread import analytics
 from mindthespread.entities.agent import AgentResponse
 from mindthespread.env import BaseEnv
+from mindthespread.env.buffers import StepBuffer
+from mindthespread.env.ledger import TradeLedger
+from mindthespread.env.sampler import EpisodeSampler
+from mindthespread.env.info import LazyInfo, INFO_LEVELS, INFO_SUMMARY, INFO_FULL, RENDER_POLICIES, RENDER_ALL, \
+    RENDER_OFF, RENDER_EVERY, RENDER_TRADES, RENDER_SUMMARY
 from mindthespread.entities.market import Action, Position, Direction
 
 
+class EnvSnapshot(NamedTuple):
+    """
+    Mutable state of a `TradingEnv`, captured by `TradingEnv.snapshot`.
+
+    Market data is not part of the snapshot: it is immutable during an episode and
+    shared by every branch. Result buffers are captured by their lengths only.
+    """
+    cursor: int
+    curr_idx: Any
+    position: Position
+    last_price: float
+    step_count: int
+    total_reward: float
+    closed_transactions: int
+    wins: int
+    step_reward: float
+    transaction_reward: float
+    done: bool
+    traded: bool
+    info: Any
+    log_returns_count: int
+    positions_count: int
+    transactions_count: int
+    trades_count: int
+    entry_cursor: int
+
+
 class TradingEnv(BaseEnv):
     """
     Trading environment simulating the trading of a financial instrument
@@ -18,22 +51,52 @@ class TradingEnv(BaseEnv):
     """
 
     def __init__(self, episode_window: int = None, batch_window: int = 1,
-                 bid_col: str = 'bidclose', ask_col: str = 'askclose', symbol=None, pip=0.0001):
+                 bid_col: str = 'bidclose', ask_col: str = 'askclose', symbol=None, pip=0.0001,
+                 fast_mode: bool = False, buffer_size: int = None, info_level: str = INFO_FULL,
+                 render_policy: str = RENDER_ALL, render_every: int = 1, obs_dtype=np.float64,
+                 copy_obs: bool = False, sampler: EpisodeSampler = None):
         """
         Initialize the Trading Environment.
 
         Args:
             episode_window (int): Maximum number of steps per episode.
-            batch_window (int): Batch size used when resetting.
+            batch_window (int): Number of episode starts drawn at once when resetting.
             bid_col (str): Column name for bid prices in the data feed.
             ask_col (str): Column name for ask prices in the data feed.
             symbol (str): Trading symbol.
-        """
+            fast_mode (bool): Convert bid/ask/signals to NumPy arrays once in `set_ohlc_feed`
+                and advance with an integer cursor instead of pandas index lookups.
+            buffer_size (int): Keep only the latest `buffer_size` log returns, positions and fills
+                in ring buffers, for open-ended live runs. By default buffers are sized to the episode.
+            info_level (str): Verbosity of the per-step info: 'full' builds every key on each step,
+                'summary' builds the reward statistics lazily on access and 'none' skips it.
+            render_policy (str): What `render` logs: 'all' steps, 'off', 'every' `render_every` steps,
+                'trades' only steps with a fill or stop-loss, or the episode 'summary' once it is done.
+            render_every (int): Number of steps between records when `render_policy` is 'every'.
+            obs_dtype: dtype of the signal observations and of the fast mode signal matrix,
+                e.g. np.float32 to halve its memory.
+            copy_obs (bool): Return a new observation with its own signals array from `step` and `reset`,
+                for callers that keep observations such as replay buffers. Otherwise the observation
+                is a shared dict and, in fast mode, its signals are a read-only view of the signal matrix.
+            sampler (EpisodeSampler): Chooses episode starts when `episode_window` is set. Defaults to
+                uniform sampling of `batch_window` starts at a time.
+        """
+        assert info_level in INFO_LEVELS, f"info_level must be one of {INFO_LEVELS}"
+        assert render_policy in RENDER_POLICIES, f"render_policy must be one of {RENDER_POLICIES}"
+        assert render_every > 0, "render_every must be positive"
         self.symbol = symbol
         self.episode_window = episode_window
         self.batch_window = batch_window
         self.bid_col = bid_col
         self.ask_col = ask_col
+        self.fast_mode = fast_mode
+        self.buffer_size = buffer_size
+        self.info_level = info_level
+        self.render_policy = render_policy
+        self.render_every = render_every
+        self.obs_dtype = np.dtype(obs_dtype)
+        self.copy_obs = copy_obs
+        self.sampler = sampler or EpisodeSampler(batch_size=batch_window)
 
         # Initialize state variables
         self.position = None
@@ -47,11 +110,22 @@ class TradingEnv(BaseEnv):
         self.step_reward = 0
         self.transaction_reward = 0
         self.pip = pip
+        self.done = False
+        self.traded = False
+        self._entry_cursor = None
 
         # Initialize data variables
         self.feed = None
         self.signals = None
         self.info = {}
+        self._last_action = None
+
+        # Array-backed market data, used when fast_mode is enabled
+        self._cursor = None
+        self._index = None
+        self._bid = None
+        self._ask = None
+        self._signal_values = None
 
         # Define the action space (BUY, SELL, HOLD, etc.)
         self.action_space = spaces.Discrete(len(Action))
@@ -59,28 +133,42 @@ class TradingEnv(BaseEnv):
         # Observation space (to be set later based on signals)
         self.observation_space = None
 
-        # Tracking transactions and log returns
-        self.transactions = pd.DataFrame(columns=['amount', 'price'])
-        self.log_returns = pd.Series(dtype='float64')
-        self.positions = pd.Series(dtype='float64')
+        # Tracking transactions, positions and log returns, converted to pandas by get_results
+        ring = buffer_size is not None
+        self.log_returns = StepBuffer(buffer_size or 1, dtype=np.float64, ring=ring)
+        self.positions = StepBuffer(buffer_size or 1, dtype=np.float64, ring=ring)
+        self.transactions = StepBuffer(2 * buffer_size if ring else 1,
+                                       dtype=[('amount', np.float64), ('price', np.float64)], ring=ring)
+        self.trades = TradeLedger(buffer_size or 1, ring=ring)
 
-    def set_ohlc_feed(self, feed_data: pd.DataFrame) -> None:
+    def set_ohlc_feed(self, feed_data: pd.DataFrame, signals: pd.DataFrame = None) -> None:
         """
         Set the market data feed for the environment.
 
         Args:
             feed_data (pd.DataFrame): DataFrame containing the feed with bid/ask prices.
+            signals (pd.DataFrame): Optional signals already computed for the feed, e.g. a slice of
+                signals computed once over a longer span. `calc_signals` is not called when given.
         """
         assert feed_data is not None and not feed_data.empty, "Feed data must not be empty"
 
         # Generate trading signals and validate them
         # self.signals = self.calc_signals(feed_data).dropna()
-        self.signals = self.calc_signals(feed_data)
+        self.signals = self.calc_signals(feed_data) if signals is None else signals
         assert not self.signals.empty, "No valid signals generated"
 
         # Align feed with the available signals
         self.feed = feed_data.loc[self.signals.index]
-        self.curr_idx = self.feed.index[0]  # Start at the first index
+
+        if self.fast_mode:
+            self._bind_arrays(self.feed.index,
+                              self.feed[self.bid_col].to_numpy(dtype=np.float64),
+                              self.feed[self.ask_col].to_numpy(dtype=np.float64),
+                              self.signals.to_numpy())
+        self._set_cursor(0)  # Start at the first index
+
+        self._reset_buffers()
+        self._fit_sampler()
 
         # Initialize observation space based on the first set of signals
         if self.observation_space is None:
@@ -89,6 +177,122 @@ class TradingEnv(BaseEnv):
         # Calculate initial observation
         self.calc_obs()
 
+    def attach_feed(self, source: 'TradingEnv') -> None:
+        """
+        Share the market data of another environment instead of recomputing it.
+
+        The feed, signals and their array representation are immutable during an
+        episode, so several environments can step over the same data.
+
+        Args:
+            source (TradingEnv): Environment whose feed was already set with `set_ohlc_feed`.
+        """
+        assert source.feed is not None, "Source environment has no feed"
+        self.feed = source.feed
+        self.signals = source.signals
+        self.observation_space = source.observation_space
+
+        if self.fast_mode:
+            if source.fast_mode:
+                self._bind_arrays(source._index, source._bid, source._ask, source._signal_values)
+            else:
+                self._bind_arrays(self.feed.index,
+                                  self.feed[self.bid_col].to_numpy(dtype=np.float64),
+                                  self.feed[self.ask_col].to_numpy(dtype=np.float64),
+                                  self.signals.to_numpy())
+        self._set_cursor(0)
+
+        self._reset_buffers()
+        self._fit_sampler()
+        self.calc_obs()
+
+    def bind_market_data(self, index: pd.Index, bid: np.ndarray, ask: np.ndarray, signal_values: np.ndarray,
+                         observation_space: spaces.Dict) -> None:
+        """
+        Set the market data from arrays instead of DataFrames, e.g. arrays backed by shared memory.
+
+        Only available in fast mode. The arrays are used as they are when already contiguous and
+        of the expected dtypes, without a copy, and `feed`/`signals` stay unset.
+
+        Args:
+            index (pd.Index): Index of the feed, used to expose `curr_idx`.
+            bid (np.ndarray): Bid prices, one per feed record.
+            ask (np.ndarray): Ask prices, one per feed record.
+            signal_values (np.ndarray): 2-D signal matrix, one row per feed record.
+            observation_space (spaces.Dict): Observation space computed from the signals.
+        """
+        assert self.fast_mode, "bind_market_data requires fast_mode"
+        self.feed = self.signals = None
+        self.observation_space = observation_space
+        self._bind_arrays(index, bid, ask, signal_values)
+        self._set_cursor(0)
+
+        self._reset_buffers()
+        self._fit_sampler()
+        self.calc_obs()
+
+    def _feed_index(self) -> pd.Index:
+        if self.fast_mode and self._index is not None:
+            return self._index
+        return self.feed.index if self.feed is not None else pd.Index([])
+
+    def _fit_sampler(self) -> None:
+        """
+        Precompute the valid episode starts of the feed, skipping the warm-up rows of the signals.
+        """
+        if self.episode_window is not None:
+            if self.signals is None:
+                missing = np.isnan(self._signal_values)
+            else:
+                missing = self.signals.isna().to_numpy()
+            self.sampler.fit(missing, self.episode_window)
+
+    def _bind_arrays(self, index: pd.Index, bid: np.ndarray, ask: np.ndarray, signal_values: np.ndarray) -> None:
+        """
+        Bind contiguous market data arrays used by the fast execution mode.
+
+        Args:
+            index (pd.Index): Index of the feed, used to expose `curr_idx`.
+            bid (np.ndarray): Bid prices, one per feed record.
+            ask (np.ndarray): Ask prices, one per feed record.
+            signal_values (np.ndarray): 2-D signal matrix, one row per feed record.
+        """
+        assert len(bid) == len(ask) == len(signal_values) == len(index), "Market data arrays must be aligned"
+        self._index = index
+        self._bid = np.ascontiguousarray(bid)
+        self._ask = np.ascontiguousarray(ask)
+        self._signal_values = np.ascontiguousarray(signal_values, dtype=self.obs_dtype)
+        # Observations are views of this matrix, protect the shared data from callers
+        self._signal_values.flags.writeable = False
+
+    def _set_cursor(self, cursor: int) -> None:
+        """
+        Move the integer cursor and keep `curr_idx` in sync with it.
+
+        Args:
+            cursor (int): Position in the feed.
+        """
+        self._cursor = cursor
+        self.curr_idx = self._index[cursor] if self.fast_mode else self.feed.index[cursor]
+
+    def _reset_buffers(self) -> None:
+        """
+        Clear the result buffers, sizing them to the episode starting at the current cursor.
+        """
+        if self.buffer_size is None:
+            steps = len(self._feed_index()) - self._cursor
+            if self.episode_window is not None:
+                steps = min(steps, self.episode_window)
+            self.log_returns.reset(steps)
+            self.positions.reset(steps)
+            self.transactions.reset(2 * steps)
+            self.trades.reset(steps)
+        else:
+            self.log_returns.reset()
+            self.positions.reset()
+            self.transactions.reset()
+            self.trades.reset()
+
     def calc_signals(self, feed_data: pd.DataFrame) -> pd.DataFrame:
         """
         Abstract method to calculate trading signals from the feed data.
@@ -97,11 +301,19 @@ class TradingEnv(BaseEnv):
         """
         raise NotImplementedError("Method calc_signals not implemented")
 
-    def close_position(self):
+    def close_position(self, exit_price: float = None, stop: bool = False):
         """
         Close the current open trading position and update rewards and statistics.
+
+        Args:
+            exit_price (float): Price the position is closed at, recorded as a fill.
+            stop (bool): Whether the position is closed by its stop-loss, recorded in the trade ledger.
         """
         if self.position:
+            amount = -self.position.qty if self.position.direction == Direction.Long else self.position.qty
+            self.transactions.append(self._cursor, (amount, exit_price))
+            self.trades.record(self._entry_cursor, self._cursor, self.position.direction.value, self.position.qty,
+                               self.position.entry_price, exit_price, self.transaction_reward, stop)
             self.closed_transactions += 1
             self.total_reward += self.transaction_reward
             if self.transaction_reward > 0:
@@ -120,6 +332,9 @@ class TradingEnv(BaseEnv):
         direction = Direction.Long if agent_resp.action == Action.BUY else Direction.Short
         self.position = Position(direction=direction, qty=agent_resp.qty,
                                  stop_loss=agent_resp.stop_loss, entry_price=entry_price)
+        amount = self.position.qty if direction == Direction.Long else -self.position.qty
+        self.transactions.append(self._cursor, (amount, entry_price))
+        self._entry_cursor = self._cursor
 
     def step(self, agent_resp: Union[int | AgentResponse]):
         """
@@ -134,35 +349,45 @@ class TradingEnv(BaseEnv):
         if isinstance(agent_resp, int):
             agent_resp = AgentResponse(action=agent_resp)
 
-        # Check that the current index is within the feed
-        assert self.curr_idx in self.feed.index, f"Index {self.curr_idx} not in feed"
+        if self.fast_mode:
+            bid_price = self._bid[self._cursor]
+            ask_price = self._ask[self._cursor]
+        else:
+            # Check that the current index is within the feed
+            assert self.curr_idx in self.feed.index, f"Index {self.curr_idx} not in feed"
 
-        # Extract bid and ask prices from the current feed record
-        feed_record = self.feed.loc[self.curr_idx]
-        bid_price = feed_record[self.bid_col]
-        ask_price = feed_record[self.ask_col]
+            # Extract bid and ask prices from the current feed record
+            feed_record = self.feed.loc[self.curr_idx]
+            bid_price = feed_record[self.bid_col]
+            ask_price = feed_record[self.ask_col]
 
         # Update rewards based on the position and price changes
         self.update_position_rewards(bid_price, ask_price)
 
         # Determine the next action and if a stop-loss condition is met
+        fills = self.transactions.count
         action, stop = self.get_action(agent_resp, bid_price, ask_price)
+        self.positions.append(self._cursor, self.signed_qty())
+        self.traded = stop or self.transactions.count != fills
 
         # Check if the episode is done
-        done = self.is_done()
+        done = self.done = self.is_done()
 
         # Update environment information for rendering and debugging
         self.update_info(action, stop)
 
         # Advance to the next step if not done
         if not done:
-            self.curr_idx = self.feed.index[self.feed.index.get_loc(self.curr_idx) + 1]
+            if self.fast_mode:
+                self._set_cursor(self._cursor + 1)
+            else:
+                self._set_cursor(self.feed.index.get_loc(self.curr_idx) + 1)
             self.step_count += 1
 
         # Update the observation
         self.calc_obs()
 
-        return self.obs, self.step_reward, done, done, self.info
+        return self.get_obs(), self.step_reward, done, done, self.info
 
     def reset(self, *, seed: int | None = None, options: dict | None = None):
         """
@@ -175,23 +400,32 @@ class TradingEnv(BaseEnv):
         Returns:
             Tuple: (obs, info)
         """
-        if self.feed is None:
+        super().reset(seed=seed)
+        if seed is not None:
+            self.sampler.reset()
+
+        if self.feed is None and self._index is None:
             self.curr_idx = None
-        elif self.episode_window is not None:
-            # Randomize start index based on episode window size
-            start_idx = random.randint(0, len(self.feed) - self.episode_window)
-            self.curr_idx = self.feed.index[start_idx]
         else:
-            # Default to the first index
-            self.curr_idx = self.feed.index[0]
+            if self.episode_window is not None:
+                # Sample the start index from the valid episode starts
+                start_idx = self.sampler.next_start(self.np_random)
+            else:
+                # Default to the first index
+                start_idx = 0
+
+            self._set_cursor(start_idx)
+            self._reset_buffers()
 
         # Reset state variables
         self.position = None
         self.step_count = self.total_reward = self.closed_transactions = self.wins = self.step_reward = 0
         self.transaction_reward = 0
+        self.done = self.traded = False
+        self._last_action = None
         self.calc_obs()
 
-        return self.obs, self.info
+        return self.get_obs(), self.info
 
     def set_obs_space(self, signals: pd.DataFrame):
         """
@@ -201,9 +435,9 @@ class TradingEnv(BaseEnv):
             signals (pd.DataFrame): DataFrame of trading signals.
         """
         signals_desc = signals.describe()
-        signals_obs_space = spaces.Box(low=signals_desc.loc['min'].values,
-                                       high=signals_desc.loc['max'].values,
-                                       dtype=np.float64)
+        signals_obs_space = spaces.Box(low=signals_desc.loc['min'].values.astype(self.obs_dtype),
+                                       high=signals_desc.loc['max'].values.astype(self.obs_dtype),
+                                       dtype=self.obs_dtype)
         self.observation_space = spaces.Dict({
             "position": spaces.Discrete(len(Direction)),
             "signals": signals_obs_space
@@ -214,8 +448,23 @@ class TradingEnv(BaseEnv):
         Calculate the current observation consisting of the position and signal values.
         """
         self.obs['position'] = Direction.Out.value if self.position is None else self.position.direction.value
-        if self.curr_idx is not None and self.curr_idx in self.signals.index:
-            self.obs['signals'] = self.signals.loc[self.curr_idx].values
+        if self.fast_mode:
+            if self._cursor is not None:
+                self.obs['signals'] = self._signal_values[self._cursor]
+        elif self.curr_idx is not None and self.curr_idx in self.signals.index:
+            signals = self.signals.loc[self.curr_idx].values
+            self.obs['signals'] = signals if signals.dtype == self.obs_dtype else signals.astype(self.obs_dtype)
+
+    def get_obs(self) -> dict:
+        """
+        Get the current observation, copied when `copy_obs` is set.
+
+        Returns:
+            dict: The observation with the position and signal values.
+        """
+        if not self.copy_obs:
+            return self.obs
+        return {key: value.copy() if isinstance(value, np.ndarray) else value for key, value in self.obs.items()}
 
     def update_position_rewards(self, bid_price: float, ask_price: float):
         """
@@ -225,7 +474,7 @@ class TradingEnv(BaseEnv):
             bid_price (float): The current bid price.
             ask_price (float): The current ask price.
         """
-        self.log_returns.at[self.curr_idx] = 0.0
+        self.log_returns.append(self._cursor, 0.0)
         self.step_reward = 0
         if self.position:
             mul = self.position.qty / self.pip
@@ -252,7 +501,7 @@ class TradingEnv(BaseEnv):
         """
         if previous_price is not None and current_price is not None:
             log_return = np.log(current_price / previous_price)
-            self.log_returns.at[self.curr_idx] = log_return
+            self.log_returns.set_last(log_return)
             return (current_price - previous_price) * multiplier
         return 0
 
@@ -278,7 +527,8 @@ class TradingEnv(BaseEnv):
         if action == Action.CLOSE or (
                 action == Action.BUY and self.position and self.position.direction == Direction.Short) or \
                 (action == Action.SELL and self.position and self.position.direction == Direction.Long):
-            self.close_position()
+            self.close_position(exit_price=bid_price if self.position and self.position.direction == Direction.Long
+                                else ask_price, stop=stop)
 
         # Enter a new long position
         if action == Action.BUY and (not self.position or self.position.direction != Direction.Long):
@@ -297,42 +547,215 @@ class TradingEnv(BaseEnv):
         Returns:
             bool: True if the episode is done, False otherwise.
         """
-        return self.curr_idx == self.feed.index[-1] or \
+        if self.fast_mode:
+            at_end = self._cursor == len(self._index) - 1
+        else:
+            at_end = self.curr_idx == self.feed.index[-1]
+        return at_end or \
             (self.episode_window is not None and self.step_count >= self.episode_window - 1)
 
+    def signed_qty(self) -> float:
+        """
+        Returns:
+            float: Quantity of the open position, negative when short and 0 when out of the market.
+        """
+        if not self.position:
+            return 0.0
+        return self.position.qty if self.position.direction == Direction.Long else -self.position.qty
+
     def update_info(self, action, stop):
         """
-        Update the information dictionary with the latest step data.
+        Update the information dictionary with the latest step data, according to `info_level`.
 
         Args:
             action (Action): The action taken by the agent.
             stop (bool): Indicates if a stop-loss condition was met.
         """
-        self.info = {
-            'idx': str(self.curr_idx),
-            'symbol': self.symbol,
+        self._last_action = action
+        if self.info_level == INFO_FULL:
+            self.info = self.build_info(self.curr_idx, self.symbol, action, self.position, self.step_reward,
+                                        self.transaction_reward, self.total_reward, self.closed_transactions,
+                                        self.wins, stop)
+        elif self.info_level == INFO_SUMMARY:
+            self.info = LazyInfo(self.build_summary_info, action, self.step_reward, self.transaction_reward,
+                                 self.total_reward, self.closed_transactions, self.wins, stop)
+        elif self.info:
+            self.info = {}
+
+    @staticmethod
+    def build_info(curr_idx, symbol, action, position, step_reward, transaction_reward, total_reward,
+                   closed_transactions, wins, stop) -> dict:
+        """
+        Build the full information dictionary of a step.
+
+        Returns:
+            dict: Step information used for rendering and debugging.
+        """
+        return {
+            'idx': str(curr_idx),
+            'symbol': symbol,
             'action': action.name,
-            'direction': None if not self.position else self.position.direction.name,
-            'step_reward': round(self.step_reward, 2),
-            'trans_reward': round(self.transaction_reward, 2),
-            'closed_trans': self.closed_transactions,
-            'total_reward': round(self.total_reward + self.transaction_reward, 2),
-            'win_rate': 0 if not self.closed_transactions else round(self.wins / self.closed_transactions, 2),
-            'qty': None if not self.position else self.position.qty,
+            'direction': None if not position else position.direction.name,
+            'step_reward': round(float(step_reward), 2),
+            'trans_reward': round(float(transaction_reward), 2),
+            'closed_trans': closed_transactions,
+            'total_reward': round(float(total_reward + transaction_reward), 2),
+            'win_rate': 0 if not closed_transactions else round(wins / closed_transactions, 2),
+            'qty': None if not position else position.qty,
             'stop': stop,
         }
 
-    def render(self, mode="human"):
+    @staticmethod
+    def build_summary_info(action, step_reward, transaction_reward, total_reward, closed_transactions, wins,
+                           stop) -> dict:
+        """
+        Build the summary information dictionary of a step, holding the keys read by backtests.
+
+        Returns:
+            dict: Step reward statistics.
+        """
+        return {
+            'action': action.name,
+            'step_reward': round(float(step_reward), 2),
+            'closed_trans': closed_transactions,
+            'total_reward': round(float(total_reward + transaction_reward), 2),
+            'win_rate': 0 if not closed_transactions else round(wins / closed_transactions, 2),
+            'stop': stop,
+        }
+
+    def summary(self) -> dict:
+        """
+        Summarize the episode so far, independently of `info_level`.
+
+        Returns:
+            dict: Total reward, win rate and number of closed transactions.
+        """
+        return {
+            'total_reward': round(float(self.total_reward + self.transaction_reward), 2),
+            'win_rate': 0 if not self.closed_transactions else round(self.wins / self.closed_transactions, 2),
+            'closed_trans': self.closed_transactions,
+        }
+
+    def render(self, mode="human", policy: str = None):
         """
         Render the environment for debugging or visualization.
 
+        Records are logged with deferred formatting, so the info is only formatted
+        when the record is actually emitted.
+
         Args:
             mode (str): Rendering mode.
+            policy (str): Overrides `render_policy` for this call.
         """
-        if self.info.get('action') and self.info['action'] != Action.HOLD.name or self.position:
-            logging.warning(self.info)
+        policy = policy or self.render_policy
+        if policy == RENDER_OFF:
+            return
+
+        if policy == RENDER_SUMMARY:
+            if self.done:
+                logging.warning('%s', self.summary())
+            return
+
+        if policy == RENDER_EVERY and self.step_count % self.render_every:
+            return
+
+        if policy == RENDER_TRADES and not self.traded:
+            return
+
+        if policy == RENDER_ALL:
+            if not self.info:
+                return
+
+            # Decided from the env's state, reading the info would build a lazy one even when not emitted
+            if self._last_action not in (None, Action.HOLD) or self.position:
+                logging.warning('%s', self.info)
+            else:
+                logging.info('%s', self.info)
         else:
-            logging.info(self.info)
+            logging.warning('%s', self.info or self.summary())
+
+    def snapshot(self) -> EnvSnapshot:
+        """
+        Capture the mutable state of the environment, to branch from it with `restore`.
+
+        Returns:
+            EnvSnapshot: The captured state.
+        """
+        return EnvSnapshot(self._cursor, self.curr_idx, copy.copy(self.position), self.last_price, self.step_count,
+                           self.total_reward, self.closed_transactions, self.wins, self.step_reward,
+                           self.transaction_reward, self.done, self.traded, self.info, self.log_returns.count,
+                           self.positions.count, self.transactions.count, self.trades.count, self._entry_cursor)
+
+    def restore(self, snapshot: EnvSnapshot) -> dict:
+        """
+        Restore a state captured by `snapshot` on this environment and the same feed.
+
+        Results recorded after the snapshot are discarded. In ring buffer mode, entries
+        overwritten by a branch longer than `buffer_size` cannot be recovered.
+
+        Args:
+            snapshot (EnvSnapshot): The state to restore.
+
+        Returns:
+            dict: The observation at the restored state.
+        """
+        self._cursor = snapshot.cursor
+        self.curr_idx = snapshot.curr_idx
+        self.position = copy.copy(snapshot.position)
+        self.last_price = snapshot.last_price
+        self.step_count = snapshot.step_count
+        self.total_reward = snapshot.total_reward
+        self.closed_transactions = snapshot.closed_transactions
+        self.wins = snapshot.wins
+        self.step_reward = snapshot.step_reward
+        self.transaction_reward = snapshot.transaction_reward
+        self.done = snapshot.done
+        self.traded = snapshot.traded
+        self.info = snapshot.info
+        self.log_returns.truncate(snapshot.log_returns_count)
+        self.positions.truncate(snapshot.positions_count)
+        self.transactions.truncate(snapshot.transactions_count)
+        self.trades.truncate(snapshot.trades_count)
+        self._entry_cursor = snapshot.entry_cursor
+        self.calc_obs()
+        return self.get_obs()
+
+    def get_state(self) -> dict:
+        """
+        Capture the full state of the environment, result buffers included, e.g. to checkpoint a long run.
+
+        Unlike `snapshot`, the state is self-contained and can be pickled and restored by another
+        process with `set_state`, once the same feed was set. Only the entries stored in the result
+        buffers are captured, so its size grows with the steps run rather than with the episode.
+
+        Returns:
+            dict: The picklable state.
+        """
+        return {
+            'snapshot': self.snapshot(),
+            'log_returns': self.log_returns.get_state(),
+            'positions': self.positions.get_state(),
+            'transactions': self.transactions.get_state(),
+            'trades': self.trades.get_state(),
+            'np_random': self._np_random,
+        }
+
+    def set_state(self, state: dict) -> dict:
+        """
+        Restore a state captured by `get_state` on this environment and the same feed.
+
+        Args:
+            state (dict): The state to restore.
+
+        Returns:
+            dict: The observation at the restored state.
+        """
+        self.log_returns.set_state(state['log_returns'])
+        self.positions.set_state(state['positions'])
+        self.transactions.set_state(state['transactions'])
+        self.trades.set_state(state['trades'])
+        self._np_random = state['np_random']
+        return self.restore(state['snapshot'])
 
     def get_results(self):
         """
@@ -341,4 +764,34 @@ class TradingEnv(BaseEnv):
         Returns:
             Tuple: (log_returns, positions, transactions)
         """
-        return self.log_returns, self.positions, self.transactions
\ No newline at end of file
+        index = self._feed_index()
+        log_returns = pd.Series(self.log_returns.values(), index=index[self.log_returns.positions()],
+                                dtype='float64')
+        positions = pd.Series(self.positions.values(), index=index[self.positions.positions()], dtype='float64')
+        transactions = pd.DataFrame(self.transactions.values(), index=index[self.transactions.positions()],
+                                    columns=['amount', 'price'])
+        return log_returns, positions, transactions
+
+    def get_trades(self) -> pd.DataFrame:
+        """
+        Retrieve the closed trades of the trade ledger.
+
+        Returns:
+            pd.DataFrame: One row per closed trade, with entry/exit timestamps, direction, qty,
+            prices, PnL and stop flag.
+        """
+        index = self._feed_index()
+        return self.trades.to_frame(index)
+
+    def performance(self, periods_per_year: int = 252) -> dict:
+        """
+        Compute the performance analytics of the episode so far from the result buffers.
+
+        Args:
+            periods_per_year (int): Number of steps per year, used to annualize ratios.
+
+        Returns:
+            dict: Sharpe, Sortino, max drawdown, exposure, turnover and closed trade statistics.
+        """
+        return analytics.performance(self.log_returns.values(), self.positions.values(), self.trades.values(),
+                                     periods_per_year)
@@ -0,0 +1,152 @@
+import copy
+from typing import Sequence, Union
+
+import numpy as np
+import pandas as pd
+from gymnasium.vector import VectorEnv
+
+from mindthespread.entities.agent import AgentResponse
+from mindthespread.env.info import merge_lazily
+from mindthespread.env.trading_env import TradingEnv
+
+
+class VectorTradingEnv(VectorEnv):
+    """
+    In-process vectorized trading environment.
+
+    Runs `num_envs` independent `TradingEnv` episodes in lockstep over one shared
+    feed. Each sub-environment starts at its own random `episode_window` offset and
+    is reset automatically when its episode is done, following the gymnasium vector API.
+    """
+
+    def __init__(self, num_envs: int, episode_window: int = None, **env_kwargs):
+        """
+        Initialize the vectorized environment.
+
+        Args:
+            num_envs (int): Number of parallel episodes.
+            episode_window (int): Maximum number of steps per episode.
+            **env_kwargs: Additional arguments passed to each `TradingEnv`. A `sampler` is copied so
+                that every sub-environment draws its own episode starts.
+        """
+        assert num_envs > 0, "num_envs must be positive"
+        env_kwargs.setdefault('fast_mode', True)
+        sampler = env_kwargs.pop('sampler', None)
+        self.envs = [TradingEnv(episode_window=episode_window, sampler=copy.deepcopy(sampler), **env_kwargs)
+                     for _ in range(num_envs)]
+        self.num_envs = num_envs
+        self.episode_window = episode_window
+
+        # Spaces are known only once the feed (and therefore the signals) is set
+        self.observation_space = self.action_space = None
+        self.single_observation_space = None
+        self.single_action_space = self.envs[0].action_space
+        self.closed = False
+
+        self._observations = None
+        self._rewards = np.zeros(num_envs, dtype=np.float64)
+        self._dones = np.zeros(num_envs, dtype=bool)
+        self._actions = None
+
+    def set_ohlc_feed(self, feed_data: pd.DataFrame) -> None:
+        """
+        Set the market data feed shared by all sub-environments.
+
+        Signals are calculated once by the first sub-environment and shared with the others.
+
+        Args:
+            feed_data (pd.DataFrame): DataFrame containing the feed with bid/ask prices.
+        """
+        head = self.envs[0]
+        head.calc_signals = self.calc_signals
+        head.set_ohlc_feed(feed_data)
+        for env in self.envs[1:]:
+            env.attach_feed(head)
+
+        super().__init__(self.num_envs, head.observation_space, head.action_space)
+
+        n_signals = head.observation_space['signals'].shape[0]
+        self._observations = {
+            'position': np.zeros(self.num_envs, dtype=np.int64),
+            'signals': np.zeros((self.num_envs, n_signals), dtype=head.observation_space['signals'].dtype),
+        }
+
+    def calc_signals(self, feed_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calculate trading signals from the feed data.
+
+        Should be overridden, usually by `AgentBase.set_env`.
+        """
+        raise NotImplementedError("Method calc_signals not implemented")
+
+    def reset_async(self, seed: Union[int, Sequence[int]] = None, options: dict = None):
+        pass
+
+    def reset_wait(self, seed: Union[int, Sequence[int]] = None, options: dict = None):
+        """
+        Reset all sub-environments.
+
+        Args:
+            seed (int | Sequence[int]): Optional seed, or one seed per sub-environment.
+            options (dict): Additional options for resetting.
+
+        Returns:
+            Tuple: (observations, infos)
+        """
+        assert self._observations is not None, "set_ohlc_feed must be called before reset"
+        if seed is None or isinstance(seed, int):
+            seed = [None if seed is None else seed + i for i in range(self.num_envs)]
+        assert len(seed) == self.num_envs, "One seed per sub-environment is required"
+
+        env_infos = []
+        for i, (env, env_seed) in enumerate(zip(self.envs, seed)):
+            obs, info = env.reset(seed=env_seed, options=options)
+            self._write_obs(i, obs)
+            env_infos.append(info)
+
+        self._dones[:] = False
+        return self._copy_obs(), merge_lazily(env_infos)
+
+    def step_async(self, actions: Union[np.ndarray, Sequence[Union[int, AgentResponse]]]):
+        self._actions = actions
+
+    def step_wait(self):
+        """
+        Step every sub-environment with its action, resetting the ones that are done.
+
+        Returns:
+            Tuple: (observations, rewards, terminations, truncations, infos)
+        """
+        assert len(self._actions) == self.num_envs, "One action per sub-environment is required"
+
+        # Infos are merged only when read, so that lazy sub-environment infos stay unbuilt
+        env_infos = []
+        for i, (env, action) in enumerate(zip(self.envs, self._actions)):
+            if isinstance(action, np.integer):
+                action = int(action)
+
+            obs, self._rewards[i], done, _, info = env.step(action)
+            self._dones[i] = done
+
+            if done:
+                final_obs = {'position': obs['position'], 'signals': np.array(obs['signals'])}
+                final_info = info
+                obs, info = env.reset()
+                info = dict(info, final_observation=final_obs, final_info=final_info)
+
+            self._write_obs(i, obs)
+            env_infos.append(info)
+
+        return (self._copy_obs(), self._rewards.copy(), self._dones.copy(), self._dones.copy(),
+                merge_lazily(env_infos))
+
+    def _write_obs(self, i: int, obs: dict) -> None:
+        self._observations['position'][i] = obs['position']
+        self._observations['signals'][i] = obs['signals']
+
+    def _copy_obs(self) -> dict:
+        return {key: value.copy() for key, value in self._observations.items()}
+
+    def close_extras(self, **kwargs):
+        for env in self.envs:
+            env.close()
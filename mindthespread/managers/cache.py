@@ -0,0 +1,179 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import time
+from typing import Optional
+
+import pandas
+
+from mindthespread.agents.base import AgentBase
+from mindthespread.utils import fingerprint_frame
+
+# Agent attributes that are runtime state rather than parameters
+_AGENT_STATE = ('env', 'cols', 'dtype', 'indicators')
+
+
+def _agent_params(agent: AgentBase) -> dict:
+    params = {}
+    for key, value in sorted(vars(agent).items()):
+        if key in _AGENT_STATE or key.startswith('_'):
+            continue
+        if value is None or isinstance(value, (bool, int, float, str)):
+            params[key] = value
+        elif isinstance(value, (list, tuple)) and all(isinstance(v, (bool, int, float, str)) for v in value):
+            params[key] = list(value)
+        elif isinstance(value, type):
+            params[key] = f'{value.__module__}.{value.__qualname__}'
+    return params
+
+
+def backtest_key(agent: AgentBase, feed_data: pandas.DataFrame, settings: dict,
+                 signals: pandas.DataFrame = None) -> str:
+    """
+    Build a key identifying a backtest by its content.
+
+    Args:
+        agent (AgentBase): The backtested agent.
+        feed_data (pandas.DataFrame): The backtested feed.
+        settings (dict): Environment and run settings affecting the results.
+        signals (pandas.DataFrame): Precomputed signals, when given to the backtest.
+
+    Returns:
+        str: Hex digest identifying the backtest.
+    """
+    content = {
+        'agent': f'{agent.__class__.__module__}.{agent.__class__.__qualname__}',
+        'params': _agent_params(agent),
+        'state': agent.cache_key_state(),
+        'indicators': None if agent.indicators is None else [i.name() for i in agent.indicators],
+        'settings': settings,
+        'feed': fingerprint_frame(feed_data),
+        'signals': None if signals is None else fingerprint_frame(signals),
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True, default=repr).encode()).hexdigest()
+
+
+class BacktestCache:
+    """
+    Content-addressed on-disk cache of backtest results.
+
+    An entry is keyed by the agent class and parameters, its indicator names, the
+    environment settings and a fingerprint of the feed data, so a hit is only possible
+    for an identical backtest. Entries are pickled files of a directory, evicted least
+    recently used first once the directory exceeds `max_bytes`.
+
+    Agent parameters are the agent's public attributes holding plain values. State held
+    elsewhere, such as the weights of a trained model file, is part of the key through
+    `AgentBase.cache_key_state`.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 1 << 30, bypass: bool = False):
+        """
+        Initialize the cache.
+
+        Args:
+            path (str): Directory of the cache entries, created when missing.
+            max_bytes (int): Maximum size of the directory.
+            bypass (bool): Never return stored entries, while still storing new results.
+        """
+        assert max_bytes > 0, 'max_bytes must be positive'
+        self.path = path
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        os.makedirs(self.path, exist_ok=True)
+
+    def key(self, agent: AgentBase, feed_data: pandas.DataFrame, settings: dict,
+            signals: pandas.DataFrame = None) -> str:
+        """
+        Build the key of a backtest, see `backtest_key`.
+        """
+        return backtest_key(agent, feed_data, settings, signals)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, f'{key}.pkl')
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Get a stored entry, marking it as recently used.
+
+        Args:
+            key (str): Key of the backtest.
+
+        Returns:
+            dict: The entry, with the backtest `metrics` and `trades`, or None on a miss or when bypassed.
+        """
+        if self.bypass:
+            return None
+
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as f:
+                entry = pickle.load(f)
+            self._touch(entry_path)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError) as e:
+            logging.warning(f'dropping corrupted cache entry {key}: {e}')
+            self._remove(entry_path)
+            return None
+        return entry
+
+    def put(self, key: str, entry: dict) -> None:
+        """
+        Store an entry, then evict the least recently used entries beyond `max_bytes`.
+
+        Args:
+            key (str): Key of the backtest.
+            entry (dict): The backtest `metrics` and `trades`.
+        """
+        # Write to a temporary file first, concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._entry_path(key))
+        self._touch(self._entry_path(key))
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Evict the least recently used entries until the cache fits in `max_bytes`.
+        """
+        entries = []
+        for entry in os.scandir(self.path):
+            if entry.name.endswith('.pkl'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, entry_path in sorted(entries):
+            if size <= self.max_bytes:
+                break
+            self._remove(entry_path)
+            size -= entry_size
+
+    def clear(self) -> None:
+        """
+        Remove every entry.
+        """
+        for entry in os.scandir(self.path):
+            if entry.name.endswith('.pkl'):
+                self._remove(entry.path)
+
+    @staticmethod
+    def _touch(entry_path: str) -> None:
+        # The modification time orders entries by last use; file system clocks can be too coarse for it
+        now = time.time_ns()
+        os.utime(entry_path, ns=(now, now))
+
+    @staticmethod
+    def _remove(entry_path: str) -> None:
+        try:
+            os.remove(entry_path)
+        except FileNotFoundError:
+            pass
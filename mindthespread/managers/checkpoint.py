@@ -0,0 +1,143 @@
+import logging
+import os
+import pickle
+import tempfile
+import time
+from typing import Any, Optional
+
+from mindthespread.agents.base import AgentBase
+
+# Agent attributes that are rebuilt on resume rather than checkpointed
+_AGENT_RUNTIME = ('env',)
+
+
+class Checkpointer:
+    """
+    Periodic checkpoints of long-running jobs in a local directory.
+
+    A checkpoint is a pickled state saved atomically under a name, so a job killed
+    while saving still resumes from its previous checkpoint. A checkpointer paces one
+    job at a time: `due` tells when `every_steps` steps or `every_seconds` seconds
+    went by since the last save.
+    """
+
+    def __init__(self, path: str, every_steps: int = 10000, every_seconds: float = None):
+        """
+        Initialize the checkpointer.
+
+        Args:
+            path (str): Directory of the checkpoints, created when missing.
+            every_steps (int): Number of steps between two checkpoints.
+            every_seconds (float): Optional number of seconds between two checkpoints, whichever comes first.
+        """
+        assert every_steps is None or every_steps > 0, 'every_steps must be positive'
+        assert every_seconds is None or every_seconds > 0, 'every_seconds must be positive'
+        self.path = path
+        self.every_steps = every_steps
+        self.every_seconds = every_seconds
+        self._last_step = 0
+        self._last_time = time.monotonic()
+        os.makedirs(self.path, exist_ok=True)
+
+    def _checkpoint_path(self, name: str) -> str:
+        return os.path.join(self.path, f'{name}.ckpt')
+
+    def start(self, step: int = 0) -> None:
+        """
+        Start pacing a job, resumed at `step`.
+
+        Args:
+            step (int): Current step of the job.
+        """
+        self._last_step = step
+        self._last_time = time.monotonic()
+
+    def due(self, step: int) -> bool:
+        """
+        Check whether a checkpoint is due.
+
+        Args:
+            step (int): Current step of the job.
+
+        Returns:
+            bool: True once `every_steps` steps or `every_seconds` seconds went by since the last save.
+        """
+        return (self.every_steps is not None and step - self._last_step >= self.every_steps) or \
+            (self.every_seconds is not None and time.monotonic() - self._last_time >= self.every_seconds)
+
+    def save(self, name: str, state: Any, step: int = None) -> None:
+        """
+        Save a checkpoint, replacing the previous one of the same name.
+
+        Args:
+            name (str): Name of the job.
+            state: Picklable state of the job.
+            step (int): Current step of the job, resetting the pacing of `due`.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._checkpoint_path(name))
+        if step is not None:
+            self.start(step)
+        logging.debug(f'checkpoint {name} saved')
+
+    def load(self, name: str) -> Optional[Any]:
+        """
+        Load the last checkpoint of a job.
+
+        Args:
+            name (str): Name of the job.
+
+        Returns:
+            The saved state, or None when there is no checkpoint.
+        """
+        try:
+            with open(self._checkpoint_path(name), 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+
+    def clear(self, name: str) -> None:
+        """
+        Remove the checkpoint of a completed job.
+
+        Args:
+            name (str): Name of the job.
+        """
+        try:
+            os.remove(self._checkpoint_path(name))
+        except FileNotFoundError:
+            pass
+
+
+def agent_state(agent: AgentBase) -> Optional[bytes]:
+    """
+    Capture the picklable state of an agent.
+
+    The state is pickled once here, the checkpoint then only copies the bytes.
+
+    Args:
+        agent (AgentBase): The agent.
+
+    Returns:
+        bytes: The agent's pickled attributes, or None when they cannot be pickled (e.g. a loaded RL model).
+    """
+    state = {key: value for key, value in vars(agent).items() if key not in _AGENT_RUNTIME}
+    try:
+        return pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        logging.warning(f'agent {agent.__class__.__name__} state is not picklable, not checkpointed: {e}')
+        return None
+
+
+def restore_agent_state(agent: AgentBase, state: Optional[bytes]) -> None:
+    """
+    Restore a state captured by `agent_state`.
+
+    Args:
+        agent (AgentBase): The agent.
+        state (bytes): The captured state, ignored when None.
+    """
+    if state is not None:
+        vars(agent).update(pickle.loads(state))
@@ -0,0 +1,162 @@
+import logging
+import time
+from typing import Callable, Dict, Optional
+
+import pandas
+
+from mindthespread.agents.base import AgentBase
+from mindthespread.agents.rl import RLAgent
+from mindthespread.entities.agent import AgentResponse
+from mindthespread.entities.market import Action, Direction
+from mindthespread.feedstore.feeds.feed import Feed
+from mindthespread.ta_stream import SignalStream
+
+
+class LiveRunner:
+    """
+    Streams new candles of several symbols to their agents.
+
+    Each symbol keeps a rolling in-memory window of its latest `window` records. New candles
+    are appended to the window, which drops as many old ones, and only the signals of the new
+    candles are calculated with `AgentBase.update_signals`. When the agent's indicators can be
+    updated incrementally, each symbol also keeps their state, e.g. the running sums of its
+    SMAs, and the work per bar is constant. Otherwise it is bounded by the window size, and in
+    both cases it does not grow with the time the runner has been up.
+
+    The position passed to `act` follows the agent's own responses, as if every order was filled.
+    """
+
+    def __init__(self, agents: Dict[str, AgentBase], feeds: Dict[str, Feed] = None, window: int = None,
+                 on_response: Callable[[str, object, AgentResponse], None] = None):
+        """
+        Initialize the runner.
+
+        Args:
+            agents (Dict[str, AgentBase]): Agent of each symbol.
+            feeds (Dict[str, Feed]): Feed of each symbol, polled by `poll`. Candles can also be
+                pushed directly with `push`.
+            window (int): Number of records kept per symbol, by default each agent's `min_records_needed`.
+            on_response (Callable): Called with (symbol, curr_idx, response) for every decision,
+                e.g. to place the order with a broker.
+        """
+        assert window is None or window > 0, 'window must be positive'
+        self.agents = agents
+        self.feeds = feeds or {}
+        self.window = window
+        self.on_response = on_response
+
+        self.windows: Dict[str, pandas.DataFrame] = {}
+        self.signals: Dict[str, pandas.Series] = {}
+        self.streams: Dict[str, Optional[SignalStream]] = {}
+        self.positions: Dict[str, Direction] = {symbol: Direction.Out for symbol in agents}
+
+        for agent in agents.values():
+            if isinstance(agent, RLAgent) and agent.rl_model is None:
+                agent.load_rl_model()
+
+    def window_size(self, symbol: str) -> int:
+        return self.window or self.agents[symbol].min_records_needed
+
+    def warm_up(self, symbol: str, history: pandas.DataFrame = None) -> None:
+        """
+        Fill the window of a symbol with its latest records, fetched from its feed unless given.
+
+        Args:
+            symbol (str): The symbol.
+            history (pandas.DataFrame): Optional latest records of the symbol.
+        """
+        size = self.window_size(symbol)
+        if history is None:
+            history = self.feeds[symbol].fetch_latest(size).data
+        self.windows[symbol] = history.iloc[-size:]
+        self.signals.pop(symbol, None)
+        self.streams.pop(symbol, None)
+
+    def push(self, symbol: str, candles: pandas.DataFrame) -> Optional[AgentResponse]:
+        """
+        Append new candles of a symbol and let its agent act on the latest one.
+
+        Candles not newer than the last record of the window are ignored.
+
+        Args:
+            symbol (str): The symbol.
+            candles (pandas.DataFrame): New records of the symbol.
+
+        Returns:
+            AgentResponse: The decision on the latest candle, or None when there was no new candle
+            or its signals are not available yet.
+        """
+        window = self.windows.get(symbol)
+        if window is not None and len(window):
+            candles = candles[candles.index > window.index[-1]]
+        if candles.empty:
+            return None
+
+        agent = self.agents[symbol]
+        if symbol not in self.streams:
+            self.streams[symbol] = agent.signal_stream()
+
+        # Every new candle is kept for the update, so that a stream sees them all
+        size = self.window_size(symbol)
+        window = candles if window is None else pandas.concat([window, candles])
+        window = window.iloc[-max(size, len(candles)):]
+        signals = agent.update_signals(window, len(candles), self.streams[symbol])
+        self.windows[symbol] = window.iloc[-size:]
+        latest = self.signals[symbol] = signals.iloc[-1]
+        if latest.isna().any():
+            return None
+
+        curr_idx = signals.index[-1]
+        obs = {'position': self.positions[symbol].value, 'signals': latest.to_numpy()}
+        response = agent.act(curr_idx, obs)
+        self._update_position(symbol, response)
+
+        if self.on_response is not None:
+            self.on_response(symbol, curr_idx, response)
+        return response
+
+    def _update_position(self, symbol: str, response: AgentResponse) -> None:
+        if response.action == Action.BUY:
+            self.positions[symbol] = Direction.Long
+        elif response.action == Action.SELL:
+            self.positions[symbol] = Direction.Short
+        elif response.action == Action.CLOSE:
+            self.positions[symbol] = Direction.Out
+
+    def poll(self) -> Dict[str, AgentResponse]:
+        """
+        Fetch the candles of every feed since its last record and push them.
+
+        Returns:
+            Dict[str, AgentResponse]: Decision of every symbol that received a new candle.
+        """
+        responses = {}
+        for symbol, feed in self.feeds.items():
+            window = self.windows.get(symbol)
+            if window is None or window.empty:
+                self.warm_up(symbol)
+                candles = self.windows.pop(symbol)
+            else:
+                candles = feed.fetch_by_date_range(start_time=window.index[-1]).data
+
+            response = self.push(symbol, candles)
+            if response is not None:
+                responses[symbol] = response
+        return responses
+
+    def run(self, interval: float, max_iterations: int = None) -> None:
+        """
+        Poll the feeds every `interval` seconds.
+
+        Args:
+            interval (float): Seconds between two polls.
+            max_iterations (int): Optional number of polls, forever by default.
+        """
+        iteration = 0
+        while max_iterations is None or iteration < max_iterations:
+            started = time.monotonic()
+            responses = self.poll()
+            logging.info(f'Live poll {iteration}: {len(responses)} decisions in {time.monotonic() - started:.3f}s')
+            iteration += 1
+            if max_iterations is None or iteration < max_iterations:
+                time.sleep(max(0.0, interval - (time.monotonic() - started)))
@@ -5,7 +5,12 @@ import pandas
 
 from mindthespread.agents.base import AgentBase
 from mindthespread.agents.rl import RLAgent
+from mindthespread.env.portfolio_env import PortfolioTradingEnv
 from mindthespread.env.trading_env import TradingEnv
+from mindthespread.env.vector_env import VectorTradingEnv
+from mindthespread.managers.cache import BacktestCache, backtest_key
+from mindthespread.managers.checkpoint import Checkpointer, agent_state, restore_agent_state
+from mindthespread.managers.vectorized import simulate_targets
 from mindthespread.tracking.base import TrackingBase
 
 
@@ -15,44 +20,143 @@ logging.basicConfig(level=logging.INFO)
 
 
 def backtest(agent: AgentBase, feed_data: pandas.DataFrame, symbol: str = None, tracker: TrackingBase = None,
-             bid_col='close', ask_close='close', pip=1):
+             bid_col='close', ask_close='close', pip=1, info_level: str = 'full', render_policy: str = 'all',
+             render_every: int = 1, signals: pandas.DataFrame = None, max_drawdown: float = None,
+             min_reward: float = None, cache: BacktestCache = None, return_trades: bool = False,
+             checkpointer: Checkpointer = None, fast_mode: bool = True):
+    """
+    Backtest an agent by stepping a TradingEnv over the feed.
 
+    The env runs in `fast_mode` by default, stepping over NumPy arrays of the feed and signals.
+
+    The run is pruned, i.e. stopped early, once the reward drops more than `max_drawdown` below
+    its peak or below `min_reward`, both in reward units (pips times quantity). When either
+    threshold is set, the metrics also report the number of `bars` stepped and whether the run was `pruned`.
+
+    With a `cache`, an identical backtest returns its stored metrics and trades without stepping.
+    Set `return_trades` to get `(metrics, trades)`, the trades being the env's trade ledger.
+
+    With a `checkpointer`, the env and agent states are saved periodically and an interrupted
+    backtest of the same agent and feed resumes from its last checkpoint.
+    """
     assert feed_data is not None and len(feed_data) > 0, 'Feed data must not be empty'
 
     logging.info(f'Backtesting, agent {str(agent.__class__)}')
 
-    env = TradingEnv(bid_col=bid_col, ask_col=ask_close, pip=pip)
-    agent.set_env(env)
+    entry = run_key = None
+    if cache is not None or checkpointer is not None:
+        settings = {'bid_col': bid_col, 'ask_close': ask_close, 'pip': pip, 'max_drawdown': max_drawdown,
+                    'min_reward': min_reward}
+        run_key = backtest_key(agent, feed_data, settings, signals)
+    if cache is not None:
+        entry = cache.get(run_key)
+
+    if entry is not None:
+        logging.info(f'Backtest cache hit: {run_key}')
+        backtest_metrics, trades = dict(entry['metrics']), entry['trades']
+    else:
+        env = TradingEnv(bid_col=bid_col, ask_col=ask_close, pip=pip, info_level=info_level,
+                         render_policy=render_policy, render_every=render_every, fast_mode=fast_mode)
+        agent.set_env(env)
+
+        if isinstance(agent, RLAgent):
+            agent.load_rl_model()
+
+        env.set_ohlc_feed(feed_data, signals=signals)
+        obs, info = env.reset()
+        done = pruned = False
+        prune = max_drawdown is not None or min_reward is not None
+        peak = 0
+        step = 0
+        if checkpointer is not None:
+            state = checkpointer.load(run_key)
+            if state is not None:
+                obs = env.set_state(state['env'])
+                restore_agent_state(agent, state['agent'])
+                step, peak = state['step'], state['peak']
+                logging.info(f'Resuming backtest {run_key} at step {step}')
+            checkpointer.start(step)
+
+        while not done:
+            step += 1
+            curr_idx = env.curr_idx
+            agent_resp = agent.act(curr_idx, obs)
+            obs, reward, done, truncated, info = env.step(agent_resp)
+
+            if tracker is not None and tracker.log_steps:
+                tracker.log_metrics(env.summary(), step=step)
+                tracker.log_metric('step_reward', round(env.step_reward, 2), step=step)
+
+            env.render()
+
+            if prune and not done:
+                equity = env.total_reward + env.transaction_reward
+                peak = max(peak, equity)
+                pruned = (max_drawdown is not None and peak - equity > max_drawdown) or \
+                    (min_reward is not None and equity < min_reward)
+                done = pruned
+
+            if checkpointer is not None and not done and checkpointer.due(step):
+                checkpointer.save(run_key, {'env': env.get_state(), 'agent': agent_state(agent), 'step': step,
+                                            'peak': peak}, step=step)
+
+        if checkpointer is not None:
+            checkpointer.clear(run_key)
+
+        backtest_metrics = env.summary()
+        if prune:
+            backtest_metrics.update(bars=step, pruned=pruned)
+
+        trades = env.get_trades() if cache is not None or return_trades else None
+        if cache is not None:
+            cache.put(run_key, {'metrics': dict(backtest_metrics), 'trades': trades})
 
-    if isinstance(agent, RLAgent):
-        agent.load_rl_model()
+    logging.info(backtest_metrics)
 
-    env.set_ohlc_feed(feed_data)
-    obs, info = env.reset()
-    done = False
-    step = 0
-    backtest_metrics = {}
-    while not done:
-        step += 1
-        curr_idx = env.curr_idx
-        agent_resp = agent.act(curr_idx, obs)
-        obs, reward, done, truncated, info = env.step(agent_resp)
+    # track experiment
+    if tracker is not None:
+        tracker.log_param('agent', str(agent.__class__))
+
+        if agent.indicators is not None:
+            indicators_names = [i.name() for i in agent.indicators]
+            tracker.log_param('indicators', indicators_names)
+
+        if symbol is not None:
+            tracker.log_param('symbol', symbol)
+
+        tracker.log_metrics(backtest_metrics)
+
+    if return_trades:
+        return backtest_metrics, trades
+    return backtest_metrics
 
-        backtest_metrics = {
-            'total_reward': info['total_reward'],
-            'win_rate': info['win_rate'],
-            'closed_trans': info['closed_trans'],
-        }
 
-        if tracker is not None and tracker.log_steps:
-            tracker.log_metrics(backtest_metrics, step=step)
-            tracker.log_metric('step_reward', info['step_reward'], step=step)
+def vectorized_backtest(agent: AgentBase, feed_data: pandas.DataFrame, symbol: str = None,
+                        tracker: TrackingBase = None, bid_col='close', ask_close='close', pip=1,
+                        signals: pandas.DataFrame = None, max_drawdown: float = None, min_reward: float = None):
+    """
+    Backtest an agent implementing `act_vectorized` over the whole feed at once.
 
-        env.render()
+    Returns the same metrics as `backtest` on the same inputs, pruning thresholds included,
+    without stepping the environment.
+    """
+    assert feed_data is not None and len(feed_data) > 0, 'Feed data must not be empty'
+
+    logging.info(f'Vectorized backtesting, agent {str(agent.__class__)}')
+
+    if signals is None:
+        signals = agent.calc_signals(feed_data)
+    feed = feed_data.loc[signals.index]
+    targets = agent.act_vectorized(signals.to_numpy())
+    backtest_metrics, trades = simulate_targets(targets,
+                                                feed[bid_col].to_numpy(dtype='float64'),
+                                                feed[ask_close].to_numpy(dtype='float64'),
+                                                qty=getattr(agent, 'qty', 1),
+                                                stop_loss=getattr(agent, 'stop_loss', None),
+                                                pip=pip, max_drawdown=max_drawdown, min_reward=min_reward)
 
     logging.info(backtest_metrics)
 
-    # track experiment
     if tracker is not None:
         tracker.log_param('agent', str(agent.__class__))
 
@@ -67,12 +171,51 @@ def backtest(agent: AgentBase, feed_data: pandas.DataFrame, symbol: str = None,
 
     return backtest_metrics
 
-def rl_train(agent: RLAgent, feed: pandas.DataFrame, tracker: TrackingBase = None):
-    assert isinstance(agent, (AgentBase, RLAgent)), 'agent does not support RL'
-    logging.info(f'RL Training, agent: {str(agent.__class__)}')
-    env = TradingEnv()
+
+def backtest_portfolio(agent: AgentBase, feeds: list[pandas.DataFrame] | dict[str, pandas.DataFrame],
+                       tracker: TrackingBase = None, bid_col='close', ask_close='close', pip=1):
+    """
+    Backtest an agent over a basket of aligned feeds in one pass over time.
+
+    Returns:
+        Tuple: (backtest_metrics, symbol_metrics), the aggregate metrics and a DataFrame of metrics per symbol.
+    """
+    assert feeds is not None and len(feeds) > 0, 'Feeds must not be empty'
+
+    logging.info(f'Backtesting portfolio, agent {str(agent.__class__)}')
+
+    env = PortfolioTradingEnv(bid_col=bid_col, ask_col=ask_close, pip=pip)
     agent.set_env(env)
-    agent.rl_train(feed)
+    env.set_ohlc_feed(feeds)
+    obs, info = env.reset()
+    done = False
+    while not done:
+        curr_idx = env.curr_idx
+        agent_resps = agent.act_batch(curr_idx, obs)
+        obs, reward, done, truncated, info = env.step(agent_resps)
+
+    backtest_metrics = env.summary()
+    symbol_metrics = env.symbol_summary()
+    logging.info(backtest_metrics)
+
+    if tracker is not None:
+        tracker.log_param('agent', str(agent.__class__))
+        tracker.log_param('symbols', env.symbols)
+        tracker.log_metrics(backtest_metrics)
+
+    return backtest_metrics, symbol_metrics
+
+
+def rl_train(agent: RLAgent, feed: pandas.DataFrame, tracker: TrackingBase = None, num_envs: int = 1,
+             episode_window: int = None):
+    assert isinstance(agent, (AgentBase, RLAgent)), 'agent does not support RL'
+    logging.info(f'RL Training, agent: {str(agent.__class__)}, num_envs: {num_envs}')
+    vec_env = None
+    if num_envs > 1:
+        assert episode_window is not None, 'episode_window is required to train on multiple episodes'
+        vec_env = VectorTradingEnv(num_envs=num_envs, episode_window=episode_window)
+    agent.set_env(TradingEnv(episode_window=episode_window))
+    agent.rl_train(feed, vec_env=vec_env)
 
     # todo: track RL
     return
\ No newline at end of file
@@ -0,0 +1,270 @@
+import hashlib
+import itertools
+import json
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Sequence, Type, Union
+
+import numpy as np
+import pandas
+
+from mindthespread.agents.base import AgentBase
+from mindthespread.managers.checkpoint import Checkpointer
+from mindthespread.managers.offline_manager import backtest, vectorized_backtest
+from mindthespread.ta import indicator_cache
+from mindthespread.tracking.base import TrackingBase
+from mindthespread.utils import fingerprint_frame, get_class
+
+# Per-worker state, set once by _init_worker so the feed is not shipped with every job
+_worker_feed = None
+_worker_settings = None
+
+
+def param_grid(space: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Expand a parameter grid into the list of all its combinations.
+
+    Args:
+        space (Dict[str, Sequence]): Candidate values per parameter name.
+
+    Returns:
+        List[Dict]: One parameter dict per combination.
+    """
+    names = list(space.keys())
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def param_samples(space: Dict[str, Union[Sequence[Any], Callable]], n_iter: int, seed: int = None) -> List[Dict[str, Any]]:
+    """
+    Draw random parameter combinations from a search space.
+
+    Args:
+        space (Dict[str, Sequence | Callable]): Per parameter, either candidate values drawn uniformly
+            or a callable taking a `np.random.Generator` and returning one value.
+        n_iter (int): Number of combinations.
+        seed (int): Optional random seed for reproducibility.
+
+    Returns:
+        List[Dict]: One parameter dict per combination.
+    """
+    rng = np.random.default_rng(seed)
+    samples = []
+    for _ in range(n_iter):
+        params = {}
+        for name, values in space.items():
+            if callable(values):
+                params[name] = values(rng)
+            else:
+                params[name] = values[int(rng.integers(len(values)))]
+        samples.append(params)
+    return samples
+
+
+def _init_worker(feed_data: pandas.DataFrame, settings: dict):
+    global _worker_feed, _worker_settings
+    _worker_feed = feed_data
+    _worker_settings = settings
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def _run_job(job: tuple) -> dict:
+    agent_class, params, bars = job
+    agent = get_class(agent_class)(**params)
+    feed_data = _worker_feed if bars is None else _worker_feed.iloc[:bars]
+    settings = dict(_worker_settings)
+    fast_mode = settings.pop('fast_mode')
+    # The jobs of a worker share its feed, so indicators common to several parameter sets are computed once
+    signals = agent.calc_signals(feed_data, cache=indicator_cache)
+    if settings.pop('vectorized'):
+        metrics = vectorized_backtest(agent, feed_data, signals=signals, **settings)
+    else:
+        metrics = backtest(agent, feed_data, info_level='summary', render_policy='off', signals=signals,
+                           fast_mode=fast_mode, **settings)
+    metrics.setdefault('bars', len(feed_data))
+    metrics.setdefault('pruned', False)
+    return metrics
+
+
+def _executor(feed_data: pandas.DataFrame, settings: dict, max_workers: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(feed_data, settings))
+
+
+def sweep(agent_class: Union[Type[AgentBase], str], space: Dict[str, Union[Sequence[Any], Callable]],
+          feed_data: pandas.DataFrame, n_iter: int = None, seed: int = None, max_workers: int = None,
+          tracker: TrackingBase = None, bid_col='close', ask_close='close', pip=1,
+          vectorized: bool = False, max_drawdown: float = None, min_reward: float = None,
+          checkpointer: Checkpointer = None, fast_mode: bool = True) -> pandas.DataFrame:
+    """
+    Backtest an agent over a parameter grid or random search space in a process pool.
+
+    The feed is sent to each worker once, when the worker starts, and jobs only carry
+    their parameters. Jobs are handed out in chunks, so the sweep scales with the
+    number of workers as long as each backtest outweighs the cost of a round trip.
+
+    Args:
+        agent_class (Type[AgentBase] | str): Agent class, or its dotted path, built with each parameter set.
+        space (Dict[str, Sequence | Callable]): Parameter grid, or random search space when `n_iter` is set.
+        feed_data (pandas.DataFrame): Feed to backtest on.
+        n_iter (int): Number of random combinations; the whole grid is run when None.
+        seed (int): Random seed of the random search.
+        max_workers (int): Number of worker processes, all cores by default.
+        tracker (TrackingBase): Optional tracker, logged from the parent process.
+        bid_col (str): Column name for bid prices.
+        ask_close (str): Column name for ask prices.
+        pip (float): Pip size.
+        vectorized (bool): Use `vectorized_backtest`, for agents implementing `act_vectorized`.
+        max_drawdown (float): Prune a run once its reward drops this much below its peak, see `backtest`.
+        min_reward (float): Prune a run once its reward drops below this threshold, see `backtest`.
+        checkpointer (Checkpointer): Save the results of completed jobs every `every_steps` jobs, an
+            interrupted sweep of the same space and feed only running the remaining jobs.
+        fast_mode (bool): Step the backtests' envs over NumPy arrays, see `TradingEnv`.
+
+    Returns:
+        pandas.DataFrame: One row per parameter set, with the parameters followed by the backtest metrics,
+        the number of bars consumed and whether the run was pruned.
+    """
+    assert feed_data is not None and len(feed_data) > 0, 'Feed data must not be empty'
+
+    params_list = param_grid(space) if n_iter is None else param_samples(space, n_iter, seed)
+    assert len(params_list) > 0, 'The parameter space is empty'
+
+    max_workers = max_workers or os.cpu_count() or 1
+    max_workers = min(max_workers, len(params_list))
+    chunksize = max(1, len(params_list) // (max_workers * 4))
+    settings = {'bid_col': bid_col, 'ask_close': ask_close, 'pip': pip, 'vectorized': vectorized,
+                'max_drawdown': max_drawdown, 'min_reward': min_reward, 'fast_mode': fast_mode}
+
+    logging.info(f'Sweep, agent {str(agent_class)}, {len(params_list)} jobs on {max_workers} workers')
+
+    jobs = [(agent_class, params, None) for params in params_list]
+    if checkpointer is None:
+        with _executor(feed_data, settings, max_workers) as executor:
+            metrics = list(executor.map(_run_job, jobs, chunksize=chunksize))
+    else:
+        metrics = _checkpointed_jobs(jobs, feed_data, settings, max_workers, checkpointer)
+
+    results = pandas.DataFrame([{**params, **job_metrics} for params, job_metrics in zip(params_list, metrics)])
+    _log_results(tracker, agent_class, space, results)
+    return results
+
+
+def _checkpointed_jobs(jobs: list, feed_data: pandas.DataFrame, settings: dict, max_workers: int,
+                       checkpointer: Checkpointer) -> list:
+    content = {'jobs': [(str(agent_class), params) for agent_class, params, _ in jobs], 'settings': settings,
+               'feed': fingerprint_frame(feed_data)}
+    name = 'sweep-' + hashlib.sha256(json.dumps(content, sort_keys=True, default=repr).encode()).hexdigest()
+
+    completed = checkpointer.load(name) or {}
+    if completed:
+        logging.info(f'Resuming sweep {name} with {len(completed)} of {len(jobs)} jobs completed')
+    checkpointer.start(len(completed))
+
+    with _executor(feed_data, settings, max_workers) as executor:
+        futures = {executor.submit(_run_job, job): i for i, job in enumerate(jobs) if i not in completed}
+        for future in as_completed(futures):
+            completed[futures[future]] = future.result()
+            if checkpointer.due(len(completed)):
+                checkpointer.save(name, completed, step=len(completed))
+
+    checkpointer.clear(name)
+    return [completed[i] for i in range(len(jobs))]
+
+
+def successive_halving(agent_class: Union[Type[AgentBase], str], space: Dict[str, Union[Sequence[Any], Callable]],
+                       feed_data: pandas.DataFrame, min_bars: int, eta: int = 3, n_iter: int = None,
+                       seed: int = None, metric: str = 'total_reward', max_workers: int = None,
+                       tracker: TrackingBase = None, bid_col='close', ask_close='close', pip=1,
+                       vectorized: bool = False, max_drawdown: float = None,
+                       min_reward: float = None, fast_mode: bool = True) -> pandas.DataFrame:
+    """
+    Sweep with successive halving: every candidate is backtested on a short prefix of the feed,
+    and only the best `1 / eta` of them are promoted to a prefix `eta` times longer, until the
+    survivors run on the whole feed.
+
+    Pruned runs rank below every run that completed its rung. All rungs share one process pool.
+
+    Args:
+        agent_class (Type[AgentBase] | str): Agent class, or its dotted path, built with each parameter set.
+        space (Dict[str, Sequence | Callable]): Parameter grid, or random search space when `n_iter` is set.
+        feed_data (pandas.DataFrame): Feed to backtest on.
+        min_bars (int): Number of feed records of the first rung, including the indicators' warm-up.
+        eta (int): Reduction factor between rungs.
+        n_iter (int): Number of random combinations; the whole grid is run when None.
+        seed (int): Random seed of the random search.
+        metric (str): Backtest metric ranking the candidates, higher being better.
+        max_workers (int): Number of worker processes, all cores by default.
+        tracker (TrackingBase): Optional tracker, logged from the parent process.
+        bid_col (str): Column name for bid prices.
+        ask_close (str): Column name for ask prices.
+        pip (float): Pip size.
+        vectorized (bool): Use `vectorized_backtest`, for agents implementing `act_vectorized`.
+        max_drawdown (float): Prune a run once its reward drops this much below its peak, see `backtest`.
+        min_reward (float): Prune a run once its reward drops below this threshold, see `backtest`.
+        fast_mode (bool): Step the backtests' envs over NumPy arrays, see `TradingEnv`.
+
+    Returns:
+        pandas.DataFrame: One row per parameter set with the metrics of the last rung it reached, the rung,
+        and the number of bars it consumed over all rungs. Sorted by rung then metric, best first.
+    """
+    assert feed_data is not None and len(feed_data) > 0, 'Feed data must not be empty'
+    assert 0 < min_bars <= len(feed_data), 'min_bars must fit in the feed'
+    assert eta > 1, 'eta must be greater than 1'
+
+    params_list = param_grid(space) if n_iter is None else param_samples(space, n_iter, seed)
+    assert len(params_list) > 0, 'The parameter space is empty'
+
+    settings = {'bid_col': bid_col, 'ask_close': ask_close, 'pip': pip, 'vectorized': vectorized,
+                'max_drawdown': max_drawdown, 'min_reward': min_reward, 'fast_mode': fast_mode}
+    max_workers = min(max_workers or os.cpu_count() or 1, len(params_list))
+
+    logging.info(f'Successive halving, agent {str(agent_class)}, {len(params_list)} candidates '
+                 f'on {max_workers} workers')
+
+    records = [dict(params) for params in params_list]
+    consumed = [0] * len(params_list)
+    survivors = list(range(len(params_list)))
+    bars = min_bars
+    rung = 0
+    with _executor(feed_data, settings, max_workers) as executor:
+        while True:
+            full = bars >= len(feed_data)
+            jobs = [(agent_class, params_list[i], None if full else bars) for i in survivors]
+            chunksize = max(1, len(jobs) // (max_workers * 4))
+            for i, job_metrics in zip(survivors, executor.map(_run_job, jobs, chunksize=chunksize)):
+                consumed[i] += job_metrics['bars']
+                records[i].update(job_metrics, rung=rung)
+
+            logging.info(f'Rung {rung}: {len(survivors)} candidates on {min(bars, len(feed_data))} bars')
+            if full or len(survivors) == 1:
+                break
+
+            survivors.sort(key=lambda i: (not records[i]['pruned'], records[i][metric]), reverse=True)
+            survivors = survivors[:max(1, math.ceil(len(survivors) / eta))]
+            bars *= eta
+            rung += 1
+
+    for record, bars_consumed in zip(records, consumed):
+        record['bars'] = bars_consumed
+    results = pandas.DataFrame(records)
+    results = results.sort_values(['rung', metric], ascending=False, kind='stable').reset_index(drop=True)
+    _log_results(tracker, agent_class, space, results)
+    return results
+
+
+def _log_results(tracker: TrackingBase, agent_class, space: dict, results: pandas.DataFrame):
+    if tracker is None:
+        return
+
+    tracker.log_param('agent', str(agent_class))
+    tracker.log_param('sweep_size', len(results))
+    for step, row in enumerate(results.to_dict('records')):
+        tracker.log_metrics({key: value for key, value in row.items() if _is_number(value)}, step=step)
+
+    best = results.loc[results['total_reward'].idxmax(), list(space.keys())]
+    tracker.log_params({f'best_{key}': value for key, value in best.items()})
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
@@ -0,0 +1,143 @@
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Tuple, Type, Union
+
+import pandas
+
+from mindthespread.agents.base import AgentBase
+from mindthespread.feedstore.engines.base import FeedStoreEngine
+from mindthespread.feedstore.feeds.feed import Feed
+from mindthespread.managers.offline_manager import backtest, vectorized_backtest
+from mindthespread.tracking.base import TrackingBase
+from mindthespread.utils import get_class
+
+
+def _init_worker():
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def _run_symbol(agent_class, params: dict, feed_data: pandas.DataFrame, settings: dict) -> dict:
+    agent = get_class(agent_class)(**params)
+    settings = dict(settings)
+    fast_mode = settings.pop('fast_mode')
+    if settings.pop('vectorized'):
+        return vectorized_backtest(agent, feed_data, **settings)
+    return backtest(agent, feed_data, info_level='summary', render_policy='off', fast_mode=fast_mode, **settings)
+
+
+def _fetch(feedstore_engine: FeedStoreEngine, feed_name: str, symbol: str, start_time, end_time) -> pandas.DataFrame:
+    feed = Feed(feed_name=feed_name, feedstore_engine=feedstore_engine)
+    data = feed.fetch_by_date_range(start_time=start_time, end_time=end_time).data
+    if len(data):
+        data['symbol'] = symbol
+    return data
+
+
+def aggregate_metrics(symbol_metrics: pandas.DataFrame) -> dict:
+    """
+    Summarize per-symbol backtest metrics over a universe.
+
+    Args:
+        symbol_metrics (pandas.DataFrame): Metrics indexed by symbol, as returned by `backtest_universe`.
+
+    Returns:
+        dict: Number of symbols, total/mean/median reward, share of profitable symbols,
+        mean win rate and number of closed transactions.
+    """
+    if symbol_metrics.empty:
+        return {'symbols': 0}
+
+    rewards = symbol_metrics['total_reward']
+    return {
+        'symbols': len(symbol_metrics),
+        'total_reward': round(float(rewards.sum()), 2),
+        'mean_reward': round(float(rewards.mean()), 2),
+        'median_reward': round(float(rewards.median()), 2),
+        'profitable': round(float((rewards > 0).mean()), 2),
+        'win_rate': round(float(symbol_metrics['win_rate'].mean()), 2),
+        'closed_trans': int(symbol_metrics['closed_trans'].sum()),
+    }
+
+
+def backtest_universe(agent_class: Union[Type[AgentBase], str], symbols: List[str],
+                      feedstore_engine: FeedStoreEngine, feed_pattern: str = '{symbol}_1d', params: Dict = None,
+                      start_time=None, end_time=None, max_workers: int = None, prefetch_workers: int = 8,
+                      tracker: TrackingBase = None, bid_col='close', ask_close='close', pip=1,
+                      vectorized: bool = False, fast_mode: bool = True,
+                      on_result: Callable[[str, dict], None] = None) -> Tuple[pandas.DataFrame, dict]:
+    """
+    Backtest one agent configuration on every symbol of a universe.
+
+    Feeds are loaded by a thread pool, and each symbol is handed to a process pool as
+    soon as its feed is loaded, so I/O overlaps with the backtests. Results are
+    collected as they complete. Symbols without data or whose backtest fails are
+    logged and left out of the results.
+
+    Args:
+        agent_class (Type[AgentBase] | str): Agent class, or its dotted path, built once per symbol.
+        symbols (List[str]): Symbols of the universe, e.g. `constants.sp500_symbols`.
+        feedstore_engine (FeedStoreEngine): Engine the feeds are loaded from.
+        feed_pattern (str): Feed name of a symbol, formatted with `symbol`.
+        params (Dict): Parameters of the agent.
+        start_time: Optional start of the backtested time range.
+        end_time: Optional end of the backtested time range.
+        max_workers (int): Number of backtest processes, all cores by default.
+        prefetch_workers (int): Number of threads loading feeds.
+        tracker (TrackingBase): Optional tracker, logged from the parent process.
+        bid_col (str): Column name for bid prices.
+        ask_close (str): Column name for ask prices.
+        pip (float): Pip size.
+        vectorized (bool): Use `vectorized_backtest`, for agents implementing `act_vectorized`.
+        fast_mode (bool): Step the backtests' envs over NumPy arrays, see `TradingEnv`.
+        on_result (Callable): Optional `on_result(symbol, metrics)` called as each symbol completes.
+
+    Returns:
+        Tuple: (symbol_metrics, aggregate), a DataFrame of metrics indexed by symbol, in the order of
+        `symbols`, and the aggregate stats of `aggregate_metrics`.
+    """
+    assert len(symbols) > 0, 'The universe must not be empty'
+    params = params or {}
+    settings = {'bid_col': bid_col, 'ask_close': ask_close, 'pip': pip, 'vectorized': vectorized,
+                'fast_mode': fast_mode}
+    max_workers = max_workers or os.cpu_count() or 1
+
+    logging.info(f'Universe backtest, agent {str(agent_class)}, {len(symbols)} symbols on {max_workers} workers')
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=prefetch_workers) as loader, \
+            ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+        pending = {loader.submit(_fetch, feedstore_engine, feed_pattern.format(symbol=symbol), symbol,
+                                 start_time, end_time): symbol for symbol in symbols}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                symbol = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logging.warning(f'universe backtest failed for {symbol}: {e}')
+                    continue
+
+                if isinstance(result, pandas.DataFrame):
+                    # A feed was loaded, its backtest joins the pending futures
+                    if result.empty:
+                        logging.warning(f'no data found for symbol: {symbol}')
+                        continue
+                    pending[executor.submit(_run_symbol, agent_class, params, result, settings)] = symbol
+                else:
+                    results[symbol] = result
+                    if on_result is not None:
+                        on_result(symbol, result)
+
+    symbol_metrics = pandas.DataFrame.from_dict({s: results[s] for s in symbols if s in results}, orient='index')
+    symbol_metrics.index.name = 'symbol'
+    aggregate = aggregate_metrics(symbol_metrics)
+    logging.info(aggregate)
+
+    if tracker is not None:
+        tracker.log_param('agent', str(agent_class))
+        tracker.log_params(params)
+        tracker.log_metrics(aggregate)
+
+    return symbol_metrics, aggregate
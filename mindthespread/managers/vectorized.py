@@ -0,0 +1,157 @@
+import numpy as np
+
+from mindthespread.entities.market import Direction
+
+HOLD = -1
+
+_LONG = Direction.Long.value
+_SHORT = Direction.Short.value
+
+
+def simulate_targets(targets: np.ndarray, bid: np.ndarray, ask: np.ndarray, qty: float = 1,
+                     stop_loss: float = None, pip: float = 1, max_drawdown: float = None,
+                     min_reward: float = None):
+    """
+    Simulate the trades of a target-position agent over a whole feed with NumPy.
+
+    The simulation follows `TradingEnv.step` bar by bar semantics: a target differing
+    from the open position closes it at the bid (long) or ask (short) and enters the
+    target direction at the ask (long) or bid (short) on the same bar. A stop-loss,
+    checked on every bar before the agent's action, closes the position and skips that
+    bar's entry. The loop runs once per trade, each trade's bars being handled as arrays.
+
+    The run is pruned as `backtest` prunes it: on the first bar but the last whose reward,
+    closed trades plus the open trade marked to market, drops more than `max_drawdown` below
+    its peak or below `min_reward`, the simulation stops and its metrics are those of the bars
+    up to that one.
+
+    Args:
+        targets (np.ndarray): Target Direction value per bar, or HOLD (-1) to keep the current position.
+        bid (np.ndarray): Bid prices.
+        ask (np.ndarray): Ask prices.
+        qty (float): Quantity of every trade.
+        stop_loss (float): Optional stop-loss, in price units.
+        pip (float): Pip size.
+        max_drawdown (float): Prune the run once its reward drops this much below its peak.
+        min_reward (float): Prune the run once its reward drops below this threshold.
+
+    Returns:
+        Tuple: (metrics, trades), the backtest metrics and a dict of per-trade arrays with
+        entry/exit positions, direction, entry/exit prices, PnL and stop flag. The exit of a
+        trade still open at the end of the feed is its last bar. When either threshold is set,
+        the metrics also report the number of `bars` simulated and whether the run was `pruned`.
+    """
+    targets = np.asarray(targets)
+    n_bars = len(targets)
+    assert len(bid) == len(ask) == n_bars, 'targets and prices must be aligned'
+
+    qty = abs(qty)
+    mul = qty / pip
+    threshold = -stop_loss / pip if stop_loss else None
+
+    entries = np.flatnonzero((targets == _LONG) | (targets == _SHORT))
+    exits = {
+        _LONG: np.flatnonzero((targets != HOLD) & (targets != _LONG)),
+        _SHORT: np.flatnonzero((targets != HOLD) & (targets != _SHORT)),
+    }
+
+    trades = {key: [] for key in ('entry', 'exit', 'direction', 'entry_price', 'exit_price', 'pnl', 'stop')}
+    total_reward = 0
+    closed_transactions = wins = 0
+    open_reward = 0
+
+    bar = 0
+    while True:
+        # Next entry: the position is out of the market, so any long/short target enters
+        k = np.searchsorted(entries, bar)
+        if k == len(entries):
+            break
+        entry = int(entries[k])
+        direction = int(targets[entry])
+        long = direction == _LONG
+        entry_price = ask[entry] if long else bid[entry]
+
+        # Next bar whose target contradicts the position
+        k = np.searchsorted(exits[direction], entry + 1)
+        exit_bar = int(exits[direction][k]) if k < len(exits[direction]) else None
+        last_bar = exit_bar if exit_bar is not None else n_bars - 1
+
+        stop = False
+        if last_bar > entry:
+            if threshold is not None:
+                bars = slice(entry + 1, last_bar + 1)
+                rewards = (bid[bars] - entry_price) * mul if long else (entry_price - ask[bars]) * mul
+                hits = np.flatnonzero(rewards < threshold)
+                if len(hits):
+                    stop = True
+                    last_bar = entry + 1 + int(hits[0])
+                reward = float(rewards[last_bar - entry - 1])
+            else:
+                reward = float((bid[last_bar] - entry_price) * mul if long else (entry_price - ask[last_bar]) * mul)
+        else:
+            reward = 0.0
+
+        closed = stop or exit_bar is not None
+        trades['entry'].append(entry)
+        trades['exit'].append(last_bar)
+        trades['direction'].append(direction)
+        trades['entry_price'].append(entry_price)
+        trades['exit_price'].append(bid[last_bar] if long else ask[last_bar])
+        trades['pnl'].append(reward)
+        trades['stop'].append(stop)
+
+        if not closed:
+            open_reward = reward
+            break
+
+        closed_transactions += 1
+        total_reward += reward
+        if reward > 0:
+            wins += 1
+
+        # After a stop the position stays out until the next bar; otherwise a reversal enters on the exit bar
+        bar = last_bar + 1 if stop else last_bar
+
+    metrics = {
+        'total_reward': round(total_reward + open_reward, 2),
+        'win_rate': 0 if not closed_transactions else round(wins / closed_transactions, 2),
+        'closed_trans': closed_transactions,
+    }
+    trades = {key: np.asarray(values) for key, values in trades.items()}
+
+    if max_drawdown is None and min_reward is None:
+        return metrics, trades
+
+    equity = _equity(trades, bid, ask, mul, n_bars)[:-1]
+    peak = np.maximum.accumulate(np.maximum(equity, 0))
+    hits = np.zeros(len(equity), dtype=bool)
+    if max_drawdown is not None:
+        hits |= peak - equity > max_drawdown
+    if min_reward is not None:
+        hits |= equity < min_reward
+    if not hits.any():
+        metrics.update(bars=n_bars, pruned=False)
+        return metrics, trades
+
+    # The simulation is causal, the pruned run is the simulation of the bars up to the pruning one
+    bars = int(np.argmax(hits)) + 1
+    metrics, trades = simulate_targets(targets[:bars], bid[:bars], ask[:bars], qty=qty, stop_loss=stop_loss, pip=pip)
+    metrics.update(bars=bars, pruned=True)
+    return metrics, trades
+
+
+def _equity(trades: dict, bid: np.ndarray, ask: np.ndarray, mul: float, n_bars: int) -> np.ndarray:
+    """
+    Reward after every bar: PnL of the trades exited so far plus the open trade marked to market.
+    """
+    realized = np.zeros(n_bars)
+    np.add.at(realized, trades['exit'].astype(np.intp), trades['pnl'])
+    equity = np.cumsum(realized)
+    for entry, exit_bar, direction, entry_price in zip(trades['entry'], trades['exit'], trades['direction'],
+                                                       trades['entry_price']):
+        bars = slice(entry + 1, exit_bar)
+        if direction == _LONG:
+            equity[bars] += (bid[bars] - entry_price) * mul
+        else:
+            equity[bars] += (entry_price - ask[bars]) * mul
+    return equity
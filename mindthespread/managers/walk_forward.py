@@ -0,0 +1,155 @@
+import copy
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Tuple
+
+import pandas
+
+from mindthespread.agents.base import AgentBase
+from mindthespread.managers.offline_manager import backtest, vectorized_backtest
+from mindthespread.tracking.base import TrackingBase
+
+# Per-worker state, set once by _init_worker so the feed and signals are not shipped with every fold
+_worker_state = None
+
+
+def walk_forward_folds(n_rows: int, train_window: int, test_window: int, step: int = None,
+                       warmup: int = 0) -> List[Tuple[slice, slice]]:
+    """
+    Split a feed into rolling train/test folds.
+
+    Args:
+        n_rows (int): Number of records of the feed.
+        train_window (int): Number of records of each train window.
+        test_window (int): Number of records of each test window, following its train window.
+        step (int): Offset between two folds, `test_window` by default so that test windows do not overlap.
+        warmup (int): Number of leading records only used to warm the indicators up.
+
+    Returns:
+        List[Tuple[slice, slice]]: Positional (train, test) slices of every fold.
+    """
+    assert train_window > 0 and test_window > 0, "train_window and test_window must be positive"
+    step = step or test_window
+    assert step > 0, "step must be positive"
+
+    folds = []
+    start = warmup
+    while start + train_window + test_window <= n_rows:
+        train_end = start + train_window
+        folds.append((slice(start, train_end), slice(train_end, train_end + test_window)))
+        start += step
+    return folds
+
+
+def _init_worker(state: dict):
+    global _worker_state
+    _worker_state = state
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def _run_fold(fold: Tuple[int, slice, slice]) -> dict:
+    return _backtest_fold(_worker_state, fold)
+
+
+def _backtest_fold(state: dict, fold: Tuple[int, slice, slice]) -> dict:
+    i, train, test = fold
+    feed_data, signals = state['feed_data'], state['signals']
+
+    # Every fold works on its own copy of the agent, which keeps folds independent
+    agent = copy.deepcopy(state['agent'])
+    fit_metrics = {}
+    if state['fit'] is not None:
+        fit_metrics = state['fit'](agent, feed_data.iloc[train], signals.iloc[train]) or {}
+
+    settings = dict(state['settings'])
+    fast_mode = settings.pop('fast_mode')
+    if settings.pop('vectorized'):
+        metrics = vectorized_backtest(agent, feed_data.iloc[test], signals=signals.iloc[test], **settings)
+    else:
+        metrics = backtest(agent, feed_data.iloc[test], signals=signals.iloc[test], info_level='summary',
+                           render_policy='off', fast_mode=fast_mode, **settings)
+
+    index = signals.index
+    return {
+        'fold': i,
+        'train_start': index[train.start],
+        'train_end': index[train.stop - 1],
+        'test_start': index[test.start],
+        'test_end': index[test.stop - 1],
+        **{f'train_{key}': value for key, value in fit_metrics.items()},
+        **metrics,
+    }
+
+
+def walk_forward(agent: AgentBase, feed_data: pandas.DataFrame, train_window: int, test_window: int,
+                 step: int = None, fit: Callable = None, warmup: int = None, max_workers: int = None,
+                 tracker: TrackingBase = None, bid_col='close', ask_close='close', pip=1,
+                 vectorized: bool = False, fast_mode: bool = True) -> pandas.DataFrame:
+    """
+    Walk-forward backtest: fit on each train window, then backtest on the window that follows it.
+
+    Signals are computed once over the whole feed and each fold steps over positional
+    slices of the feed and signals, so overlapping history is neither reloaded nor
+    recomputed. Folds are independent, each one working on its own copy of the agent,
+    and run in a process pool receiving the feed and signals once per worker.
+
+    Args:
+        agent (AgentBase): Agent to validate.
+        feed_data (pandas.DataFrame): Feed covering every fold, preceded by the warm-up records.
+        train_window (int): Number of records of each train window.
+        test_window (int): Number of records of each test window.
+        step (int): Offset between two folds, `test_window` by default.
+        fit (Callable): Optional `fit(agent, train_feed, train_signals)` training or tuning the fold's agent in
+            place, and returning an optional dict of train metrics. Must be picklable when `max_workers` > 1.
+        warmup (int): Number of leading records only used to warm the indicators up, the agent's
+            `min_records_needed` by default.
+        max_workers (int): Number of worker processes, all cores by default; folds run in-process when 1.
+        tracker (TrackingBase): Optional tracker, logged from the parent process.
+        bid_col (str): Column name for bid prices.
+        ask_close (str): Column name for ask prices.
+        pip (float): Pip size.
+        vectorized (bool): Use `vectorized_backtest`, for agents implementing `act_vectorized`.
+        fast_mode (bool): Step the backtests' envs over NumPy arrays, see `TradingEnv`.
+
+    Returns:
+        pandas.DataFrame: One row per fold, with the fold's bounds, train metrics and test metrics.
+    """
+    assert feed_data is not None and len(feed_data) > 0, 'Feed data must not be empty'
+
+    signals = agent.calc_signals(feed_data)
+    feed_data = feed_data.loc[signals.index]
+
+    warmup = agent.min_records_needed if warmup is None else warmup
+    folds = walk_forward_folds(len(signals), train_window, test_window, step, warmup)
+    assert len(folds) > 0, 'The feed is too short for a single fold after the warm-up'
+
+    state = {
+        'agent': agent,
+        'feed_data': feed_data,
+        'signals': signals,
+        'fit': fit,
+        'settings': {'bid_col': bid_col, 'ask_close': ask_close, 'pip': pip, 'vectorized': vectorized,
+                     'fast_mode': fast_mode},
+    }
+    jobs = [(i, train, test) for i, (train, test) in enumerate(folds)]
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    logging.info(f'Walk-forward, agent {str(agent.__class__)}, {len(jobs)} folds on {max_workers} workers')
+
+    if max_workers == 1:
+        results = [_backtest_fold(state, job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(state,)) as executor:
+            results = list(executor.map(_run_fold, jobs))
+
+    results = pandas.DataFrame(results)
+
+    if tracker is not None:
+        tracker.log_param('agent', str(agent.__class__))
+        tracker.log_params({'train_window': train_window, 'test_window': test_window, 'folds': len(jobs)})
+        for row in results.to_dict('records'):
+            tracker.log_metrics({key: value for key, value in row.items()
+                                 if isinstance(value, (int, float)) and key != 'fold'}, step=row['fold'])
+
+    return results
@@ -0,0 +1,174 @@
+"""
+Monte Carlo robustness checks of a finished run.
+
+Resampled runs are built from the run's log returns and trade ledger only, never by
+backtesting again: every generator returns a 2-D array with one resampled run per
+row, evaluated at once by the vectorized functions of `mindthespread.analytics`.
+"""
+import numpy as np
+import pandas as pd
+
+from mindthespread import analytics
+
+
+def block_bootstrap(log_returns: np.ndarray, n_samples: int = 1000, block_size: int = 20,
+                    seed: int = None) -> np.ndarray:
+    """
+    Resample a return series by circular blocks, which keeps the short-term autocorrelation of returns.
+
+    Args:
+        log_returns (np.ndarray): Log returns of the run, one per step.
+        n_samples (int): Number of resampled series.
+        block_size (int): Number of consecutive steps per block.
+        seed (int): Optional random seed for reproducibility.
+
+    Returns:
+        np.ndarray: Resampled log returns, one series of the original length per row.
+    """
+    log_returns = np.asarray(log_returns, dtype=np.float64)
+    n_steps = len(log_returns)
+    assert n_steps > 0, 'log_returns must not be empty'
+    block_size = min(block_size, n_steps)
+
+    rng = np.random.default_rng(seed)
+    n_blocks = -(-n_steps // block_size)
+    starts = rng.integers(0, n_steps, (n_samples, n_blocks, 1))
+    positions = (starts + np.arange(block_size)).reshape(n_samples, -1)[:, :n_steps] % n_steps
+    return log_returns[positions]
+
+
+def shuffle_trades(pnl: np.ndarray, n_samples: int = 1000, seed: int = None) -> np.ndarray:
+    """
+    Shuffle the order of the trades, which changes the path of the equity but not its end value.
+
+    Args:
+        pnl (np.ndarray): PnL of each closed trade.
+        n_samples (int): Number of shuffled sequences.
+        seed (int): Optional random seed for reproducibility.
+
+    Returns:
+        np.ndarray: Shuffled PnL sequences, one per row.
+    """
+    pnl = np.asarray(pnl, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    return rng.permuted(np.broadcast_to(pnl, (n_samples, len(pnl))), axis=1)
+
+
+def slip_trades(trades: np.ndarray, max_slippage: float, pip: float = 1, n_samples: int = 1000,
+                seed: int = None) -> np.ndarray:
+    """
+    Apply a random adverse entry slippage to every trade.
+
+    Args:
+        trades (np.ndarray | pd.DataFrame): Trade ledger with `pnl` and `qty` columns.
+        max_slippage (float): Maximum slippage, in price units, drawn uniformly per trade.
+        pip (float): Pip size, converting prices to reward units.
+        n_samples (int): Number of slipped sequences.
+        seed (int): Optional random seed for reproducibility.
+
+    Returns:
+        np.ndarray: Slipped PnL sequences, one per row.
+    """
+    pnl = np.asarray(trades['pnl'], dtype=np.float64)
+    qty = np.asarray(trades['qty'], dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    return pnl - rng.uniform(0, max_slippage, (n_samples, len(pnl))) * qty / pip
+
+
+def pnl_drawdown(pnl: np.ndarray, axis: int = -1):
+    """
+    Largest peak to trough loss of cumulated PnL, in reward units.
+
+    Args:
+        pnl (np.ndarray): PnL sequences.
+        axis (int): Axis along which the trades are laid out.
+
+    Returns:
+        float | np.ndarray: Maximum drawdown, 0 or positive.
+    """
+    equity = np.cumsum(np.asarray(pnl, dtype=np.float64), axis=axis)
+    # Equity starts at 0, which is a peak too
+    peaks = np.maximum(np.maximum.accumulate(equity, axis=axis), 0.0)
+    return np.max(peaks - equity, axis=axis, initial=0.0)[()]
+
+
+def confidence_intervals(observed: dict, samples: dict, confidence: float = 0.9) -> pd.DataFrame:
+    """
+    Summarize resampled metrics with a central confidence interval.
+
+    Args:
+        observed (dict): Metric values of the actual run.
+        samples (dict): Resampled values of the same metrics, one array each.
+        confidence (float): Probability mass of the interval.
+
+    Returns:
+        pd.DataFrame: Observed value, mean, interval bounds and the share of resampled values below
+        the observed one, indexed by metric.
+    """
+    assert 0 < confidence < 1, 'confidence must be in (0, 1)'
+    tail = (1 - confidence) / 2
+    records = {}
+    for name, values in samples.items():
+        values = np.asarray(values, dtype=np.float64)
+        low, high = np.quantile(values, [tail, 1 - tail])
+        records[name] = {
+            'observed': observed[name],
+            'mean': float(values.mean()),
+            'low': float(low),
+            'high': float(high),
+            'percentile': float((values < observed[name]).mean()),
+        }
+    return pd.DataFrame.from_dict(records, orient='index')
+
+
+def robustness_report(log_returns: np.ndarray, trades: np.ndarray = None, n_samples: int = 1000,
+                      block_size: int = 20, max_slippage: float = 0, pip: float = 1,
+                      periods_per_year: int = 252, confidence: float = 0.9, seed: int = None) -> pd.DataFrame:
+    """
+    Confidence intervals of the key metrics of a finished run.
+
+    Return metrics (Sharpe, Sortino, max drawdown, final equity) are resampled by block
+    bootstrap of the log returns. With a trade ledger, the PnL drawdown is resampled by
+    shuffling the trade order and, when `max_slippage` is set, the total PnL by slipping
+    every entry.
+
+    Args:
+        log_returns (np.ndarray): Log returns of the run, e.g. `env.log_returns.values()`.
+        trades (np.ndarray | pd.DataFrame): Optional trade ledger, e.g. `env.trades.values()`.
+        n_samples (int): Number of resampled runs.
+        block_size (int): Number of consecutive steps per bootstrap block.
+        max_slippage (float): Maximum entry slippage, in price units.
+        pip (float): Pip size.
+        periods_per_year (int): Number of steps per year.
+        confidence (float): Probability mass of the intervals.
+        seed (int): Optional random seed for reproducibility.
+
+    Returns:
+        pd.DataFrame: One row per metric, see `confidence_intervals`.
+    """
+    rng = np.random.default_rng(seed)
+    log_returns = np.asarray(log_returns, dtype=np.float64)
+    resampled = block_bootstrap(log_returns, n_samples, block_size, seed=rng)
+
+    observed = {
+        'sharpe': float(analytics.sharpe_ratio(log_returns, periods_per_year)),
+        'sortino': float(analytics.sortino_ratio(log_returns, periods_per_year)),
+        'max_drawdown': float(analytics.max_drawdown(log_returns)),
+        'final_equity': float(np.exp(log_returns.sum())),
+    }
+    samples = {
+        'sharpe': analytics.sharpe_ratio(resampled, periods_per_year),
+        'sortino': analytics.sortino_ratio(resampled, periods_per_year),
+        'max_drawdown': analytics.max_drawdown(resampled),
+        'final_equity': np.exp(resampled.sum(axis=-1)),
+    }
+
+    if trades is not None and len(trades):
+        pnl = np.asarray(trades['pnl'], dtype=np.float64)
+        observed['pnl_drawdown'] = float(pnl_drawdown(pnl))
+        samples['pnl_drawdown'] = pnl_drawdown(shuffle_trades(pnl, n_samples, seed=rng))
+        if max_slippage:
+            observed['slipped_pnl'] = float(pnl.sum())
+            samples['slipped_pnl'] = slip_trades(trades, max_slippage, pip, n_samples, seed=rng).sum(axis=-1)
+
+    return confidence_intervals(observed, samples, confidence)
@@ -1,8 +1,16 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+
 import pandas
 from abc import ABC
 import numpy
 import pandas_ta
-from typing import List
+from typing import Dict, List, Optional, Union
+
+from mindthespread.ta_plan import IndicatorPlan
+from mindthespread.utils import fingerprint_frame
 
 
 class TABase(ABC):
@@ -18,7 +26,7 @@ class TABase(ABC):
 class ColIndicator(TABase):
     def __init__(self, col):
         self.col = col
-        super()
+        super().__init__('col', col=col)
 
     def value(self, feed: pandas.DataFrame):
         return feed[self.col]
@@ -29,7 +37,7 @@ class LagIndicator(TABase):
         assert lag > 0, 'lag must be positive'
         self.lag = lag
         self.close_col = close_col
-        super()
+        super().__init__('lag', lag=lag, close_col=close_col)
 
     def value(self, feed_df: pandas.DataFrame):
         ret = numpy.log(feed_df[self.close_col].shift(self.lag) / feed_df[self.close_col])
@@ -74,21 +82,231 @@ def candle_patterns():
     # return [TA("cdl_pattern", name="all")]
 
 
-def apply_indicators(ohlc_df: pandas.DataFrame, indicators: List[TA]):
-    ret = pandas.DataFrame(index=ohlc_df.index)
-    for ind in indicators:
+class IndicatorCache:
+    """
+    In-memory LRU cache of indicator values, bounded by their size in bytes.
+
+    Values are keyed by a fingerprint of the feed and the indicator class and `name()`, so
+    the same indicator applied to the same feed by several agents, sweep jobs or reruns is
+    computed once. A feed whose content changed gets a new fingerprint and is never served
+    stale values.
+    """
+
+    def __init__(self, max_bytes: int = 256 << 20):
+        """
+        Args:
+            max_bytes (int): Maximum total size of the cached values.
+        """
+        assert max_bytes > 0, 'max_bytes must be positive'
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(feed_key: str, indicator: TABase) -> tuple:
+        return feed_key, f'{indicator.__class__.__module__}.{indicator.__class__.__qualname__}', indicator.name()
+
+    def get(self, key: tuple) -> Optional[Union[pandas.Series, pandas.DataFrame]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: tuple, value: Union[pandas.Series, pandas.DataFrame]) -> None:
+        # The index is usually shared with the feed, only the values are accounted for
+        nbytes = int(numpy.sum(value.memory_usage(index=False, deep=True)))
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Process-wide cache, for callers computing the indicators of a same feed many times, e.g. sweep workers
+indicator_cache = IndicatorCache()
+
+
+def clear_indicator_cache() -> None:
+    """
+    Drop every cached indicator value.
+    """
+    indicator_cache.clear()
+
+
+def compute_indicator(ohlc_df: pandas.DataFrame, ind: TABase, cache: IndicatorCache = None,
+                      feed_key: str = None):
+    """
+    Compute an indicator over a feed, through the cache when one is given.
+
+    Args:
+        ohlc_df (pandas.DataFrame): The feed.
+        ind (TABase): The indicator.
+        cache (IndicatorCache): Cache of indicator values, None to always compute.
+        feed_key (str): Fingerprint of the feed, computed when not given.
+
+    Returns:
+        The indicator values, as returned by `ind.value`.
+    """
+    if cache is None:
+        return ind.value(ohlc_df)
+
+    key = cache.key(feed_key or fingerprint_frame(ohlc_df), ind)
+    ind_signals = cache.get(key)
+    if ind_signals is None:
         ind_signals = ind.value(ohlc_df)
-        new_index = [i for i in ind_signals.index if i not in ohlc_df.index]
-        assert len(new_index) == 0, '??'
+        if isinstance(ind_signals, (pandas.Series, pandas.DataFrame)):
+            cache.put(key, ind_signals)
+    return ind_signals
+
+
+def _timed_value(ind: TABase, ohlc_df: pandas.DataFrame) -> tuple:
+    started = time.perf_counter()
+    value = ind.value(ohlc_df)
+    return value, time.perf_counter() - started
 
+
+def compute_indicators(ohlc_df: pandas.DataFrame, indicators: List[TABase], cache: IndicatorCache = None,
+                       plan: bool = False, max_workers: int = None, timings: Dict[str, float] = None) -> list:
+    """
+    Compute several indicators over a feed.
+
+    With `plan`, indicators missing from the cache and supported by `IndicatorPlan` are evaluated
+    together as one DAG sharing their building blocks. The others are evaluated through `value`,
+    concurrently in a thread pool when `max_workers` is above 1. The rolling windows and moving
+    averages of pandas and NumPy release the GIL for most of their work, and the feed is shared
+    rather than copied.
+
+    Args:
+        ohlc_df (pandas.DataFrame): The feed.
+        indicators (List[TABase]): The indicators.
+        cache (IndicatorCache): Cache of indicator values, None to always compute.
+        plan (bool): Evaluate supported pandas_ta indicators with an `IndicatorPlan`. Off by default,
+            sharing building blocks saves little over pandas_ta, whose indicators are dominated by
+            their own rolling windows.
+        max_workers (int): Number of threads evaluating the indicators not in the plan.
+        timings (Dict[str, float]): Optional dict filled with the wall time in seconds of every
+            indicator by its `name()`, 0 for cached ones.
+
+    Returns:
+        list: The values of every indicator, as returned by `value`.
+    """
+    feed_key = fingerprint_frame(ohlc_df) if cache is not None else None
+    values = [None] * len(indicators)
+    seconds = [0.0] * len(indicators)
+    pending = []
+    for i, ind in enumerate(indicators):
+        if cache is not None:
+            values[i] = cache.get(cache.key(feed_key, ind))
+        if values[i] is None:
+            pending.append(i)
+
+    if plan:
+        planned = [i for i in pending if type(indicators[i]).value is TA.value]
+        indicator_plan = IndicatorPlan()
+        for i in planned:
+            indicator_plan.add(indicators[i].indicator_name, indicators[i].kwargs, ohlc_df)
+        if len(indicator_plan):
+            plan_seconds = [0.0] * len(planned)
+            for i, value, elapsed in zip(planned, indicator_plan.evaluate(ohlc_df, plan_seconds), plan_seconds):
+                values[i], seconds[i] = value, elapsed
+
+    remaining = [i for i in pending if values[i] is None]
+    if max_workers is not None and max_workers > 1 and len(remaining) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(lambda i: _timed_value(indicators[i], ohlc_df), remaining))
+    else:
+        results = [_timed_value(indicators[i], ohlc_df) for i in remaining]
+    for i, (value, elapsed) in zip(remaining, results):
+        values[i], seconds[i] = value, elapsed
+
+    for i in pending:
+        if cache is not None and isinstance(values[i], (pandas.Series, pandas.DataFrame)):
+            cache.put(cache.key(feed_key, indicators[i]), values[i])
+
+    if timings is not None:
+        for ind, elapsed in zip(indicators, seconds):
+            timings[ind.name()] = timings.get(ind.name(), 0.0) + elapsed
+    return values
+
+
+def apply_indicators(ohlc_df: pandas.DataFrame, indicators: List[TA], cache: IndicatorCache = None,
+                     plan: bool = False, max_workers: int = None, timings: Dict[str, float] = None):
+    """
+    Compute indicators over a feed, one column (or more for DataFrame-valued indicators) each.
+
+    The outputs are written into one preallocated 2-D block aligned on the feed index, a column
+    of a later indicator replacing the values of an earlier one of the same name. Numeric outputs share one
+    block of their common dtype, outputs of other dtypes are concatenated column-wise instead.
+
+    Args:
+        ohlc_df (pandas.DataFrame): The feed.
+        indicators (List[TA]): The indicators.
+        cache (IndicatorCache): Cache of indicator values, e.g. the process-wide `indicator_cache`.
+            None by default to always compute, which does not fingerprint the feed.
+        plan (bool): Evaluate supported pandas_ta indicators as one DAG sharing their building blocks,
+            off by default, see `compute_indicators`.
+        max_workers (int): Number of threads evaluating the other indicators concurrently.
+        timings (Dict[str, float]): Optional dict filled with the wall time of every indicator.
+
+    Returns:
+        pandas.DataFrame: The indicator values, indexed like the feed.
+    """
+    columns = {}
+    for ind_signals in compute_indicators(ohlc_df, indicators, cache, plan, max_workers, timings):
         if isinstance(ind_signals, pandas.Series):
-            ret[ind_signals.name] = ind_signals
-        elif isinstance(ind_signals, pandas.DataFrame):
-            # signals = signals.merge(ind_signals, left_index=True, right_index=True)
-            ret = ret.merge(ind_signals, left_index=True, right_index=True, how='outer')
-            pass
-        else:
+            ind_signals = ind_signals.to_frame()
+        elif not isinstance(ind_signals, pandas.DataFrame):
             # todo: handle other types here
-            pass
+            continue
+
+        aligned = ind_signals.index.equals(ohlc_df.index)
+        if aligned:
+            positions = None
+        else:
+            positions = ohlc_df.index.get_indexer(ind_signals.index)
+            assert (positions >= 0).all(), 'Indicator index is not a subset of the feed index'
+            aligned = len(positions) == len(ohlc_df)
+
+        for name, col in ind_signals.items():
+            columns[name] = (col.to_numpy(), positions, aligned)
+
+    dtypes = [values.dtype for values, _, _ in columns.values()]
+    if not all(numpy.issubdtype(dtype, numpy.number) or dtype == bool for dtype in dtypes):
+        return pandas.concat([pandas.Series(values, index=ohlc_df.index if positions is None
+                                            else ohlc_df.index[positions], name=name)
+                              for name, (values, positions, _) in columns.items()],
+                             axis=1).reindex(ohlc_df.index)
+
+    dtype = numpy.result_type(*dtypes) if dtypes else numpy.float64
+    if not all(aligned for _, _, aligned in columns.values()):
+        dtype = numpy.result_type(dtype, numpy.float64)
+    block = numpy.empty((len(ohlc_df), len(columns)), dtype=dtype)
+    for j, (values, positions, aligned) in enumerate(columns.values()):
+        if positions is None:
+            block[:, j] = values
+        else:
+            if not aligned:
+                block[:, j] = numpy.nan
+            block[positions, j] = values
 
-    return ret
+    return pandas.DataFrame(block, index=ohlc_df.index, columns=list(columns))
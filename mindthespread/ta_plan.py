@@ -0,0 +1,289 @@
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import pandas
+import pandas_ta
+
+Output = Union[pandas.Series, pandas.DataFrame]
+
+
+def _trimmed_sma(x: pandas.Series, length: int) -> Optional[pandas.Series]:
+    first_valid = x.first_valid_index()
+    if first_valid is None:
+        return None
+    ret = pandas_ta.sma(x.loc[first_valid:], length=length)
+    return None if ret is None else ret.reindex(x.index)
+
+
+# Primitive operations of a plan, applied to the values of their input nodes.
+# Moving averages are the pandas_ta ones, so that planned indicators match `TA.value`.
+_OPS: Dict[str, Callable] = {
+    'sma': lambda x, length: pandas_ta.sma(x, length=length),
+    'ema': lambda x, length: pandas_ta.ema(x, length=length),
+    'rma': lambda x, length: pandas_ta.rma(x, length=length),
+    'mad': lambda x, length: pandas_ta.mad(x, length=length),
+    'trimmed_sma': _trimmed_sma,
+    'hlc3': lambda high, low, close: pandas_ta.hlc3(high, low, close),
+    'median': lambda high, low: 0.5 * (high + low),
+    'diff': lambda x, periods: x.diff(periods),
+    'shift': lambda x, periods: x.shift(periods),
+    'gains': lambda x: x.clip(lower=0),
+    'losses': lambda x: x.clip(upper=0),
+    'rolling_min': lambda x, length: x.rolling(length).min(),
+    'rolling_max': lambda x, length: x.rolling(length).max(),
+    'range': lambda high, low: pandas_ta.utils.non_zero_range(high, low),
+    'sub': lambda a, b: a - b,
+    # Final combinations, written as in pandas_ta to give the same floating point results
+    'rsi': lambda gains, losses, scalar: scalar * gains / (gains + losses.abs()),
+    'roc': lambda mom, prev, scalar: scalar * mom / prev,
+    'willr': lambda close, low, high: 100 * ((close - low) / (high - low) - 1),
+    'cci': lambda tp, mean, mad, c: (tp - mean) / (c * mad),
+    'stoch': lambda x, low, rng: 100 * (x - low) / rng,
+}
+
+
+def _length(value, default: int) -> int:
+    return int(value) if value and value > 0 else default
+
+
+def uses_talib(kwargs: dict) -> bool:
+    """
+    Whether pandas_ta computes an indicator with TA-Lib, whose values differ from the pandas ones,
+    e.g. in the seeding of its RMA. The pinned pandas_ta fork uses TA-Lib whenever it is installed,
+    unless the indicator is given `talib=False`.
+
+    Args:
+        kwargs (dict): Indicator arguments.
+
+    Returns:
+        bool: True when TA-Lib is requested, or installed and not explicitly disabled.
+    """
+    talib = kwargs.get('talib')
+    return bool(talib) or (talib is None and bool(pandas_ta.Imports['talib']))
+
+
+class IndicatorPlan:
+    """
+    DAG of primitive operations computing a set of indicators in one pass over a feed.
+
+    Supported indicators are decomposed into primitive nodes such as price differences,
+    gains and losses, rolling extremes and moving averages. A node is keyed by its operation,
+    inputs and parameters, so a building block shared by several indicators, e.g. the RSI
+    averages of RSI and StochRSI or the 14 bar high/low range of Williams %R and Stochastic,
+    is evaluated once. Indicators or parameters that are not supported are left to pandas_ta.
+    """
+
+    def __init__(self):
+        # Insertion ordered, inputs are always added first. The value is the position of the
+        # indicator that added the node, which its evaluation time is accounted to
+        self._nodes: Dict[tuple, int] = {}
+        self.outputs: List[Optional[List[Tuple[str, tuple]]]] = []
+
+    def node(self, op: str, *inputs: tuple, **params) -> tuple:
+        """
+        Add a node, or return the identical node already in the plan.
+
+        Returns:
+            tuple: Key of the node.
+        """
+        key = (op, inputs, tuple(sorted(params.items())))
+        self._nodes.setdefault(key, len(self.outputs))
+        return key
+
+    def col(self, name: str) -> tuple:
+        return self.node('col', name=name)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def add(self, indicator_name: str, kwargs: dict, feed: pandas.DataFrame) -> bool:
+        """
+        Decompose an indicator into the plan.
+
+        Args:
+            indicator_name (str): pandas_ta name of the indicator.
+            kwargs (dict): Indicator arguments.
+            feed (pandas.DataFrame): The feed the plan is evaluated over.
+
+        Returns:
+            bool: Whether the indicator is supported, which excludes indicators computed with TA-Lib.
+            Its output is None in `evaluate` otherwise.
+        """
+        decompose = _DECOMPOSERS.get(indicator_name)
+        outputs = None
+        if decompose is not None and not uses_talib(kwargs):
+            kwargs = {key: value for key, value in kwargs.items() if key != 'talib'}
+            if set(kwargs) <= decompose.args:
+                outputs = decompose(self, len(feed), set(feed.columns), **kwargs)
+        self.outputs.append(outputs)
+        return outputs is not None
+
+    def evaluate(self, feed: pandas.DataFrame, timings: List[float] = None) -> List[Optional[Output]]:
+        """
+        Evaluate every node once over the feed.
+
+        Args:
+            feed (pandas.DataFrame): The feed.
+            timings (List[float]): Optional list, one item per added indicator, incremented by the wall
+                time of the nodes the indicator added. Shared nodes count for the first indicator only.
+
+        Returns:
+            List: Per added indicator, its Series or DataFrame named as pandas_ta names it, or None when
+            it is not supported.
+        """
+        values = {}
+        for key, owner in self._nodes.items():
+            op, inputs, params = key
+            started = time.perf_counter()
+            if op == 'col':
+                values[key] = feed[dict(params)['name']]
+            else:
+                args = [values[i] for i in inputs]
+                values[key] = None if any(a is None for a in args) else _OPS[op](*args, **dict(params))
+            if timings is not None:
+                timings[owner] += time.perf_counter() - started
+
+        results = []
+        for outputs in self.outputs:
+            if outputs is None or any(values[key] is None for _, key in outputs):
+                results.append(None)
+            elif len(outputs) == 1:
+                name, key = outputs[0]
+                results.append(values[key].rename(name))
+            else:
+                results.append(pandas.DataFrame({name: values[key] for name, key in outputs}))
+        return results
+
+
+# Decomposition of every supported indicator, keyed by its pandas_ta name
+_DECOMPOSERS: Dict[str, Callable] = {}
+
+
+def _decomposer(*args: str):
+    def register(func):
+        func.args = set(args)
+        _DECOMPOSERS[func.__name__.lstrip('_')] = func
+        return func
+    return register
+
+
+def _rsi_node(plan: IndicatorPlan, length: int, scalar: float, drift: int) -> tuple:
+    change = plan.node('diff', plan.col('close'), periods=drift)
+    gains = plan.node('rma', plan.node('gains', change), length=length)
+    losses = plan.node('rma', plan.node('losses', change), length=length)
+    return plan.node('rsi', gains, losses, scalar=scalar)
+
+
+@_decomposer('length')
+def _sma(plan: IndicatorPlan, n_rows: int, columns: set, length=None):
+    length = _length(length, 10)
+    if 'close' not in columns or n_rows < length:
+        return None
+    return [(f'SMA_{length}', plan.node('sma', plan.col('close'), length=length))]
+
+
+@_decomposer('length')
+def _ema(plan: IndicatorPlan, n_rows: int, columns: set, length=None):
+    length = _length(length, 10)
+    if 'close' not in columns or n_rows < length:
+        return None
+    return [(f'EMA_{length}', plan.node('ema', plan.col('close'), length=length))]
+
+
+@_decomposer('length')
+def _mom(plan: IndicatorPlan, n_rows: int, columns: set, length=None):
+    length = _length(length, 10)
+    if 'close' not in columns or n_rows < length:
+        return None
+    return [(f'MOM_{length}', plan.node('diff', plan.col('close'), periods=length))]
+
+
+@_decomposer('length', 'scalar')
+def _roc(plan: IndicatorPlan, n_rows: int, columns: set, length=None, scalar=None):
+    length = _length(length, 10)
+    scalar = float(scalar) if scalar and scalar > 0 else 100
+    if 'close' not in columns or n_rows < length:
+        return None
+    close = plan.col('close')
+    roc = plan.node('roc', plan.node('diff', close, periods=length), plan.node('shift', close, periods=length),
+                    scalar=scalar)
+    return [(f'ROC_{length}', roc)]
+
+
+@_decomposer('length', 'scalar', 'drift')
+def _rsi(plan: IndicatorPlan, n_rows: int, columns: set, length=None, scalar=None, drift=None):
+    length = _length(length, 14)
+    scalar = float(scalar) if scalar else 100
+    if 'close' not in columns or n_rows < length:
+        return None
+    return [(f'RSI_{length}', _rsi_node(plan, length, scalar, int(drift) if drift else 1))]
+
+
+@_decomposer('length')
+def _willr(plan: IndicatorPlan, n_rows: int, columns: set, length=None):
+    length = _length(length, 14)
+    if not {'high', 'low', 'close'} <= columns or n_rows < length:
+        return None
+    lowest = plan.node('rolling_min', plan.col('low'), length=length)
+    highest = plan.node('rolling_max', plan.col('high'), length=length)
+    return [(f'WILLR_{length}', plan.node('willr', plan.col('close'), lowest, highest))]
+
+
+@_decomposer('fast', 'slow')
+def _ao(plan: IndicatorPlan, n_rows: int, columns: set, fast=None, slow=None):
+    fast, slow = _length(fast, 5), _length(slow, 34)
+    if slow < fast:
+        fast, slow = slow, fast
+    if not {'high', 'low'} <= columns or n_rows < slow:
+        return None
+    median = plan.node('median', plan.col('high'), plan.col('low'))
+    ao = plan.node('sub', plan.node('sma', median, length=fast), plan.node('sma', median, length=slow))
+    return [(f'AO_{fast}_{slow}', ao)]
+
+
+@_decomposer('length', 'c')
+def _cci(plan: IndicatorPlan, n_rows: int, columns: set, length=None, c=None):
+    length = _length(length, 14)
+    c = float(c) if c and c > 0 else 0.015
+    if not {'high', 'low', 'close'} <= columns or n_rows < length:
+        return None
+    tp = plan.node('hlc3', plan.col('high'), plan.col('low'), plan.col('close'))
+    cci = plan.node('cci', tp, plan.node('sma', tp, length=length), plan.node('mad', tp, length=length), c=c)
+    return [(f'CCI_{length}_{c}', cci)]
+
+
+@_decomposer('k', 'd', 'smooth_k')
+def _stoch(plan: IndicatorPlan, n_rows: int, columns: set, k=None, d=None, smooth_k=None):
+    k, d, smooth_k = _length(k, 14), _length(d, 3), _length(smooth_k, 3)
+    if not {'high', 'low', 'close'} <= columns or n_rows < max(k, d, smooth_k):
+        return None
+    lowest = plan.node('rolling_min', plan.col('low'), length=k)
+    highest = plan.node('rolling_max', plan.col('high'), length=k)
+    stoch = plan.node('stoch', plan.col('close'), lowest, plan.node('range', highest, lowest))
+    stoch_k = plan.node('trimmed_sma', stoch, length=smooth_k)
+    stoch_d = plan.node('trimmed_sma', stoch_k, length=d)
+    props = f'_{k}_{d}_{smooth_k}'
+    return [(f'STOCHk{props}', stoch_k), (f'STOCHd{props}', stoch_d)]
+
+
+@_decomposer('length', 'rsi_length', 'k', 'd')
+def _stochrsi(plan: IndicatorPlan, n_rows: int, columns: set, length=None, rsi_length=None, k=None, d=None):
+    length, rsi_length, k, d = _length(length, 14), _length(rsi_length, 14), _length(k, 3), _length(d, 3)
+    if 'close' not in columns or n_rows < max(length, rsi_length, k, d):
+        return None
+    rsi = _rsi_node(plan, rsi_length, 100, 1)
+    lowest = plan.node('rolling_min', rsi, length=length)
+    highest = plan.node('rolling_max', rsi, length=length)
+    stoch = plan.node('stoch', rsi, lowest, plan.node('range', highest, lowest))
+    stoch_k = plan.node('sma', stoch, length=k)
+    stoch_d = plan.node('sma', stoch_k, length=d)
+    props = f'_{length}_{rsi_length}_{k}_{d}'
+    return [(f'STOCHRSIk{props}', stoch_k), (f'STOCHRSId{props}', stoch_d)]
+
+
+def supported_indicators() -> List[str]:
+    """
+    Returns:
+        List[str]: pandas_ta names of the indicators an `IndicatorPlan` decomposes.
+    """
+    return sorted(_DECOMPOSERS)
@@ -0,0 +1,141 @@
+from typing import List, Optional
+
+import numpy
+import pandas
+
+from mindthespread.ta import TA, TABase
+from mindthespread.ta_plan import uses_talib
+
+
+class _StreamingSMA:
+    """
+    Simple moving average updated from a running sum over a ring of the last `length` values.
+
+    As pandas' rolling mean, it is NaN while a missing value is inside the window, so the
+    missing values in the ring are counted rather than added to the sum.
+    """
+
+    def __init__(self, length: int):
+        self.length = length
+        self._ring = numpy.zeros(length)
+        self._count = 0
+        self._nans = 0
+        self._sum = 0.0
+
+    def update(self, values: numpy.ndarray) -> numpy.ndarray:
+        out = numpy.full(len(values), numpy.nan)
+        for i, value in enumerate(values):
+            slot = self._count % self.length
+            if numpy.isnan(self._ring[slot]):
+                self._nans -= 1
+            else:
+                self._sum -= self._ring[slot]
+            if numpy.isnan(value):
+                self._nans += 1
+            else:
+                self._sum += value
+            self._ring[slot] = value
+            self._count += 1
+            if slot == self.length - 1:
+                # Recompute the sum once per ring turn, so rounding errors do not build up
+                self._sum = float(numpy.nansum(self._ring))
+            if self._count >= self.length and not self._nans:
+                out[i] = self._sum / self.length
+        return out
+
+
+class _StreamingEMA:
+    """
+    Exponential moving average seeded with the mean of its first `length` values, as pandas_ta's.
+
+    Missing values follow pandas' `ewm(adjust=False)`: the last average is carried across
+    them and the weight of the history decays meanwhile, as if the values had been seen.
+    """
+
+    def __init__(self, length: int):
+        self.length = length
+        self._alpha = 2 / (length + 1)
+        self._seed = []
+        self._last = None
+        self._weight = 1.0
+
+    def update(self, values: numpy.ndarray) -> numpy.ndarray:
+        out = numpy.full(len(values), numpy.nan)
+        for i, value in enumerate(values):
+            if self._last is None:
+                # The seed starts on the first value that is not missing
+                if self._seed or not numpy.isnan(value):
+                    self._seed.append(value)
+                if len(self._seed) < self.length:
+                    continue
+                self._last = float(numpy.nanmean(self._seed))
+            else:
+                self._weight *= 1 - self._alpha
+                if not numpy.isnan(value):
+                    self._last = (self._weight * self._last + self._alpha * value) / (self._weight + self._alpha)
+                    self._weight = 1.0
+            out[i] = self._last
+        return out
+
+
+_STREAMS = {'sma': _StreamingSMA, 'ema': _StreamingEMA}
+
+
+class SignalStream:
+    """
+    Signals of a list of indicators updated one record at a time.
+
+    Each indicator keeps its state, e.g. the running sum of an SMA or the last value of an
+    EMA, so the work per record is constant instead of growing with a recomputed window.
+    Only the moving averages of the close price computed by pandas are supported, not the
+    TA-Lib ones; `SignalStream.of` returns None for any other indicator, which is then
+    recomputed over the window.
+    """
+
+    def __init__(self, names: List[str], streams: list):
+        self.columns = pandas.Index(names)
+        self._streams = streams
+        self.count = 0
+
+    @classmethod
+    def of(cls, indicators: List[TABase]) -> Optional['SignalStream']:
+        """
+        Build a stream of the indicators, when every one of them can be updated incrementally.
+
+        Args:
+            indicators (List[TABase]): The indicators, as given to `apply_indicators`.
+
+        Returns:
+            SignalStream: A stream with no record yet, or None when an indicator is not supported.
+        """
+        if not indicators:
+            return None
+        names, streams = [], []
+        for ind in indicators:
+            stream = _STREAMS.get(ind.indicator_name)
+            if stream is None or type(ind).value is not TA.value or uses_talib(ind.kwargs) or \
+                    not set(ind.kwargs) <= {'length'}:
+                return None
+            length = ind.kwargs.get('length')
+            length = int(length) if length and length > 0 else 10
+            name = f'{ind.indicator_name.upper()}_{length}'
+            if name in names:
+                continue
+            names.append(name)
+            streams.append(stream(length))
+        return cls(names, streams)
+
+    def update(self, records: pandas.DataFrame) -> pandas.DataFrame:
+        """
+        Feed new records, in order and following the ones already fed.
+
+        Args:
+            records (pandas.DataFrame): The new records, with a 'close' column.
+
+        Returns:
+            pandas.DataFrame: Signals of the records, NaN until an indicator has enough history.
+        """
+        close = records['close'].to_numpy(dtype='float64')
+        self.count += len(records)
+        values = numpy.column_stack([stream.update(close) for stream in self._streams])
+        return pandas.DataFrame(values, index=records.index, columns=self.columns)
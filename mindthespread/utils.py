@@ -1,3 +1,4 @@
+import hashlib
 import importlib
 import pandas
 
@@ -24,3 +25,19 @@ def align_indexes(df1: pandas.DataFrame, df2: pandas.DataFrame):
     return df1_, df2_
 
 
+
+
+def fingerprint_frame(df: pandas.DataFrame) -> str:
+    """
+    Fingerprint the content of a DataFrame, its index and column names included.
+
+    Args:
+        df (pandas.DataFrame): The frame to fingerprint.
+
+    Returns:
+        str: Hex digest, equal for frames holding the same data.
+    """
+    digest = hashlib.sha256()
+    digest.update(repr(list(df.columns)).encode())
+    digest.update(pandas.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
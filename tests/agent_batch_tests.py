@@ -0,0 +1,86 @@
+import copy
+import pickle
+import unittest
+import numpy as np
+import pandas as pd
+from mindthespread.agents import SignalView, obs_to_pandas, obs_to_view
+from mindthespread.agents.base import AgentBase
+from mindthespread.agents.crossover import AgentCrossover
+from mindthespread.entities.agent import AgentResponse
+from mindthespread.entities.market import Action, Direction
+
+
+class ThresholdAgent(AgentBase):
+    """Buys when rsi is low and sells when it is high, reading signals by name."""
+
+    def __init__(self):
+        super().__init__(indicators=None)
+        self.cols = pd.Index(['rsi', 'cmo'])
+
+    @obs_to_view
+    def act(self, curr_idx, obs):
+        return self.decide(obs['signals'])
+
+    @obs_to_pandas
+    def act_pandas(self, curr_idx, obs):
+        return self.decide(obs['signals'])
+
+    @staticmethod
+    def decide(signals):
+        if signals['rsi'] < 30:
+            return AgentResponse(action=Action.BUY)
+        if signals['rsi'] > 70:
+            return AgentResponse(action=Action.SELL)
+        return AgentResponse(action=Action.HOLD)
+
+
+class TestAgentBatch(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(31)
+        self.signals = rng.uniform(0, 100, (50, 2))
+        self.signals[:3] = np.nan
+        self.positions = rng.integers(0, len(Direction), 50)
+
+    def test_signal_view(self):
+        """Test named and positional access of the view."""
+        view = SignalView(np.array([1.0, 2.0]), SignalView.fields(['rsi', 'cmo']))
+        self.assertEqual(view['cmo'], 2.0)
+        self.assertEqual(view[0], 1.0)
+        self.assertEqual(view.rsi, 1.0)
+        self.assertIsNone(view.get('macd'))
+        self.assertListEqual(list(view), [1.0, 2.0])
+        pd.testing.assert_series_equal(view.to_series(), pd.Series([1.0, 2.0], index=['rsi', 'cmo']))
+
+    def test_signal_view_copy(self):
+        """Test that views can be copied and pickled, e.g. when stored with the agent's decisions."""
+        view = SignalView(np.array([1.0, 2.0]), SignalView.fields(['rsi', 'cmo']))
+        for other in (copy.copy(view), copy.deepcopy(view), pickle.loads(pickle.dumps(view))):
+            self.assertEqual(other.cmo, 2.0)
+            self.assertListEqual(other.index, ['rsi', 'cmo'])
+        with self.assertRaises(AttributeError):
+            view._missing
+
+    def test_default_act_batch(self):
+        """Test that the default batch calls act per row, the view deciding like the Series."""
+        agent = ThresholdAgent()
+        obs = {'position': self.positions, 'signals': self.signals}
+        batch = agent.act_batch(list(range(50)), obs)
+        for i, resp in enumerate(batch):
+            row_obs = {'position': self.positions[i], 'signals': self.signals[i]}
+            self.assertEqual(resp.action, agent.act_pandas(i, row_obs).action)
+
+    def test_crossover_act_batch(self):
+        """Test that the vectorized crossover batch matches its act."""
+        agent = AgentCrossover(sma_long=30, sma_short=10, qty=2, stop_loss=0.01)
+        batch = agent.act_batch(0, {'position': self.positions, 'signals': self.signals})
+        self.assertEqual(len(batch), 50)
+        for i, resp in enumerate(batch):
+            expected = agent.act(0, {'position': self.positions[i], 'signals': self.signals[i]})
+            self.assertEqual(resp.action, expected.action)
+            self.assertEqual(resp.qty, expected.qty)
+            self.assertEqual(resp.stop_loss, expected.stop_loss)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import numpy as np
+from mindthespread import analytics
+from mindthespread.env.ledger import TradeLedger
+
+
+class TestAnalytics(unittest.TestCase):
+
+    def test_ratios(self):
+        """Test the Sharpe and Sortino ratios against their definitions."""
+        returns = np.array([0.01, -0.02, 0.03, 0.0, -0.01])
+        self.assertAlmostEqual(analytics.sharpe_ratio(returns, periods_per_year=1),
+                               returns.mean() / returns.std(ddof=1))
+        downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2))
+        self.assertAlmostEqual(analytics.sortino_ratio(returns, periods_per_year=1), returns.mean() / downside)
+        self.assertEqual(analytics.sharpe_ratio(np.zeros(10)), 0)
+
+    def test_drawdown_exposure_turnover(self):
+        """Test drawdown, exposure and turnover on a hand-made run."""
+        returns = np.log([1.1, 0.5, 1.2, 1.0])
+        self.assertAlmostEqual(analytics.max_drawdown(returns), 0.5)
+        self.assertEqual(analytics.max_drawdown(np.log([1.1, 1.2])), 0)
+
+        positions = np.array([0, 1, 1, -1, 0, 0])
+        self.assertAlmostEqual(analytics.exposure(positions), 0.5)
+        self.assertAlmostEqual(analytics.turnover(positions), 4 / 6)
+
+    def test_batched(self):
+        """Test that a 2-D batch of runs matches the runs evaluated one by one."""
+        runs = np.random.default_rng(1).normal(0, 0.01, (4, 50))
+        for func in (analytics.sharpe_ratio, analytics.sortino_ratio, analytics.max_drawdown):
+            np.testing.assert_allclose(func(runs), [func(run) for run in runs])
+
+    def test_trade_stats(self):
+        """Test the statistics of a trade ledger."""
+        ledger = TradeLedger(1)
+        ledger.record(0, 3, 2, 1, 1.0, 1.2, 20, False)
+        ledger.record(3, 4, 0, 1, 1.2, 1.3, -10, True)
+        stats = analytics.trade_stats(ledger.values())
+        self.assertEqual(stats['trades'], 2)
+        self.assertEqual(stats['win_rate'], 0.5)
+        self.assertEqual(stats['profit_factor'], 2)
+        self.assertEqual(stats['avg_holding'], 2)
+        self.assertEqual(stats['stops'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
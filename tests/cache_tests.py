@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from mindthespread.agents.crossover import AgentCrossover
+from mindthespread.agents.rl import RLAgent
+from mindthespread.managers.cache import BacktestCache
+from mindthespread.managers.offline_manager import backtest
+
+
+class TestBacktestCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a random walk feed and an empty cache."""
+        rng = np.random.default_rng(21)
+        prices = 1.1 + rng.normal(0, 0.002, 300).cumsum()
+        self.feed = pd.DataFrame({'close': prices}, index=pd.date_range('2023-01-01', periods=300, freq='h'))
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = BacktestCache(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_hit(self):
+        """Test that an identical backtest returns its stored metrics and trades without stepping."""
+        metrics, trades = backtest(AgentCrossover(sma_long=30, sma_short=10), self.feed, render_policy='off',
+                                   cache=self.cache, return_trades=True)
+        self.assertEqual(len(trades), metrics['closed_trans'])
+
+        with patch('mindthespread.managers.offline_manager.TradingEnv') as env:
+            cached_metrics, cached_trades = backtest(AgentCrossover(sma_long=30, sma_short=10), self.feed.copy(),
+                                                     render_policy='off', cache=self.cache, return_trades=True)
+            env.assert_not_called()
+        self.assertDictEqual(cached_metrics, metrics)
+        pd.testing.assert_frame_equal(cached_trades, trades)
+
+    def test_key(self):
+        """Test that parameters, settings and feed content change the key."""
+        agent = AgentCrossover(sma_long=30, sma_short=10)
+        key = self.cache.key(agent, self.feed, {'pip': 1})
+        self.assertEqual(key, self.cache.key(AgentCrossover(sma_long=30, sma_short=10), self.feed.copy(), {'pip': 1}))
+        self.assertNotEqual(key, self.cache.key(AgentCrossover(sma_long=30, sma_short=10, stop_loss=0.01),
+                                                self.feed, {'pip': 1}))
+        self.assertNotEqual(key, self.cache.key(AgentCrossover(sma_long=40, sma_short=10), self.feed, {'pip': 1}))
+        self.assertNotEqual(key, self.cache.key(agent, self.feed, {'pip': 0.0001}))
+        self.assertNotEqual(key, self.cache.key(agent, self.feed.iloc[1:], {'pip': 1}))
+
+    def test_rl_model_key(self):
+        """Test that retraining an RL agent's model file changes the key."""
+        path = os.path.join(self.tmp_dir.name, 'model.pkl')
+        agent = RLAgent(rl_model_path=path)
+        missing = self.cache.key(agent, self.feed, {'pip': 1})
+        with open(path, 'wb') as f:
+            f.write(b'weights')
+        key = self.cache.key(agent, self.feed, {'pip': 1})
+        self.assertNotEqual(key, missing)
+
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        self.assertNotEqual(key, self.cache.key(agent, self.feed, {'pip': 1}))
+
+    def test_eviction_and_bypass(self):
+        """Test LRU eviction once the size bound is exceeded, and bypassing stored entries."""
+        payload = {'metrics': {}, 'trades': np.zeros(1000)}
+        cache = BacktestCache(self.tmp_dir.name, max_bytes=20000)
+        for key in ('a', 'b'):
+            cache.put(key, payload)
+        cache.get('a')
+        cache.put('c', payload)
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+
+        cache.bypass = True
+        self.assertIsNone(cache.get('a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
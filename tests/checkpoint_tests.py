@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from mindthespread.agents.crossover import AgentCrossover
+from mindthespread.env.trading_env import TradingEnv
+from mindthespread.managers.checkpoint import Checkpointer
+from mindthespread.managers.offline_manager import backtest
+from mindthespread.managers.sweep import sweep
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a random walk feed and a checkpoint directory."""
+        rng = np.random.default_rng(23)
+        prices = 1.1 + rng.normal(0, 0.002, 400).cumsum()
+        self.feed = pd.DataFrame({'close': prices}, index=pd.date_range('2023-01-01', periods=400, freq='h'))
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_backtest_resume(self):
+        """Test that a killed backtest resumes from its last checkpoint with the same results."""
+        expected, expected_trades = backtest(AgentCrossover(sma_long=30, sma_short=10, stop_loss=0.003), self.feed,
+                                             render_policy='off', return_trades=True)
+
+        checkpointer = Checkpointer(self.tmp_dir.name, every_steps=50)
+        act = AgentCrossover.act
+        calls = []
+
+        def killed_act(agent, curr_idx, obs):
+            calls.append(curr_idx)
+            if len(calls) == 275:
+                raise KeyboardInterrupt
+            return act(agent, curr_idx, obs)
+
+        with patch.object(AgentCrossover, 'act', killed_act):
+            with self.assertRaises(KeyboardInterrupt):
+                backtest(AgentCrossover(sma_long=30, sma_short=10, stop_loss=0.003), self.feed, render_policy='off',
+                         checkpointer=checkpointer)
+        self.assertEqual(len(os.listdir(self.tmp_dir.name)), 1)
+
+        calls.clear()
+        with patch.object(AgentCrossover, 'act', killed_act):
+            metrics, trades = backtest(AgentCrossover(sma_long=30, sma_short=10, stop_loss=0.003), self.feed,
+                                       render_policy='off', checkpointer=checkpointer, return_trades=True)
+        self.assertEqual(len(calls), len(self.feed) - 250)
+        self.assertDictEqual(metrics, expected)
+        pd.testing.assert_frame_equal(trades, expected_trades)
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
+
+    def test_env_state(self):
+        """Test that an env state holds the stored results only and resumes identically, ring buffers included."""
+        actions = np.random.default_rng(2).integers(0, 4, len(self.feed))
+        for buffer_size in (None, 16):
+            envs = []
+            for _ in range(2):
+                env = TradingEnv(bid_col='close', ask_col='close', fast_mode=True, buffer_size=buffer_size,
+                                 render_policy='off')
+                env.calc_signals = lambda feed: feed[['close']]
+                env.set_ohlc_feed(self.feed)
+                env.reset()
+                envs.append(env)
+
+            for action in actions[:100]:
+                envs[0].step(int(action))
+            state = envs[0].get_state()
+            self.assertEqual(len(state['log_returns']['values']), 100 if buffer_size is None else buffer_size)
+            envs[1].set_state(state)
+
+            for action in actions[100:]:
+                for env in envs:
+                    env.step(int(action))
+            log_returns, positions, transactions = envs[1].get_results()
+            expected = envs[0].get_results()
+            pd.testing.assert_series_equal(log_returns, expected[0])
+            pd.testing.assert_series_equal(positions, expected[1])
+            pd.testing.assert_frame_equal(transactions, expected[2])
+            pd.testing.assert_frame_equal(envs[1].get_trades(), envs[0].get_trades())
+
+    def test_sweep_resume(self):
+        """Test that a resumed sweep only runs the jobs missing from its checkpoint."""
+        space = {'sma_long': [30, 50], 'sma_short': [5, 10]}
+        checkpointer = Checkpointer(self.tmp_dir.name, every_steps=1)
+        with patch.object(Checkpointer, 'clear'):
+            expected = sweep(AgentCrossover, space, self.feed, max_workers=2, checkpointer=checkpointer)
+
+        with patch('mindthespread.managers.sweep._run_job', side_effect=RuntimeError):
+            results = sweep(AgentCrossover, space, self.feed, max_workers=2, checkpointer=checkpointer)
+        pd.testing.assert_frame_equal(results, expected)
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,13 @@
+import logging
 import unittest
+import numpy as np
 import pandas as pd
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from mindthespread.entities.agent import AgentResponse
 from mindthespread.entities.market import Action, Direction
+from mindthespread.env.sampler import EpisodeSampler
 from mindthespread.env.trading_env import TradingEnv
+from mindthespread.ta import TA, apply_indicators
 
 
 class TestTradingEnv(unittest.TestCase):
@@ -104,6 +108,247 @@ class TestTradingEnv(unittest.TestCase):
         self.assertEqual(self.env.step_count, 0)
         self.assertIsNotNone(self.env.obs)
 
+    def test_get_results(self):
+        """Test that log returns, positions and fills are recorded per step."""
+        self.env.step(AgentResponse(action=Action.BUY, qty=2))
+        self.env.step(AgentResponse(action=Action.HOLD))
+        self.env.step(AgentResponse(action=Action.CLOSE))
+
+        log_returns, positions, transactions = self.env.get_results()
+        self.assertEqual(len(log_returns), 3)
+        self.assertListEqual(positions.tolist(), [2.0, 2.0, 0.0])
+        self.assertListEqual(transactions['amount'].tolist(), [2.0, -2.0])
+        self.assertListEqual(transactions['price'].tolist(), [1.1005, 1.1020])
+        self.assertEqual(transactions.index[1], self.feed_data.index[2])
+
+    def test_ring_buffer_results(self):
+        """Test that ring buffers keep only the latest entries."""
+        env = TradingEnv(bid_col='bidclose', ask_col='askclose', buffer_size=2)
+        env.calc_signals = MagicMock(return_value=self.feed_data)
+        env.set_ohlc_feed(self.feed_data)
+        for _ in range(4):
+            env.step(AgentResponse(action=Action.BUY))
+
+        log_returns, positions, transactions = env.get_results()
+        self.assertListEqual(list(positions.index), list(self.feed_data.index[2:4]))
+        self.assertEqual(len(log_returns), 2)
+        self.assertEqual(len(transactions), 1)
+
+    def test_info_levels(self):
+        """Test that lower info levels skip or defer the per-step info."""
+        full_env = self.env
+        summary_env = TradingEnv(bid_col='bidclose', ask_col='askclose', info_level='summary')
+        none_env = TradingEnv(bid_col='bidclose', ask_col='askclose', info_level='none')
+        for env in (summary_env, none_env):
+            env.calc_signals = MagicMock(return_value=self.feed_data)
+            env.set_ohlc_feed(self.feed_data)
+
+        for action in (Action.BUY, Action.HOLD, Action.CLOSE, Action.SELL):
+            full_info = full_env.step(AgentResponse(action=action))[-1]
+            summary_info = summary_env.step(AgentResponse(action=action))[-1]
+            none_info = none_env.step(AgentResponse(action=action))[-1]
+
+            for key in ('total_reward', 'win_rate', 'closed_trans', 'step_reward', 'action', 'stop'):
+                self.assertEqual(summary_info[key], full_info[key])
+            self.assertEqual(none_info, {})
+            self.assertEqual(none_env.summary(), full_env.summary())
+
+    def test_render_policies(self):
+        """Test that render policies control which steps are logged."""
+        actions = [Action.BUY, Action.HOLD, Action.HOLD, Action.CLOSE, Action.HOLD]
+        expected_records = {'all': 5, 'off': 0, 'every': 3, 'trades': 2, 'summary': 1}
+        for policy, expected in expected_records.items():
+            env = TradingEnv(bid_col='bidclose', ask_col='askclose', render_policy=policy, render_every=2)
+            env.calc_signals = MagicMock(return_value=self.feed_data)
+            env.set_ohlc_feed(self.feed_data)
+            with self.assertLogs(level='INFO') as logs:
+                logging.info('start')
+                for action in actions:
+                    env.step(AgentResponse(action=action))
+                    env.render()
+            self.assertEqual(len(logs.records) - 1, expected, policy)
+
+    def test_render_keeps_info_lazy(self):
+        """Test that rendering every step builds the summary info only of the records actually emitted."""
+        env = TradingEnv(bid_col='bidclose', ask_col='askclose', info_level='summary', render_policy='all')
+        env.calc_signals = MagicMock(return_value=self.feed_data)
+        env.set_ohlc_feed(self.feed_data)
+        logging.disable(logging.INFO)
+        try:
+            with patch.object(TradingEnv, 'build_summary_info', wraps=TradingEnv.build_summary_info) as build:
+                for action in (Action.HOLD, Action.HOLD, Action.BUY):
+                    env.step(AgentResponse(action=action))
+                    env.render()
+                    self.assertTrue(env.info)
+                    self.assertEqual(build.call_count, int(action == Action.BUY))
+        finally:
+            logging.disable(logging.NOTSET)
+
+    def test_obs_dtype_and_views(self):
+        """Test float32 observations and zero-copy signal views in fast mode."""
+        env = TradingEnv(bid_col='bidclose', ask_col='askclose', fast_mode=True, obs_dtype=np.float32)
+        env.calc_signals = MagicMock(return_value=self.feed_data)
+        env.set_ohlc_feed(self.feed_data)
+        obs, info = env.reset()
+
+        self.assertEqual(env.observation_space['signals'].dtype, np.float32)
+        self.assertEqual(obs['signals'].dtype, np.float32)
+        self.assertTrue(np.shares_memory(obs['signals'], env._signal_values))
+        self.assertFalse(obs['signals'].flags.writeable)
+
+    def test_copy_obs(self):
+        """Test that copied observations are not overwritten by later steps."""
+        env = TradingEnv(bid_col='bidclose', ask_col='askclose', fast_mode=True, copy_obs=True)
+        env.calc_signals = MagicMock(return_value=self.feed_data)
+        env.set_ohlc_feed(self.feed_data)
+        first_obs, info = env.reset()
+        second_obs = env.step(AgentResponse(action=Action.BUY))[0]
+
+        self.assertIsNot(first_obs, second_obs)
+        self.assertEqual(first_obs['position'], Direction.Out.value)
+        self.assertEqual(second_obs['position'], Direction.Long.value)
+        self.assertFalse(np.shares_memory(second_obs['signals'], env._signal_values))
+        np.testing.assert_array_equal(first_obs['signals'], self.feed_data.iloc[0].values)
+
+    def _windowed_env(self, sampler=None, batch_window=1):
+        signals = pd.DataFrame({'sma': np.arange(100, dtype=float)},
+                               index=pd.date_range('2023-01-01', periods=100, freq='h'))
+        signals.iloc[:20] = np.nan
+        feed_data = pd.DataFrame({'bidclose': 1.1, 'askclose': 1.1005}, index=signals.index)
+        env = TradingEnv(episode_window=10, batch_window=batch_window, sampler=sampler)
+        env.calc_signals = MagicMock(return_value=signals)
+        env.set_ohlc_feed(feed_data)
+        return env
+
+    def test_seeded_episode_starts(self):
+        """Test that reset(seed=...) makes episode starts reproducible and skips warm-up rows."""
+        starts = [[], []]
+        for env_starts in starts:
+            env = self._windowed_env()
+            env.reset(seed=42)
+            for _ in range(20):
+                env_starts.append(env._cursor)
+                env.reset()
+
+        self.assertEqual(starts[0], starts[1])
+        self.assertTrue(all(20 <= start <= 90 for start in starts[0]))
+
+    def test_intermittent_missing_signals(self):
+        """Test that signals missing after the warm-up, as the long and short sides of a PSAR, do not exclude starts."""
+        rng = np.random.default_rng(3)
+        prices = 1.1 + rng.normal(0, 0.001, 300).cumsum()
+        feed_data = pd.DataFrame({'high': prices + 0.0005, 'low': prices - 0.0005, 'close': prices,
+                                  'bidclose': prices, 'askclose': prices + 0.0002},
+                                 index=pd.date_range('2023-01-01', periods=300, freq='h'))
+        env = TradingEnv(episode_window=50)
+        env.calc_signals = lambda feed: apply_indicators(feed, [TA('psar'), TA('sma', length=20)])
+        env.set_ohlc_feed(feed_data)
+        self.assertTrue(env.signals.isna().any(axis=1).all())
+        np.testing.assert_array_equal(env.sampler.starts, np.arange(19, 251))
+
+        env.episode_window = 290
+        with self.assertRaises(ValueError):
+            env.set_ohlc_feed(feed_data)
+
+    def test_sampler_modes(self):
+        """Test stratified, sequential and batched episode starts."""
+        rng = np.random.default_rng(0)
+        nan_rows = np.zeros(100, dtype=bool)
+        nan_rows[:20] = True
+
+        stratified = EpisodeSampler(mode='stratified')
+        stratified.fit(nan_rows, 10)
+        starts = stratified.sample(rng, 4)
+        self.assertListEqual([int((start - 20) // (71 / 4)) for start in starts], [0, 1, 2, 3])
+
+        sequential = EpisodeSampler(mode='sequential', batch_size=3)
+        sequential.fit(nan_rows, 10)
+        self.assertListEqual([sequential.next_start(rng) for _ in range(9)], [20, 30, 40, 50, 60, 70, 80, 90, 20])
+
+        env = self._windowed_env(batch_window=4)
+        env.reset(seed=1)
+        self.assertEqual(len(env.sampler._queue), 3)
+
+    def test_snapshot_restore(self):
+        """Test branching from a snapshot and restoring the original state."""
+        for fast_mode in (False, True):
+            env = TradingEnv(bid_col='bidclose', ask_col='askclose', fast_mode=fast_mode)
+            env.calc_signals = MagicMock(return_value=self.feed_data)
+            env.set_ohlc_feed(self.feed_data)
+            env.step(AgentResponse(action=Action.BUY))
+            snapshot = env.snapshot()
+
+            branch = [env.step(AgentResponse(action=action))[1:4] for action in (Action.HOLD, Action.CLOSE)]
+            branch_results = env.get_results()
+            self.assertIsNone(env.position)
+            self.assertEqual(env.closed_transactions, 1)
+
+            obs = env.restore(snapshot)
+            self.assertEqual(obs['position'], Direction.Long.value)
+            self.assertEqual(env.closed_transactions, 0)
+            self.assertEqual(len(env.get_results()[2]), 1)
+            self.assertEqual(len(env.get_trades()), 0)
+
+            replay = [env.step(AgentResponse(action=action))[1:4] for action in (Action.HOLD, Action.CLOSE)]
+            self.assertEqual(branch, replay)
+            for branch_result, replay_result in zip(branch_results, env.get_results()):
+                pd.testing.assert_index_equal(branch_result.index, replay_result.index)
+
+    def test_trade_ledger(self):
+        """Test that the trade ledger records every closed round trip."""
+        rng = np.random.default_rng(17)
+        prices = 1.1 + rng.normal(0, 0.001, 300).cumsum()
+        feed_data = pd.DataFrame({'bidclose': prices, 'askclose': prices + 0.0002},
+                                 index=pd.date_range('2023-01-01', periods=300, freq='h'))
+        env = TradingEnv(bid_col='bidclose', ask_col='askclose', fast_mode=True, info_level='none',
+                         render_policy='off')
+        env.calc_signals = MagicMock(return_value=feed_data)
+        env.set_ohlc_feed(feed_data)
+        for action in rng.integers(0, len(Action), 300):
+            env.step(AgentResponse(action=int(action), qty=2, stop_loss=0.001))
+
+        trades = env.get_trades()
+        self.assertEqual(len(trades), env.closed_transactions)
+        self.assertAlmostEqual(trades['pnl'].sum(), env.total_reward)
+        self.assertEqual(int((trades['pnl'] > 0).sum()), env.wins)
+        self.assertTrue(trades['stop'].any())
+        self.assertTrue((trades['exit'] > trades['entry']).all())
+        self.assertTrue((trades['qty'] == 2).all())
+
+        performance = env.performance(periods_per_year=24 * 252)
+        self.assertEqual(performance['trades'], env.closed_transactions)
+        self.assertGreater(performance['exposure'], 0)
+        self.assertGreaterEqual(performance['max_drawdown'], 0)
+
+    def test_fast_mode_matches_pandas_mode(self):
+        """Test that the array-backed fast mode reproduces the pandas execution path."""
+        rng = np.random.default_rng(7)
+        prices = 1.1 + rng.normal(0, 0.001, 300).cumsum()
+        feed_data = pd.DataFrame({'bidclose': prices, 'askclose': prices + 0.0002},
+                                 index=pd.date_range('2023-01-01', periods=300, freq='h'))
+        actions = rng.integers(0, len(Action), 300)
+
+        results, env_results = [], []
+        for fast_mode in (False, True):
+            env = TradingEnv(bid_col='bidclose', ask_col='askclose', fast_mode=fast_mode)
+            env.calc_signals = MagicMock(return_value=feed_data)
+            env.set_ohlc_feed(feed_data)
+            obs, info = env.reset()
+            steps = []
+            for action in actions:
+                resp = AgentResponse(action=int(action), qty=1, stop_loss=0.002)
+                obs, reward, done, truncated, info = env.step(resp)
+                steps.append((env.curr_idx, obs['position'], tuple(obs['signals']), reward, info))
+                if done:
+                    break
+            results.append(steps)
+            env_results.append(env.get_results())
+
+        self.assertEqual(results[0], results[1])
+        for pandas_result, fast_result in zip(*env_results):
+            pd.testing.assert_index_equal(pandas_result.index, fast_result.index)
+            np.testing.assert_array_equal(pandas_result.values, fast_result.values)
+
 
 
 
@@ -0,0 +1,92 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from mindthespread.agents.crossover import AgentCrossover
+from mindthespread.entities.market import Direction
+from mindthespread.feedstore.engines.pandas import PandasFeedEngine
+from mindthespread.feedstore.feeds.feed import Feed
+from mindthespread.managers.live import LiveRunner
+from mindthespread.ta import indicator_cache
+
+
+class TestLiveRunner(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a feed whose candles are streamed to a crossover agent."""
+        rng = np.random.default_rng(5)
+        index = pd.date_range('2020-01-01', periods=120, freq='D', tz='UTC', name='date')
+        self.feed_data = pd.DataFrame({'close': 100 + rng.normal(0, 1, 120).cumsum()}, index=index)
+        self.agent = AgentCrossover(sma_long=20, sma_short=5)
+
+    def test_push_matches_full_signals(self):
+        """Test that streamed decisions use the same signals as a computation over the whole feed."""
+        expected = self.agent.calc_signals(self.feed_data)
+        for incremental in (True, False):
+            decisions = []
+            runner = LiveRunner({'AAA': self.agent}, window=30,
+                                on_response=lambda symbol, curr_idx, response: decisions.append(curr_idx))
+            runner.warm_up('AAA', self.feed_data.iloc[:30])
+
+            with patch.object(self.agent, 'signal_stream', wraps=self.agent.signal_stream,
+                              **({} if incremental else {'return_value': None})):
+                for i in range(30, 120):
+                    runner.push('AAA', self.feed_data.iloc[i:i + 1])
+                    self.assertEqual(len(runner.windows['AAA']), 30)
+                    np.testing.assert_array_almost_equal(runner.signals['AAA'].to_numpy(), expected.iloc[i].to_numpy())
+
+            self.assertEqual(runner.streams['AAA'] is not None, incremental)
+            self.assertListEqual(decisions, self.feed_data.index[30:].tolist())
+            self.assertIsNone(runner.push('AAA', self.feed_data.iloc[-5:]))
+
+    def test_push_burst(self):
+        """Test that a burst of candles longer than the window is fully fed to the incremental signals."""
+        runner = LiveRunner({'AAA': self.agent}, window=30)
+        runner.warm_up('AAA', self.feed_data.iloc[:30])
+        runner.push('AAA', self.feed_data.iloc[30:31])
+        runner.push('AAA', self.feed_data.iloc[31:100])
+        self.assertEqual(len(runner.windows['AAA']), 30)
+        np.testing.assert_array_almost_equal(runner.signals['AAA'].to_numpy(),
+                                             self.agent.calc_signals(self.feed_data).iloc[99].to_numpy())
+
+    def test_bypasses_indicator_cache(self):
+        """Test that the signals of every new window are not stored in the process-wide indicator cache."""
+        runner = LiveRunner({'AAA': self.agent}, window=30)
+        runner.warm_up('AAA', self.feed_data.iloc[:30])
+        with patch.object(indicator_cache, 'get') as get, patch.object(indicator_cache, 'put') as put:
+            for i in range(30, 40):
+                runner.push('AAA', self.feed_data.iloc[i:i + 1])
+        get.assert_not_called()
+        put.assert_not_called()
+
+    def test_position_follows_responses(self):
+        """Test that the observed position follows the agent's decisions."""
+        runner = LiveRunner({'AAA': self.agent}, window=30)
+        runner.warm_up('AAA', self.feed_data.iloc[:30])
+        runner.push('AAA', self.feed_data.iloc[30:31])
+        position = runner.positions['AAA']
+        self.assertIn(position, (Direction.Long, Direction.Short))
+        with patch.object(self.agent, 'act', wraps=self.agent.act) as act:
+            runner.push('AAA', self.feed_data.iloc[31:32])
+            self.assertEqual(act.call_args.args[1]['position'], position.value)
+
+    def test_poll(self):
+        """Test that polling fetches only the candles newer than the window."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            engine = PandasFeedEngine(base_path=tmp_dir)
+            engine.save_feed('AAA_1d', self.feed_data.iloc[:100])
+            runner = LiveRunner({'AAA': self.agent}, feeds={'AAA': Feed('AAA_1d', engine)}, window=30)
+
+            self.assertIn('AAA', runner.poll())
+            self.assertEqual(runner.windows['AAA'].index[-1], self.feed_data.index[99])
+            self.assertDictEqual(runner.poll(), {})
+
+            engine.save_feed('AAA_1d', self.feed_data.iloc[:102])
+            self.assertIn('AAA', runner.poll())
+            self.assertEqual(runner.windows['AAA'].index[-1], self.feed_data.index[101])
+            self.assertEqual(len(runner.windows['AAA']), 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
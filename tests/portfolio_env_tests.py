@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock
+from mindthespread.entities.agent import AgentResponse
+from mindthespread.entities.market import Action, Direction
+from mindthespread.env.portfolio_env import PortfolioTradingEnv
+from mindthespread.env.trading_env import TradingEnv
+
+
+class TestPortfolioTradingEnv(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a basket of three feeds with partially overlapping indexes."""
+        rng = np.random.default_rng(3)
+        self.feeds = {}
+        for i, symbol in enumerate(['EURUSD', 'GBPUSD', 'USDJPY']):
+            prices = 1.1 + rng.normal(0, 0.001, 120).cumsum()
+            index = pd.date_range('2023-01-01', periods=120, freq='h') + pd.Timedelta(hours=i)
+            self.feeds[symbol] = pd.DataFrame({'bidclose': prices, 'askclose': prices + 0.0002}, index=index)
+
+        self.env = PortfolioTradingEnv(bid_col='bidclose', ask_col='askclose')
+        self.env.calc_signals = lambda feed: feed[['bidclose', 'askclose']]
+        self.env.set_ohlc_feed(self.feeds)
+
+    def test_alignment(self):
+        """Test that feeds are aligned on their shared index."""
+        self.assertEqual(len(self.env.index), 118)
+        self.assertEqual(self.env.obs['signals'].shape, (3, 2))
+        self.assertEqual(self.env.action_space.shape, (3,))
+
+    def test_action_vector(self):
+        """Test that one step applies a different action to every symbol."""
+        actions = np.array([Action.BUY.value, Action.SELL.value, Action.HOLD.value])
+        obs, reward, done, truncated, info = self.env.step(actions)
+        self.assertListEqual(obs['position'].tolist(),
+                             [Direction.Long.value, Direction.Short.value, Direction.Out.value])
+        self.assertEqual(len(self.env.get_results()[2]), 2)
+
+    def test_matches_single_symbol_envs(self):
+        """Test that each symbol of the basket behaves like its own TradingEnv."""
+        rng = np.random.default_rng(5)
+        actions = rng.integers(0, len(Action), (len(self.env.index), 3))
+
+        done = False
+        for row in actions:
+            responses = [AgentResponse(action=int(a), qty=1, stop_loss=0.001) for a in row]
+            done = self.env.step(responses)[2]
+        self.assertTrue(done)
+
+        symbol_summary = self.env.symbol_summary()
+        for i, symbol in enumerate(self.env.symbols):
+            env = TradingEnv(bid_col='bidclose', ask_col='askclose', fast_mode=True)
+            env.calc_signals = MagicMock(return_value=self.feeds[symbol].loc[self.env.index])
+            env.set_ohlc_feed(self.feeds[symbol])
+            for row in actions:
+                env.step(AgentResponse(action=int(row[i]), qty=1, stop_loss=0.001))
+
+            for key, value in env.summary().items():
+                self.assertEqual(symbol_summary.loc[symbol, key], value)
+            log_returns, positions, transactions = env.get_results()
+            np.testing.assert_array_equal(self.env.get_results()[0][symbol].values, log_returns.values)
+            np.testing.assert_array_equal(self.env.get_results()[1][symbol].values, positions.values)
+
+
+if __name__ == '__main__':
+    unittest.main()
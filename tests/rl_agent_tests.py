@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import joblib
+import numpy as np
+import pandas as pd
+from gymnasium import spaces
+from mindthespread.agents import rl
+from mindthespread.agents.rl import DummyStableBaseline3Model, RLAgent, clear_model_cache, load_cached_model
+from mindthespread.entities.market import Action
+from mindthespread.env.sb3_env import SB3VecEnv
+from mindthespread.env.subproc_env import SubprocVectorTradingEnv
+from mindthespread.managers.offline_manager import rl_train
+from mindthespread.ta import LagIndicator
+
+
+class StubEnv:
+    action_space = spaces.Discrete(len(Action))
+
+
+class RecordingModel(DummyStableBaseline3Model):
+    """Predicts BUY for negative signals and SELL otherwise, recording the batch sizes."""
+    calls = []
+
+    def predict(self, obs):
+        RecordingModel.calls.append(len(obs['signals']))
+        return np.where(np.asarray(obs['signals'])[:, 0] < 0, Action.BUY.value, Action.SELL.value), None
+
+
+class CollectingModel(DummyStableBaseline3Model):
+    """Collects experience like an SB3 on-policy algorithm, recording what the env returned."""
+    last = None
+
+    def learn(self, total_timesteps):
+        env = CollectingModel.last = self.env
+        self.record = {'num_envs': env.num_envs, 'action_space': env.action_space, 'shapes': set(), 'terminal': 0}
+        obs = env.reset()
+        for _ in range(total_timesteps // env.num_envs):
+            env.step_async(np.array([env.action_space.sample() for _ in range(env.num_envs)]))
+            obs, rewards, dones, infos = env.step_wait()
+            self.record['shapes'].add((obs['signals'].shape, rewards.shape, dones.shape, len(infos)))
+            self.record['terminal'] += sum('terminal_observation' in infos[i] for i in np.flatnonzero(dones))
+
+    def save(self, path):
+        joblib.dump(self.record, path)
+
+
+class TestRLAgent(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'model.joblib')
+        RecordingModel(env=StubEnv(), policy=None, verbose=0).save(self.path)
+        clear_model_cache()
+
+    def tearDown(self):
+        clear_model_cache()
+        self.tmp_dir.cleanup()
+
+    def test_model_cache(self):
+        """Test that a model is loaded once per path and modification time."""
+        with patch.object(RecordingModel, 'load', wraps=RecordingModel.load) as load:
+            first = load_cached_model(RecordingModel, self.path)
+            self.assertIs(load_cached_model(RecordingModel, self.path), first)
+            self.assertEqual(load.call_count, 1)
+
+            stat = os.stat(self.path)
+            os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+            self.assertIsNot(load_cached_model(RecordingModel, self.path), first)
+            self.assertEqual(load.call_count, 2)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used model is evicted beyond the cache size."""
+        with patch.object(rl, 'MODEL_CACHE_SIZE', 1):
+            load_cached_model(RecordingModel, self.path)
+            load_cached_model(DummyStableBaseline3Model, self.path)
+            self.assertEqual(len(rl._model_cache), 1)
+
+    def test_predict_batch(self):
+        """Test batched inference in chunks."""
+        agent = RLAgent(rl_model_path=self.path, rl_algo=RecordingModel)
+        agent.load_rl_model()
+        RecordingModel.calls = []
+        signals = np.random.default_rng(1).normal(0, 1, (10, 3))
+        responses = agent.act_batch(0, {'position': np.ones(10, dtype=int), 'signals': signals})
+
+        self.assertListEqual([resp.action for resp in responses],
+                             [Action.BUY if s < 0 else Action.SELL for s in signals[:, 0]])
+        agent.predict_batch({'position': np.ones(10, dtype=int), 'signals': signals}, chunk_size=4)
+        self.assertListEqual(RecordingModel.calls, [10, 4, 4, 2])
+
+
+    def test_vectorized_training(self):
+        """Test that vectorized envs are given to the algorithm as an SB3 VecEnv of their sub-environments."""
+        rng = np.random.default_rng(3)
+        prices = 1.1 + rng.normal(0, 0.001, 200).cumsum()
+        feed = pd.DataFrame({'close': prices, 'bidclose': prices, 'askclose': prices + 0.0002},
+                            index=pd.date_range('2023-01-01', periods=200, freq='h'))
+
+        agent = RLAgent(rl_model_path=self.path, rl_algo=CollectingModel, total_timesteps=120,
+                        indicators=[LagIndicator(1), LagIndicator(2)])
+        rl_train(agent, feed, num_envs=3, episode_window=10)
+        record = joblib.load(self.path)
+        self.assertIsInstance(CollectingModel.last, SB3VecEnv)
+        self.assertEqual(record['num_envs'], 3)
+        self.assertEqual(record['action_space'], spaces.Discrete(len(Action)))
+        self.assertSetEqual(record['shapes'], {((3, 2), (3,), (3,), 3)})
+        self.assertGreater(record['terminal'], 0)
+
+        vec_env = SubprocVectorTradingEnv(num_envs=4, num_workers=2, episode_window=10)
+        try:
+            agent.rl_train(feed, vec_env=vec_env)
+        finally:
+            vec_env.close()
+        record = joblib.load(self.path)
+        self.assertSetEqual(record['shapes'], {((4, 2), (4,), (4,), 4)})
+        self.assertGreater(record['terminal'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+from mindthespread import robustness
+from mindthespread.env.ledger import TradeLedger
+
+
+class TestRobustness(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a return series and a trade ledger."""
+        rng = np.random.default_rng(29)
+        self.log_returns = rng.normal(0.0005, 0.01, 500)
+        self.trades = TradeLedger(1)
+        for i, pnl in enumerate(rng.normal(5, 20, 40)):
+            self.trades.record(i * 10, i * 10 + 5, 2, 2, 1.0, 1.0, pnl, False)
+
+    def test_block_bootstrap(self):
+        """Test that blocks are contiguous runs of the original series."""
+        samples = robustness.block_bootstrap(self.log_returns, n_samples=50, block_size=10, seed=1)
+        self.assertEqual(samples.shape, (50, 500))
+        start = np.flatnonzero(self.log_returns == samples[0, 0])[0]
+        np.testing.assert_array_equal(samples[0, :10], np.roll(self.log_returns, -start)[:10])
+        np.testing.assert_array_equal(samples, robustness.block_bootstrap(self.log_returns, 50, 10, seed=1))
+
+    def test_trade_resampling(self):
+        """Test that shuffling keeps the total PnL and slippage only lowers it."""
+        pnl = self.trades.values()['pnl']
+        shuffled = robustness.shuffle_trades(pnl, n_samples=100, seed=1)
+        np.testing.assert_allclose(shuffled.sum(axis=1), pnl.sum())
+        self.assertTrue((np.sort(shuffled, axis=1) == np.sort(pnl)).all())
+
+        slipped = robustness.slip_trades(self.trades.values(), max_slippage=0.001, pip=0.0001, seed=1)
+        self.assertTrue((slipped <= pnl).all())
+        self.assertTrue((slipped >= pnl - 20).all())
+
+        self.assertAlmostEqual(robustness.pnl_drawdown(np.array([5, -3, -4, 10, -1])), 7)
+
+    def test_report(self):
+        """Test the confidence intervals of the report."""
+        report = robustness.robustness_report(self.log_returns, self.trades.values(), n_samples=500,
+                                              max_slippage=0.0005, pip=0.0001, seed=3)
+        self.assertListEqual(report.index.tolist(),
+                             ['sharpe', 'sortino', 'max_drawdown', 'final_equity', 'pnl_drawdown', 'slipped_pnl'])
+        self.assertTrue((report['low'] <= report['high']).all())
+        self.assertTrue(report.loc['sharpe', 'low'] < report.loc['sharpe', 'observed'] < report.loc['sharpe', 'high'])
+        self.assertEqual(report.loc['slipped_pnl', 'percentile'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
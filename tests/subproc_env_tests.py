@@ -0,0 +1,85 @@
+import unittest
+import numpy as np
+import pandas as pd
+from mindthespread.entities.agent import AgentResponse
+from mindthespread.entities.market import Action
+from mindthespread.env.subproc_env import SubprocVectorTradingEnv
+from mindthespread.env.vector_env import VectorTradingEnv
+
+
+def identity_signals(feed_data: pd.DataFrame) -> pd.DataFrame:
+    return feed_data
+
+
+class TestSubprocVectorTradingEnv(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a subprocess vectorized environment over a mock feed."""
+        rng = np.random.default_rng(1)
+        prices = 1.1 + rng.normal(0, 0.001, 200).cumsum()
+        self.feed_data = pd.DataFrame({'bidclose': prices, 'askclose': prices + 0.0002},
+                                      index=pd.date_range('2023-01-01', periods=200, freq='h'))
+
+        self.num_envs = 5
+        self.env = SubprocVectorTradingEnv(num_envs=self.num_envs, num_workers=2, episode_window=10)
+        self.env.calc_signals = identity_signals
+        self.env.set_ohlc_feed(self.feed_data)
+
+    def tearDown(self):
+        self.env.close()
+
+    def test_workers(self):
+        """Test that the sub-environments are split across the workers."""
+        self.assertEqual(len(self.env.processes), 2)
+        self.assertEqual(sum(s.stop - s.start for s in self.env._slices), self.num_envs)
+
+    def test_matches_in_process_env(self):
+        """Test that stepping in workers gives the same results as the in-process vectorized env."""
+        local = VectorTradingEnv(num_envs=self.num_envs, episode_window=10, info_level='none')
+        local.calc_signals = identity_signals
+        local.set_ohlc_feed(self.feed_data)
+
+        obs, _ = self.env.reset(seed=3)
+        local_obs, _ = local.reset(seed=3)
+        np.testing.assert_array_equal(obs['signals'], local_obs['signals'])
+
+        actions = np.random.default_rng(2).integers(0, len(Action), (20, self.num_envs))
+        for step_actions in actions:
+            obs, rewards, terminated, _, info = self.env.step(step_actions)
+            local_obs, local_rewards, local_terminated, _, _ = local.step(step_actions)
+            np.testing.assert_array_equal(obs['position'], local_obs['position'])
+            np.testing.assert_array_equal(obs['signals'], local_obs['signals'])
+            np.testing.assert_array_almost_equal(rewards, local_rewards)
+            np.testing.assert_array_equal(terminated, local_terminated)
+
+        self.assertIn('final_observation', info)
+
+    def test_agent_responses(self):
+        """Test that the quantity and stop-loss of AgentResponse actions reach the sub-environments."""
+        local = VectorTradingEnv(num_envs=self.num_envs, episode_window=10, info_level='none')
+        local.calc_signals = identity_signals
+        local.set_ohlc_feed(self.feed_data)
+        self.env.reset(seed=4)
+        local.reset(seed=4)
+
+        rng = np.random.default_rng(5)
+        for _ in range(20):
+            responses = [AgentResponse(int(action), qty=float(qty), stop_loss=stop_loss)
+                         for action, qty, stop_loss in zip(rng.integers(0, len(Action), self.num_envs),
+                                                           rng.integers(1, 4, self.num_envs),
+                                                           rng.choice([None, 0.0005], self.num_envs))]
+            responses[0] = int(responses[0].action.value)
+            obs, rewards, _, _, _ = self.env.step(responses)
+            local_obs, local_rewards, _, _, _ = local.step(responses)
+            np.testing.assert_array_equal(obs['position'], local_obs['position'])
+            np.testing.assert_array_almost_equal(rewards, local_rewards)
+
+    def test_worker_error(self):
+        """Test that a failure in a worker is raised in the parent process."""
+        self.env.reset()
+        with self.assertRaises(RuntimeError):
+            self.env.step(np.full(self.num_envs, 99))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import logging
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+import pandas as pd
+from mindthespread.agents.crossover import AgentCrossover
+from mindthespread.managers.offline_manager import backtest
+from mindthespread.managers import sweep as sweep_module
+from mindthespread.managers.sweep import param_grid, param_samples, successive_halving, sweep
+from mindthespread.ta import indicator_cache
+
+
+class TestSweep(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a random walk feed."""
+        rng = np.random.default_rng(7)
+        prices = 1.1 + rng.normal(0, 0.002, 400).cumsum()
+        self.feed = pd.DataFrame({'close': prices}, index=pd.date_range('2023-01-01', periods=400, freq='h'))
+
+    def test_param_spaces(self):
+        """Test grid expansion and reproducible random sampling."""
+        grid = param_grid({'sma_long': [30, 50], 'sma_short': [5, 10, 20]})
+        self.assertEqual(len(grid), 6)
+        self.assertIn({'sma_long': 50, 'sma_short': 10}, grid)
+
+        space = {'sma_long': [30, 50], 'stop_loss': lambda rng: round(float(rng.uniform(0.001, 0.01)), 4)}
+        self.assertListEqual(param_samples(space, 5, seed=1), param_samples(space, 5, seed=1))
+
+    def test_grid_sweep(self):
+        """Test that the sweep results match serial backtests."""
+        tracker = MagicMock()
+        results = sweep(AgentCrossover, {'sma_long': [30, 50], 'sma_short': [5, 10]}, self.feed,
+                        max_workers=2, tracker=tracker)
+        self.assertEqual(len(results), 4)
+        self.assertListEqual(list(results.columns[:2]), ['sma_long', 'sma_short'])
+
+        row = results.iloc[3]
+        expected = backtest(AgentCrossover(sma_long=50, sma_short=10), self.feed, render_policy='off')
+        for key, value in expected.items():
+            self.assertEqual(row[key], value)
+        self.assertEqual(tracker.log_metrics.call_count, 4)
+
+    def test_worker_shares_indicators(self):
+        """Test that the jobs of a worker compute the indicators they have in common once."""
+        indicator_cache.clear()
+        self.addCleanup(indicator_cache.clear)
+        self.addCleanup(logging.getLogger().setLevel, logging.getLogger().level)
+        sweep_module._init_worker(self.feed, {'bid_col': 'close', 'ask_close': 'close', 'pip': 1,
+                                              'vectorized': False, 'max_drawdown': None, 'min_reward': None,
+                                              'fast_mode': True})
+        sweep_module._run_job((AgentCrossover, {'sma_long': 50, 'sma_short': 5}, None))
+        second = sweep_module._run_job((AgentCrossover, {'sma_long': 50, 'sma_short': 10}, None))
+        self.assertEqual((indicator_cache.hits, indicator_cache.misses), (1, 3))
+        expected = backtest(AgentCrossover(sma_long=50, sma_short=10), self.feed, render_policy='off')
+        self.assertDictEqual({key: second[key] for key in expected}, expected)
+
+    def test_random_sweep(self):
+        """Test a random search with the vectorized engine."""
+        space = {'sma_long': [30, 40, 50], 'sma_short': [5, 10],
+                 'stop_loss': lambda rng: round(float(rng.uniform(0.001, 0.01)), 4)}
+        results = sweep('mindthespread.agents.crossover.AgentCrossover', space, self.feed, n_iter=6, seed=3,
+                        max_workers=2, vectorized=True)
+        self.assertEqual(len(results), 6)
+        self.assertTrue(results['closed_trans'].gt(0).all())
+
+    def test_pruning(self):
+        """Test that runs crossing a threshold stop early and report the bars they consumed."""
+        agent = AgentCrossover(sma_long=30, sma_short=10)
+        metrics = backtest(agent, self.feed, render_policy='off', min_reward=1)
+        self.assertTrue(metrics['pruned'])
+        self.assertEqual(metrics['bars'], 1)
+
+        metrics = backtest(agent, self.feed, render_policy='off', max_drawdown=1e9)
+        self.assertFalse(metrics['pruned'])
+        self.assertEqual(metrics['bars'], len(self.feed))
+
+    def test_successive_halving(self):
+        """Test that only the top candidates are promoted to the whole feed."""
+        feed = pd.concat([self.feed, self.feed + 0.01, self.feed - 0.01])
+        feed.index = pd.date_range('2023-01-01', periods=len(feed), freq='h')
+        space = {'sma_long': [30, 40, 50], 'sma_short': [5, 10, 15]}
+        results = successive_halving(AgentCrossover, space, feed, min_bars=200, eta=3, max_workers=2)
+
+        self.assertEqual(len(results), 9)
+        self.assertListEqual(results['rung'].tolist(), [2] + [1] * 2 + [0] * 6)
+        self.assertListEqual(results['bars'].tolist(), [2000] + [800] * 2 + [200] * 6)
+
+        best = results.iloc[0]
+        expected = backtest(AgentCrossover(sma_long=best['sma_long'], sma_short=best['sma_short']), feed,
+                            render_policy='off')
+        for key, value in expected.items():
+            self.assertEqual(best[key], value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from mindthespread.ta import TA, IndicatorCache, LagIndicator, apply_indicators, indicator_cache
+from mindthespread.ta_plan import IndicatorPlan
+from mindthespread.ta_stream import SignalStream
+
+
+class TestIndicatorCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a random walk feed and an empty cache."""
+        rng = np.random.default_rng(8)
+        self.feed = pd.DataFrame({'close': 100 + rng.normal(0, 1, 300).cumsum()},
+                                 index=pd.date_range('2023-01-01', periods=300, freq='h'))
+        self.cache = IndicatorCache()
+
+    def test_not_cached_by_default(self):
+        """Test that the feed is neither fingerprinted nor cached unless a cache is given."""
+        with patch('mindthespread.ta.fingerprint_frame') as fingerprint, \
+                patch.object(indicator_cache, 'put') as put:
+            apply_indicators(self.feed, [TA('sma', length=10), LagIndicator(1)])
+        fingerprint.assert_not_called()
+        put.assert_not_called()
+
+    def test_shared_indicators(self):
+        """Test that an indicator is computed once per feed across calls."""
+        with patch.object(TA, 'value', autospec=True, side_effect=lambda ind, feed: feed.ta.sma(**ind.kwargs)) as value:
+            first = apply_indicators(self.feed, [TA('sma', length=50), TA('sma', length=10)], cache=self.cache,
+                                     plan=False)
+            second = apply_indicators(self.feed, [TA('sma', length=50), TA('sma', length=20)], cache=self.cache,
+                                      plan=False)
+            self.assertEqual(value.call_count, 3)
+
+        expected = apply_indicators(self.feed, [TA('sma', length=50), TA('sma', length=20)], cache=None)
+        pd.testing.assert_frame_equal(second, expected)
+        pd.testing.assert_series_equal(first['SMA_50'], second['SMA_50'])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 3))
+
+    def test_changed_feed(self):
+        """Test that a feed with other content is not served cached values."""
+        apply_indicators(self.feed, [LagIndicator(1)], cache=self.cache)
+        changed = self.feed.copy()
+        changed.iloc[-1, 0] += 1
+        signals = apply_indicators(changed, [LagIndicator(1)], cache=self.cache)
+        self.assertEqual(self.cache.misses, 2)
+        self.assertAlmostEqual(signals.iloc[-1, 0], np.log(changed['close'].iloc[-2] / changed['close'].iloc[-1]))
+
+    def test_max_bytes(self):
+        """Test that least recently used values are evicted beyond the byte budget."""
+        size = self.feed['close'].memory_usage(index=False, deep=True)
+        cache = IndicatorCache(max_bytes=int(size * 2.5))
+        apply_indicators(self.feed, [LagIndicator(lag) for lag in (1, 2, 3)], cache=cache)
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.nbytes, cache.max_bytes)
+
+
+class TestIndicatorPlan(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a random OHLC feed with a few flat bars."""
+        rng = np.random.default_rng(4)
+        close = 100 + rng.normal(0, 1, 500).cumsum()
+        self.feed = pd.DataFrame({'high': close + abs(rng.normal(0, 1, 500)),
+                                  'low': close - abs(rng.normal(0, 1, 500)), 'close': close},
+                                 index=pd.date_range('2023-01-01', periods=500, freq='h'))
+        self.feed.iloc[50:53] = self.feed['close'].iloc[50]
+
+    def test_matches_pandas_ta(self):
+        """Test that planned indicators equal the pandas_ta ones, unsupported ones included."""
+        indicators = [TA('sma', length=20), TA('ema', length=12), TA('mom'), TA('roc', length=5), TA('rsi'),
+                      TA('willr'), TA('ao'), TA('cci'), TA('stoch'), TA('stochrsi'), TA('macd'),
+                      TA('rsi', length=7, offset=1)]
+        planned = apply_indicators(self.feed, indicators, cache=None, plan=True)
+        expected = apply_indicators(self.feed, indicators, cache=None, plan=False)
+        pd.testing.assert_frame_equal(planned, expected)
+
+    def test_shared_nodes(self):
+        """Test that building blocks shared by several indicators are planned once."""
+        plan = IndicatorPlan()
+        self.assertTrue(plan.add('rsi', {}, self.feed))
+        rsi_nodes = len(plan)
+        self.assertTrue(plan.add('stochrsi', {}, self.feed))
+        self.assertEqual(len(plan), rsi_nodes + 6)
+        self.assertTrue(plan.add('rsi', {'length': 14}, self.feed))
+        self.assertEqual(len(plan), rsi_nodes + 6)
+
+    def test_unsupported(self):
+        """Test that unsupported indicators and arguments are left out of the plan."""
+        plan = IndicatorPlan()
+        self.assertFalse(plan.add('macd', {}, self.feed))
+        self.assertFalse(plan.add('rsi', {'talib': True}, self.feed))
+        self.assertFalse(plan.add('sma', {'length': 1000}, self.feed))
+        self.assertListEqual(plan.evaluate(self.feed), [None, None, None])
+
+    def test_talib(self):
+        """Test that indicators pandas_ta computes with TA-Lib are left out of the plan unless disabled."""
+        with patch.dict('pandas_ta.Imports', {'talib': True}):
+            plan = IndicatorPlan()
+            self.assertFalse(plan.add('rsi', {}, self.feed))
+            self.assertFalse(plan.add('sma', {'length': 20}, self.feed))
+            self.assertTrue(plan.add('rsi', {'talib': False}, self.feed))
+            self.assertIsNone(SignalStream.of([TA('sma', length=20)]))
+
+        planned = apply_indicators(self.feed, [TA('rsi', talib=False)], cache=None, plan=True)
+        pd.testing.assert_frame_equal(planned, apply_indicators(self.feed, [TA('rsi')], cache=None, plan=False))
+
+
+class TestSignalStream(unittest.TestCase):
+
+    def test_matches_apply_indicators(self):
+        """Test that moving averages fed in chunks equal the ones calculated over the whole feed."""
+        rng = np.random.default_rng(9)
+        feed = pd.DataFrame({'close': 100 + rng.normal(0, 1, 300).cumsum()},
+                            index=pd.date_range('2023-01-01', periods=300, freq='h'))
+        indicators = [TA('sma', length=20), TA('ema', length=12), TA('ema'), TA('sma', length=20)]
+        stream = SignalStream.of(indicators)
+        signals = pd.concat([stream.update(feed.iloc[start:start + 7]) for start in range(0, 300, 7)])
+        pd.testing.assert_frame_equal(signals, apply_indicators(feed, indicators, cache=None, plan=False))
+
+    def test_missing_close(self):
+        """Test that missing closes, in the EMA seed and later on, are handled as over the whole feed."""
+        rng = np.random.default_rng(10)
+        feed = pd.DataFrame({'close': 100 + rng.normal(0, 1, 300).cumsum()},
+                            index=pd.date_range('2023-01-01', periods=300, freq='h'))
+        feed.iloc[[0, 5, 40, 99, 150, 151, 152, 260], 0] = np.nan
+        indicators = [TA('sma', length=20), TA('ema', length=12), TA('sma', length=5)]
+        stream = SignalStream.of(indicators)
+        signals = pd.concat([stream.update(feed.iloc[start:start + 7]) for start in range(0, 300, 7)])
+        expected = apply_indicators(feed, indicators, cache=None, plan=False)
+        pd.testing.assert_frame_equal(signals, expected)
+        self.assertFalse(signals.iloc[-10:].isna().any().any())
+
+    def test_unsupported(self):
+        """Test that indicators without an incremental update give no stream."""
+        self.assertIsNone(SignalStream.of([TA('sma', length=20), TA('rsi')]))
+        self.assertIsNone(SignalStream.of([TA('ema', length=20, offset=1)]))
+        self.assertIsNone(SignalStream.of([TA('ema', length=20, talib=True)]))
+        self.assertIsNone(SignalStream.of([LagIndicator(1)]))
+        self.assertIsNone(SignalStream.of([]))
+
+
+class TestApplyIndicators(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a random OHLC feed."""
+        rng = np.random.default_rng(6)
+        close = 100 + rng.normal(0, 1, 400).cumsum()
+        self.feed = pd.DataFrame({'high': close + abs(rng.normal(0, 1, 400)),
+                                  'low': close - abs(rng.normal(0, 1, 400)), 'close': close},
+                                 index=pd.date_range('2023-01-01', periods=400, freq='h'))
+
+    def test_threads_and_timings(self):
+        """Test that concurrent evaluation gives the same block and reports every indicator."""
+        indicators = [TA('macd'), TA('cmo'), TA('rsi'), TA('bbands'), LagIndicator(3)]
+        timings = {}
+        signals = apply_indicators(self.feed, indicators, cache=None, max_workers=4, timings=timings)
+        pd.testing.assert_frame_equal(signals, apply_indicators(self.feed, indicators, cache=None, plan=False))
+        self.assertSetEqual(set(timings), {ind.name() for ind in indicators})
+        self.assertTrue(all(seconds > 0 for seconds in timings.values()))
+
+    def test_alignment(self):
+        """Test that outputs on part of the feed index are aligned and foreign indexes rejected."""
+        class Partial(LagIndicator):
+            def value(self, feed_df):
+                return feed_df['close'].iloc[10:].rename('partial')
+
+        signals = apply_indicators(self.feed, [Partial(1), TA('sma', length=5)], cache=None)
+        self.assertTrue(signals['partial'].iloc[:10].isna().all())
+        np.testing.assert_array_equal(signals['partial'].iloc[10:], self.feed['close'].iloc[10:])
+
+        class Foreign(LagIndicator):
+            def value(self, feed_df):
+                return feed_df['close'].shift(freq='1min').rename('foreign')
+
+        with self.assertRaises(AssertionError):
+            apply_indicators(self.feed, [Foreign(1)], cache=None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+import pandas as pd
+from mindthespread.agents.crossover import AgentCrossover
+from mindthespread.feedstore.engines.pandas import PandasFeedEngine
+from mindthespread.managers.offline_manager import backtest
+from mindthespread.managers.universe import backtest_universe
+
+
+class TestUniverseBacktest(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a feed store with a few daily feeds."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = PandasFeedEngine(base_path=self.tmp_dir.name)
+        self.symbols = ['AAA', 'BBB', 'CCC', 'DDD']
+        rng = np.random.default_rng(13)
+        index = pd.date_range('2020-01-01', periods=300, freq='D', tz='UTC', name='date')
+        for symbol in self.symbols:
+            prices = 100 + rng.normal(0, 1, 300).cumsum()
+            self.engine.save_feed(f'{symbol}_1d', pd.DataFrame({'close': prices}, index=index))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_universe(self):
+        """Test per-symbol results, streaming and aggregate stats."""
+        streamed = []
+        symbol_metrics, aggregate = backtest_universe(
+            AgentCrossover, self.symbols + ['MISSING'], self.engine, params={'sma_long': 30, 'sma_short': 10},
+            max_workers=2, tracker=MagicMock(), on_result=lambda symbol, metrics: streamed.append(symbol))
+
+        self.assertListEqual(symbol_metrics.index.tolist(), self.symbols)
+        self.assertCountEqual(streamed, self.symbols)
+        self.assertEqual(aggregate['symbols'], 4)
+        self.assertEqual(aggregate['closed_trans'], symbol_metrics['closed_trans'].sum())
+
+        feed = self.engine.load_feed('BBB_1d')
+        expected = backtest(AgentCrossover(sma_long=30, sma_short=10), feed, render_policy='off')
+        self.assertDictEqual(symbol_metrics.loc['BBB'].to_dict(), expected)
+
+    def test_time_range(self):
+        """Test that the time range is applied to every feed."""
+        symbol_metrics, aggregate = backtest_universe(
+            'mindthespread.agents.crossover.AgentCrossover', self.symbols, self.engine,
+            params={'sma_long': 30, 'sma_short': 10}, start_time='2020-03-01', end_time='2020-06-01',
+            max_workers=2, vectorized=True)
+        self.assertEqual(len(symbol_metrics), 4)
+        self.assertTrue(symbol_metrics['closed_trans'].lt(20).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
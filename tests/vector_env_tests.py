@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock, patch
+from mindthespread.entities.market import Action, Direction
+from mindthespread.env.vector_env import VectorTradingEnv
+
+
+class TestVectorTradingEnv(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a vectorized environment over a shared mock feed."""
+        rng = np.random.default_rng(1)
+        prices = 1.1 + rng.normal(0, 0.001, 200).cumsum()
+        self.feed_data = pd.DataFrame({'bidclose': prices, 'askclose': prices + 0.0002},
+                                      index=pd.date_range('2023-01-01', periods=200, freq='h'))
+
+        self.num_envs = 4
+        self.env = VectorTradingEnv(num_envs=self.num_envs, episode_window=10)
+        self.env.calc_signals = MagicMock(return_value=self.feed_data)
+        self.env.set_ohlc_feed(self.feed_data)
+
+    def test_shared_feed(self):
+        """Test that signals are calculated once and the feed is shared."""
+        self.env.calc_signals.assert_called_once()
+        for sub_env in self.env.envs[1:]:
+            self.assertIs(sub_env.feed, self.env.envs[0].feed)
+
+    def test_reset_and_step_shapes(self):
+        """Test that observations, rewards and dones are stacked per sub-environment."""
+        obs, info = self.env.reset()
+        self.assertEqual(obs['position'].shape, (self.num_envs,))
+        self.assertEqual(obs['signals'].shape, (self.num_envs, 2))
+
+        actions = np.full(self.num_envs, Action.BUY.value)
+        obs, rewards, terminated, truncated, info = self.env.step(actions)
+        self.assertEqual(rewards.shape, (self.num_envs,))
+        self.assertEqual(terminated.shape, (self.num_envs,))
+        self.assertTrue(np.all(obs['position'] == Direction.Long.value))
+
+    def test_autoreset(self):
+        """Test that episodes are reset automatically once done."""
+        self.env.reset()
+        actions = np.full(self.num_envs, Action.HOLD.value)
+        for _ in range(10):
+            obs, rewards, terminated, truncated, info = self.env.step(actions)
+
+        self.assertTrue(np.all(terminated))
+        self.assertIn('final_observation', info)
+        self.assertTrue(all(sub_env.step_count == 0 for sub_env in self.env.envs))
+
+    def test_infos_merged_lazily(self):
+        """Test that infos are merged only when read, keys held by some sub-environments being kept."""
+        self.env.reset()
+        actions = np.array([Action.BUY.value, Action.HOLD.value, Action.SELL.value, Action.HOLD.value])
+        with patch('mindthespread.env.info.merge_infos', wraps=lambda infos: {}) as merge:
+            self.env.step(actions)
+        merge.assert_not_called()
+
+        obs, rewards, terminated, truncated, info = self.env.step(actions)
+        self.assertListEqual(info['qty'].tolist(), [1, None, 1, None])
+        self.assertListEqual(info['direction'].tolist(), ['Long', None, 'Short', None])
+        self.assertTrue(np.all(info['_qty']))
+        self.assertEqual(info['step_reward'].dtype.kind, 'f')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import numpy as np
+import pandas as pd
+from mindthespread.agents.crossover import AgentCrossover
+from mindthespread.entities.market import Direction
+from mindthespread.managers.offline_manager import backtest, vectorized_backtest
+from mindthespread.managers.vectorized import HOLD, simulate_targets
+
+
+class TestVectorizedBacktest(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a random walk feed with a spread."""
+        rng = np.random.default_rng(11)
+        prices = 1.1 + rng.normal(0, 0.002, 600).cumsum()
+        index = pd.date_range('2023-01-01', periods=600, freq='h')
+        self.feed = pd.DataFrame({'close': prices, 'bidclose': prices, 'askclose': prices + 0.0002, 'symbol': 'EURUSD'},
+                                 index=index)
+
+    def assert_matches_backtest(self, agent_kwargs, pip=0.0001, **kwargs):
+        expected = backtest(AgentCrossover(**agent_kwargs), self.feed, bid_col='bidclose', ask_close='askclose',
+                            pip=pip, info_level='summary', render_policy='off', **kwargs)
+        metrics = vectorized_backtest(AgentCrossover(**agent_kwargs), self.feed, bid_col='bidclose',
+                                      ask_close='askclose', pip=pip, **kwargs)
+        self.assertDictEqual(metrics, expected)
+        return metrics
+
+    def test_matches_backtest(self):
+        """Test that the vectorized engine reproduces the stepped backtest."""
+        self.assert_matches_backtest(dict(sma_long=30, sma_short=10))
+        self.assert_matches_backtest(dict(sma_long=50, sma_short=5, qty=3))
+
+    def test_matches_backtest_with_stop_loss(self):
+        """Test stop-losses, which close positions between two crossovers."""
+        self.assert_matches_backtest(dict(sma_long=30, sma_short=10, stop_loss=0.002))
+        self.assert_matches_backtest(dict(sma_long=40, sma_short=20, qty=2, stop_loss=0.0005))
+
+    def test_matches_backtest_with_pruning(self):
+        """Test that pruning thresholds stop the vectorized engine on the same bar as the stepped backtest."""
+        pruned_bars = set()
+        for thresholds in (dict(max_drawdown=20), dict(max_drawdown=50), dict(min_reward=-30),
+                           dict(max_drawdown=40, min_reward=-10), dict(max_drawdown=1e9)):
+            metrics = self.assert_matches_backtest(dict(sma_long=30, sma_short=10, stop_loss=0.003), **thresholds)
+            if metrics['pruned']:
+                pruned_bars.add(metrics['bars'])
+        self.assertGreater(len(pruned_bars), 1)
+        self.assertFalse(metrics['pruned'])
+        self.assertEqual(metrics['bars'], len(self.feed))
+
+    def test_backtest_fast_mode(self):
+        """Test that the stepped backtest gives the same metrics and trades with and without fast mode."""
+        kwargs = dict(bid_col='bidclose', ask_close='askclose', pip=0.0001, info_level='summary',
+                      render_policy='off', return_trades=True)
+        fast = backtest(AgentCrossover(sma_long=30, sma_short=10, stop_loss=0.002), self.feed, **kwargs)
+        slow = backtest(AgentCrossover(sma_long=30, sma_short=10, stop_loss=0.002), self.feed, fast_mode=False,
+                        **kwargs)
+        self.assertDictEqual(fast[0], slow[0])
+        pd.testing.assert_frame_equal(fast[1], slow[1])
+
+    def test_simulate_targets(self):
+        """Test the trade list on a hand-made sequence of targets."""
+        bid = np.array([1.0, 1.1, 1.2, 1.1, 1.0, 0.9])
+        ask = bid + 0.05
+        targets = np.array([Direction.Long.value, HOLD, HOLD, Direction.Short.value, HOLD, HOLD])
+
+        metrics, trades = simulate_targets(targets, bid, ask)
+        self.assertListEqual(trades['entry'].tolist(), [0, 3])
+        self.assertListEqual(trades['exit'].tolist(), [3, 5])
+        self.assertListEqual(trades['direction'].tolist(), [Direction.Long.value, Direction.Short.value])
+        np.testing.assert_allclose(trades['pnl'], [0.05, 0.15])
+        self.assertEqual(metrics['closed_trans'], 1)
+        self.assertEqual(metrics['total_reward'], 0.2)
+
+        # The short is stopped out on bar 4 and re-entered on bar 5
+        targets[5] = Direction.Short.value
+        metrics, trades = simulate_targets(targets, bid, ask[::-1].copy(), stop_loss=0.01)
+        self.assertListEqual(trades['entry'].tolist(), [0, 3, 5])
+        self.assertListEqual(trades['stop'].tolist(), [False, True, False])
+        self.assertEqual(metrics['closed_trans'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
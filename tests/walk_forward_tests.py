@@ -0,0 +1,55 @@
+import unittest
+import numpy as np
+import pandas as pd
+from mindthespread.agents.crossover import AgentCrossover
+from mindthespread.managers.offline_manager import backtest
+from mindthespread.managers.walk_forward import walk_forward, walk_forward_folds
+
+
+def fit_stop_loss(agent, train_feed, train_signals):
+    """Toy fit: size the stop-loss from the volatility of the train window."""
+    agent.stop_loss = round(float(train_feed['close'].diff().std() * 3), 4)
+    return {'stop_loss': agent.stop_loss}
+
+
+class TestWalkForward(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a random walk feed."""
+        rng = np.random.default_rng(9)
+        prices = 1.1 + rng.normal(0, 0.002, 900).cumsum()
+        self.feed = pd.DataFrame({'close': prices}, index=pd.date_range('2023-01-01', periods=900, freq='h'))
+
+    def test_folds(self):
+        """Test the rolling train/test slices."""
+        folds = walk_forward_folds(100, train_window=40, test_window=20, warmup=10)
+        self.assertListEqual(folds, [(slice(10, 50), slice(50, 70)), (slice(30, 70), slice(70, 90))])
+        self.assertEqual(len(walk_forward_folds(100, 40, 20, step=5)), 9)
+
+    def test_reuses_signals(self):
+        """Test that each fold matches a backtest whose signals were recomputed from its own history."""
+        agent = AgentCrossover(sma_long=50, sma_short=10)
+        results = walk_forward(agent, self.feed, train_window=200, test_window=100, warmup=100, max_workers=2)
+        self.assertEqual(len(results), 6)
+
+        fold = results.iloc[2]
+        start = self.feed.index.get_loc(fold['test_start'])
+        stop = self.feed.index.get_loc(fold['test_end']) + 1
+        history = AgentCrossover(sma_long=50, sma_short=10)
+        signals = history.calc_signals(self.feed.iloc[start - 60:stop]).iloc[60:]
+        expected = backtest(history, self.feed.iloc[start:stop], signals=signals, render_policy='off')
+        for key, value in expected.items():
+            self.assertEqual(fold[key], value)
+
+    def test_fit(self):
+        """Test that each fold fits its own copy of the agent."""
+        agent = AgentCrossover(sma_long=50, sma_short=10)
+        results = walk_forward(agent, self.feed, train_window=300, test_window=200, warmup=100,
+                               fit=fit_stop_loss, max_workers=1)
+        self.assertEqual(len(results), 2)
+        self.assertIn('train_stop_loss', results.columns)
+        self.assertIsNone(agent.stop_loss)
+
+
+if __name__ == '__main__':
+    unittest.main()